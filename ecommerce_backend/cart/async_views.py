@@ -0,0 +1,23 @@
+from django.http import Http404, JsonResponse
+from rest_framework.utils.encoders import JSONEncoder
+
+from ecommerce_backend.async_api import async_read_view
+from .models import Cart
+from .pricing import aattach_pricing, prefetch_priced_items
+from .serializers import CartSerializer
+
+
+@async_read_view()
+async def cart_detail(request, pk):
+    try:
+        cart = await (
+            Cart.objects.filter(user=request.user)
+            .select_related('user')
+            .prefetch_related(prefetch_priced_items())
+            .aget(pk=pk)
+        )
+    except Cart.DoesNotExist:
+        raise Http404
+    await aattach_pricing([cart])
+    data = CartSerializer(cart, context={'request': request}).data
+    return JsonResponse(data, encoder=JSONEncoder)
@@ -0,0 +1,90 @@
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+
+from products.models import Product
+
+from .models import CartItem
+from .reservations import hold_stock, release_holdings
+
+MAX_OPERATIONS = 500
+
+
+@transaction.atomic
+def apply_item_operations(carts, operations, reserve=True):
+    """
+    Validate every add/update/remove operation against `carts`, the carts
+    the caller may change, their items and the product table with a fixed
+    number of queries, then apply them with bulk writes in the same
+    transaction. Nothing is written if any operation is invalid or a
+    product is out of stock. With `reserve=False` no new stock is held;
+    checkout reserves it.
+    """
+    item_ids = {op['id'] for op in operations if op['op'] in ('update', 'remove')}
+    cart_ids = {op['cart'] for op in operations if op['op'] == 'add'}
+    product_ids = {op['product_id'] for op in operations if op['op'] == 'add'}
+
+    items = (
+        CartItem.objects.filter(cart__in=carts, pk__in=item_ids)
+        .select_related('cart')
+        .select_for_update(of=('self',))
+        .in_bulk()
+    )
+    carts = carts.filter(pk__in=cart_ids).in_bulk()
+    existing_products = set(Product.objects.filter(pk__in=product_ids).values_list('pk', flat=True))
+    # A cart has one line per product; adding it again is an update.
+    taken = set(
+        CartItem.objects.filter(cart__in=list(carts), product_id__in=product_ids).values_list('cart_id', 'product_id')
+    )
+
+    errors = {}
+    seen_items = set()
+    for index, op in enumerate(operations):
+        if op['op'] == 'add':
+            cart = carts.get(op['cart'])
+            if cart is None:
+                errors[index] = {"cart": "Cart not found."}
+            elif cart.status == 'Paid':
+                errors[index] = {"cart": "This cart has already been checked out."}
+            elif op['product_id'] not in existing_products:
+                errors[index] = {"product_id": "Product not found."}
+            elif (op['cart'], op['product_id']) in taken:
+                errors[index] = {"product_id": "This product is already in the cart; update its item instead."}
+            taken.add((op['cart'], op['product_id']))
+            continue
+        item = items.get(op['id'])
+        if item is None:
+            errors[index] = {"id": "Cart item not found."}
+        elif op['id'] in seen_items:
+            errors[index] = {"id": "Cart item appears in more than one operation."}
+        elif item.cart.status == 'Paid':
+            errors[index] = {"id": "This cart has already been checked out."}
+        seen_items.add(op['id'])
+    if errors:
+        raise ValidationError({"operations": errors})
+
+    results = []
+    to_create, to_update, to_delete = [], [], []
+    for op in operations:
+        if op['op'] == 'add':
+            item = CartItem(cart=carts[op['cart']], product_id=op['product_id'], quantity=op['quantity'])
+            to_create.append(item)
+            results.append({'op': 'add', 'status': 'created', 'item': item})
+        elif op['op'] == 'update':
+            item = items[op['id']]
+            item.quantity = op['quantity']
+            to_update.append(item)
+            results.append({'op': 'update', 'status': 'updated', 'item': item})
+        else:
+            to_delete.append(op['id'])
+            results.append({'op': 'remove', 'status': 'deleted', 'item': items[op['id']]})
+
+    # The items were locked above, so their holdings are current.
+    if reserve:
+        previous = {item.pk: (item.product_id, item.reserved_quantity) for item in items.values()}
+        hold_stock(to_create + to_update, previous)
+    release_holdings([items[pk] for pk in to_delete])
+
+    CartItem.objects.bulk_create(to_create)
+    CartItem.objects.bulk_update(to_update, ['quantity', 'reserved_quantity', 'reserved_until'])
+    CartItem.objects.filter(pk__in=to_delete).delete()
+    return results
@@ -0,0 +1,54 @@
+from rest_framework.exceptions import ValidationError
+
+from orders.models import Order, OrderLine
+
+from .models import Cart, CartItem
+from .pricing import attach_pricing
+from .reservations import commit_holdings, hold_stock
+
+
+def checkout_cart(cart_id, user, shipping_address=None, billing_address=None):
+    """
+    Convert a cart into an order. Must be called inside a transaction; the
+    cart row is locked so concurrent checkouts of the same cart serialize.
+    Stock held by the items is consumed, topping up any hold that expired.
+    """
+    cart = Cart.objects.select_for_update().get(pk=cart_id, user=user)
+    if cart.status == 'Paid':
+        raise ValidationError({"cart": "This cart has already been checked out."})
+
+    attach_pricing([cart])
+    lines = cart.pricing['lines']
+    if not lines:
+        raise ValidationError({"cart": "Cannot check out an empty cart."})
+
+    items = list(CartItem.objects.filter(cart=cart).select_for_update())
+    hold_stock(items, {item.pk: (item.product_id, item.reserved_quantity) for item in items})
+    commit_holdings(items)
+
+    if shipping_address is not None:
+        cart.shipping_address = shipping_address
+    if billing_address is not None:
+        cart.billing_address = billing_address
+    cart.status = 'Paid'
+    cart.save(update_fields=['status', 'shipping_address', 'billing_address'])
+
+    order = Order.objects.create(
+        cart=cart,
+        user=user,
+        total_price=cart.pricing['total'],
+        item_count=cart.pricing['item_count'],
+    )
+    # Snapshot what was bought, so order history never reads live products.
+    OrderLine.objects.bulk_create([
+        OrderLine(
+            order=order,
+            product_id=line.product_id,
+            product_name=line.product_name,
+            unit_price=line.unit_price,
+            quantity=line.quantity,
+            subtotal=line.subtotal,
+        )
+        for line in lines
+    ])
+    return order
@@ -0,0 +1,12 @@
+from .models import Cart
+
+
+def get_current_cart(user):
+    """
+    The user's open cart, created on first use. Safe under concurrent
+    requests: the partial unique index on open carts makes a losing INSERT
+    fail, and get_or_create then reads the winner's cart.
+    """
+    cart, _ = Cart.objects.get_or_create(user=user, status='Cart')
+    cart.user = user
+    return cart
@@ -0,0 +1,90 @@
+"""
+Carts for shoppers who haven't logged in. The cart lives in the database
+with no user; the client holds a signed token naming it, so guests need no
+session and can't reach each other's carts. Guest carts hold no stock.
+Logging in with the token merges the guest cart into the user's open cart.
+"""
+from django.conf import settings
+from django.core import signing
+from django.db import transaction
+from rest_framework.exceptions import NotFound, PermissionDenied
+
+from .current import get_current_cart
+from .models import Cart, CartItem
+from .reservations import hold_stock
+
+TOKEN_HEADER = 'HTTP_X_CART_TOKEN'
+SALT = 'cart.guest-cart'
+
+
+def issue_guest_token(cart):
+    return signing.dumps(str(cart.pk), salt=SALT)
+
+
+def guest_cart_id(token):
+    """The cart id a token was issued for, or None if it is forged or expired."""
+    try:
+        return signing.loads(token, salt=SALT, max_age=settings.GUEST_CART_MAX_AGE)
+    except signing.BadSignature:
+        return None
+
+
+def guest_carts(request):
+    """
+    The guest cart named by the request's X-Cart-Token header, as a
+    queryset so callers can lock or scope writes to it. Raises
+    PermissionDenied for a bad token and NotFound once it has been merged.
+    """
+    cart_id = guest_cart_id(request.META.get(TOKEN_HEADER, ''))
+    if cart_id is None:
+        raise PermissionDenied("Invalid or expired guest cart token.")
+    carts = Cart.objects.filter(pk=cart_id, user__isnull=True, status='Cart')
+    if not carts.exists():
+        raise NotFound("Guest cart not found.")
+    return carts
+
+
+@transaction.atomic
+def merge_guest_cart(cart_id, user):
+    """
+    Move the guest cart's lines into the user's open cart and return it.
+    Lines for the same product are combined, and stock is then held for
+    the merged quantities, as for any cart change. Raises ValidationError
+    naming the short products, leaving both carts as they were. A cart
+    that is gone or already merged leaves the user's cart as it is.
+    """
+    cart = get_current_cart(user)
+    guest = Cart.objects.select_for_update().filter(pk=cart_id, user__isnull=True, status='Cart').first()
+    if guest is None:
+        return cart
+
+    items = list(CartItem.objects.select_for_update().filter(cart_id__in=[cart.pk, guest.pk]).order_by('pk'))
+    lines = {item.product_id: item for item in items if item.cart_id == cart.pk}
+    merged, added, previous = {}, set(), {}
+    for item in items:
+        if item.cart_id != guest.pk:
+            continue
+        line = merged.get(item.product_id)
+        if line is None:
+            line = lines.get(item.product_id)
+            if line is None:
+                line = CartItem(cart=cart, product_id=item.product_id, quantity=0)
+                added.add(line.pk)
+            merged[item.product_id] = line
+            previous[line.pk] = (line.product_id, line.reserved_quantity)
+        line.quantity += item.quantity
+        # Guest carts made before they stopped reserving may still hold stock.
+        product_id, held = previous[line.pk]
+        previous[line.pk] = (product_id, held + item.reserved_quantity)
+
+    merged = list(merged.values())
+    hold_stock(merged, previous)
+    CartItem.objects.bulk_update(
+        [line for line in merged if line.pk not in added], ['quantity', 'reserved_quantity', 'reserved_until'],
+    )
+    CartItem.objects.bulk_create([line for line in merged if line.pk in added])
+    # The user's lines now hold this stock, so deleting the guest's must
+    # not give it back.
+    CartItem.objects.filter(cart=guest).update(reserved_quantity=0, reserved_until=None)
+    guest.delete()
+    return cart
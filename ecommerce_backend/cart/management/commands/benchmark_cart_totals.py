@@ -0,0 +1,65 @@
+import json
+import random
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from cart.models import Cart, CartItem
+from cart.pricing import attach_pricing
+from ecommerce_backend.benchmarking import format_row, measure
+from products.models import Product
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare pricing a cart with one aggregate query against fetching each "
+        "line's product separately. Data is created inside a rolled-back transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lines', type=int, nargs='+', default=[10, 100, 500])
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--json', action='store_true', help="Print results as JSON.")
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        results = {}
+
+        with transaction.atomic():
+            products = Product.objects.bulk_create([
+                Product(name=f'Product {i}', description='', price=Decimal(rng.randint(1, 50_000)) / 100)
+                for i in range(max(options['lines']))
+            ])
+            for line_count in options['lines']:
+                cart = Cart.objects.create(status='Cart')
+                CartItem.objects.bulk_create([
+                    CartItem(cart=cart, product_id=product.pk, quantity=rng.randint(1, 5))
+                    for product in products[:line_count]
+                ])
+
+                def per_line(i):
+                    total = Decimal('0.00')
+                    for item in cart.items.all():
+                        total += Product.objects.get(pk=item.product_id).price * item.quantity
+                    return total
+
+                def aggregate(i):
+                    return attach_pricing([cart])[0].pricing['total']
+
+                assert per_line(0) == aggregate(0)
+                results[line_count] = {
+                    'per_line_queries': measure(per_line, options['iterations']),
+                    'aggregate_query': measure(aggregate, options['iterations']),
+                }
+
+            transaction.set_rollback(True)
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for line_count, stats in results.items():
+            self.stdout.write(f"{line_count} lines")
+            for label, row in stats.items():
+                self.stdout.write('  ' + format_row(label, row))
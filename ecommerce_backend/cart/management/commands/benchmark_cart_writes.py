@@ -0,0 +1,101 @@
+import itertools
+import json
+import threading
+import time
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection, connections, transaction
+
+from cart.models import Cart, CartItem
+from ecommerce_backend.benchmarking import format_row, summarize
+from products.models import Product
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure concurrent cart writes against the configured database. "
+        "Each thread adds and updates items in its own cart; everything the "
+        "benchmark creates is deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, nargs='+', default=[1, 4, 16])
+        parser.add_argument('--writes', type=int, default=200, help="Writes per thread.")
+        parser.add_argument('--json', action='store_true', help="Print results as JSON.")
+
+    def handle(self, *args, **options):
+        user = get_user_model().objects.create(username=f'bench-{uuid.uuid4().hex[:12]}')
+        # A cart holds one line per product, so each created item needs its own.
+        products = Product.objects.bulk_create(
+            Product(name=f'Benchmark product {n}', description='', price='1.00', user=user)
+            for n in range((options['writes'] + 1) // 2)
+        )
+        self.shoppers = itertools.count()
+        results = {'vendor': connection.vendor, 'runs': {}}
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute('PRAGMA journal_mode')
+                results['journal_mode'] = cursor.fetchone()[0]
+
+        try:
+            for thread_count in options['threads']:
+                results['runs'][thread_count] = self._run(user, products, thread_count, options['writes'])
+        finally:
+            # Each thread shops as its own user, since a user has one open cart.
+            get_user_model().objects.filter(username__startswith=user.username).delete()
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(f"{results['vendor']} {results.get('journal_mode', '')}".strip())
+        for thread_count, run in results['runs'].items():
+            self.stdout.write(
+                format_row(f"{thread_count} threads", run['latency'])
+                + f"  {run['writes_per_s']:.0f} writes/s  {run['errors']} errors"
+            )
+
+    def _run(self, user, products, thread_count, writes):
+        samples, errors = [], []
+        lock = threading.Lock()
+        start_barrier = threading.Barrier(thread_count)
+
+        def worker():
+            try:
+                shopper = get_user_model().objects.create(username=f'{user.username}-{next(self.shoppers)}')
+                cart = Cart.objects.create(user=shopper, status='Cart')
+                local_samples, local_errors = [], 0
+                start_barrier.wait()
+                item = None
+                for i in range(writes):
+                    start = time.perf_counter()
+                    try:
+                        with transaction.atomic():
+                            if item is None or i % 2 == 0:
+                                item = CartItem.objects.create(cart=cart, product=products[i // 2], quantity=1)
+                            else:
+                                CartItem.objects.filter(pk=item.pk).update(quantity=i)
+                    except OperationalError:
+                        local_errors += 1
+                        continue
+                    local_samples.append(time.perf_counter() - start)
+                with lock:
+                    samples.extend(local_samples)
+                    errors.append(local_errors)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=worker) for _ in range(thread_count)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        return {
+            'latency': summarize(samples),
+            'writes_per_s': round(len(samples) / elapsed, 1),
+            'errors': sum(errors),
+        }
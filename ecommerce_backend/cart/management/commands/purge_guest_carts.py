@@ -0,0 +1,19 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from cart.models import Cart
+
+
+class Command(BaseCommand):
+    help = "Delete guest carts whose token has expired, giving back any stock they still hold."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seconds', type=int, default=settings.GUEST_CART_MAX_AGE)
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(seconds=options['seconds'])
+        deleted, _ = Cart.objects.filter(user__isnull=True, status='Cart', created_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} guest carts and items."))
@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from cart.reservations import release_expired
+
+
+class Command(BaseCommand):
+    help = (
+        "Return the stock held by cart items whose reservation has expired. "
+        "Run it from cron, or with --interval as a long-running worker."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--interval', type=float, help="Keep sweeping, sleeping this many seconds between sweeps.")
+
+    def handle(self, *args, **options):
+        while True:
+            released = release_expired(batch_size=options['batch_size'])
+            if released or not options['interval']:
+                self.stdout.write(self.style.SUCCESS(f"Released {released} expired reservations."))
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
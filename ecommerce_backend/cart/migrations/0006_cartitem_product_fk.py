@@ -0,0 +1,101 @@
+import django.db.models.deletion
+from django.db import migrations, models, transaction
+from django.db.models import Exists, OuterRef
+
+BATCH_SIZE = 5000
+
+
+def product_field(apps):
+    """The new field, bound to the historical CartItem model."""
+    CartItem = apps.get_model('cart', 'CartItem')
+    field = models.ForeignKey(
+        apps.get_model('products', 'Product'), on_delete=django.db.models.deletion.CASCADE, related_name='cart_items',
+    )
+    field.set_attributes_from_name('product')
+    field.model = CartItem
+    return CartItem, field
+
+
+def delete_dangling_items(apps, schema_editor):
+    """
+    Delete items whose product no longer exists, one short transaction per
+    batch of ids so writers are never blocked for long.
+    """
+    CartItem = apps.get_model('cart', 'CartItem')
+    Product = apps.get_model('products', 'Product')
+    last_pk = None
+    while True:
+        batch = CartItem.objects.order_by('pk').values_list('pk', flat=True)
+        if last_pk is not None:
+            batch = batch.filter(pk__gt=last_pk)
+        ids = list(batch[:BATCH_SIZE])
+        if not ids:
+            return
+        last_pk = ids[-1]
+        with transaction.atomic(using=schema_editor.connection.alias):
+            CartItem.objects.filter(pk__in=ids).exclude(
+                Exists(Product.objects.filter(pk=OuterRef('product_id'))),
+            ).delete()
+
+
+def add_foreign_key(apps, schema_editor):
+    """
+    The column keeps its name and values, so only the constraint and index
+    are new. PostgreSQL adds the constraint NOT VALID (enforced for new
+    writes at once), then validates existing rows and builds the index
+    without blocking writes. SQLite has to rebuild the table.
+    """
+    CartItem, field = product_field(apps)
+    connection = schema_editor.connection
+    if connection.vendor != 'postgresql':
+        delete_dangling_items(apps, schema_editor)
+        schema_editor.alter_field(CartItem, CartItem._meta.get_field('product_id'), field)
+        return
+
+    quote = schema_editor.quote_name
+    table = CartItem._meta.db_table
+    constraint = schema_editor._fk_constraint_name(CartItem, field, '_fk_%(to_table)s_%(to_column)s')
+    index = schema_editor._create_index_name(table, [field.column])
+    schema_editor.execute(
+        f'ALTER TABLE {quote(table)} ADD CONSTRAINT {constraint} FOREIGN KEY ({quote(field.column)}) '
+        f'REFERENCES {quote(field.related_model._meta.db_table)} ({quote("id")}) DEFERRABLE INITIALLY DEFERRED NOT VALID'
+    )
+    delete_dangling_items(apps, schema_editor)
+    schema_editor.execute(f'ALTER TABLE {quote(table)} VALIDATE CONSTRAINT {constraint}')
+    schema_editor.execute(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {quote(index)} ON {quote(table)} ({quote(field.column)})')
+
+
+def remove_foreign_key(apps, schema_editor):
+    CartItem, field = product_field(apps)
+    old_field = models.UUIDField()
+    old_field.set_attributes_from_name('product_id')
+    old_field.model = CartItem
+    schema_editor.alter_field(CartItem, field, old_field)
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ('cart', '0005_cartitem_reservation'),
+        ('products', '0012_inventory'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(add_foreign_key, remove_foreign_key),
+            ],
+            state_operations=[
+                migrations.RemoveField(model_name='cartitem', name='product_id'),
+                migrations.AddField(
+                    model_name='cartitem',
+                    name='product',
+                    field=models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name='cart_items', to='products.product',
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.0.1 on 2026-10-18 19:33
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def merge_open_carts(apps, schema_editor):
+    """
+    Carts made with the old 'Pending' default were open carts. Open carts
+    that already have an order count as paid, and a user's other open
+    carts are merged into their newest one, adding up quantities.
+    """
+    Cart = apps.get_model('cart', 'Cart')
+    CartItem = apps.get_model('cart', 'CartItem')
+    Cart.objects.exclude(status__in=['Cart', 'Paid']).update(status='Cart')
+    Cart.objects.filter(status='Cart', orders__isnull=False).update(status='Paid')
+
+    duplicated = list(
+        Cart.objects.filter(status='Cart', user__isnull=False)
+        .values('user').annotate(open_carts=Count('id')).filter(open_carts__gt=1)
+        .values_list('user', flat=True)
+    )
+    for user_id in duplicated:
+        keep, *extra = Cart.objects.filter(user_id=user_id, status='Cart').order_by('-created_at', '-id')
+        kept = {item.product_id: item for item in CartItem.objects.filter(cart=keep)}
+        for item in CartItem.objects.filter(cart__in=extra).order_by('id'):
+            existing = kept.get(item.product_id)
+            if existing is None:
+                item.cart = keep
+                item.save(update_fields=['cart'])
+                kept[item.product_id] = item
+            else:
+                existing.quantity += item.quantity
+                existing.reserved_quantity += item.reserved_quantity
+                existing.save(update_fields=['quantity', 'reserved_quantity'])
+                item.delete()
+        Cart.objects.filter(pk__in=[cart.pk for cart in extra]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cart', '0006_cartitem_product_fk'),
+        ('orders', '0015_order_lines'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_open_carts, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='cart',
+            name='status',
+            field=models.CharField(choices=[('Cart', 'Cart'), ('Paid', 'Paid')], default='Cart', max_length=10),
+        ),
+        migrations.AddConstraint(
+            model_name='cart',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'Cart')), fields=('user',), name='cart_one_open_per_user'),
+        ),
+    ]
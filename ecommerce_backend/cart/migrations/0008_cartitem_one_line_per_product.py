@@ -0,0 +1,43 @@
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def merge_duplicate_lines(apps, schema_editor):
+    """
+    Fold every cart's repeated lines for a product into the oldest-id one,
+    summing quantities and stock held so inventory stays balanced.
+    """
+    CartItem = apps.get_model('cart', 'CartItem')
+    duplicated = (
+        CartItem.objects.values('cart_id', 'product_id')
+        .annotate(lines=Count('id'))
+        .filter(lines__gt=1)
+        .values_list('cart_id', 'product_id')
+    )
+    for cart_id, product_id in duplicated:
+        keep, *extra = CartItem.objects.filter(cart_id=cart_id, product_id=product_id).order_by('id')
+        for item in extra:
+            keep.quantity += item.quantity
+            keep.reserved_quantity += item.reserved_quantity
+            if item.reserved_until and (keep.reserved_until is None or item.reserved_until > keep.reserved_until):
+                keep.reserved_until = item.reserved_until
+        keep.save(update_fields=['quantity', 'reserved_quantity', 'reserved_until'])
+        # Queryset delete on the historical model sends no pre_delete, so
+        # the stock moved onto `keep` is not released.
+        CartItem.objects.filter(pk__in=[item.pk for item in extra]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cart', '0007_one_open_cart_per_user'),
+        ('products', '0012_inventory'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_lines, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='cartitem',
+            constraint=models.UniqueConstraint(fields=('cart', 'product'), name='cartitem_one_line_per_product'),
+        ),
+    ]
@@ -14,18 +14,43 @@ class Cart(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)
     created_at = models.DateTimeField( default=datetime.now)  # Added default for existing rows
-    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='Pending')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='Cart')
     shipping_address = models.TextField(default="")
     billing_address = models.TextField(default="")
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'created_at', 'id'], name='cart_user_created_idx'),
+        ]
+        constraints = [
+            # Also the lookup index for a user's current cart.
+            models.UniqueConstraint(fields=['user'], condition=models.Q(status='Cart'), name='cart_one_open_per_user'),
+        ]
+
     def __str__(self):
         return f"Cart {self.id}"
 
 class CartItem(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     cart = models.ForeignKey(Cart, on_delete=models.CASCADE, related_name='items')
-    product_id = models.UUIDField()
+    product = models.ForeignKey('products.Product', on_delete=models.CASCADE, related_name='cart_items')
     quantity = models.PositiveIntegerField()
+    # Stock held for this item until `reserved_until`; see cart/reservations.py.
+    reserved_quantity = models.PositiveIntegerField(default=0, editable=False)
+    reserved_until = models.DateTimeField(null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['reserved_until'],
+                condition=models.Q(reserved_quantity__gt=0),
+                name='cartitem_reserved_until_idx',
+            ),
+        ]
+        constraints = [
+            # One line per product, so merges can upsert on (cart, product).
+            models.UniqueConstraint(fields=['cart', 'product'], name='cartitem_one_line_per_product'),
+        ]
 
     def __str__(self):
-        return f"CartItem {self.id} - Cart {self.cart.id}"
\ No newline at end of file
+        return f"CartItem {self.id} - Cart {self.cart_id}"
\ No newline at end of file
@@ -0,0 +1,58 @@
+from decimal import Decimal
+
+from asgiref.sync import sync_to_async
+from django.db.models import F, Prefetch, prefetch_related_objects
+
+from products.models import Product
+
+from .models import CartItem
+
+CENT = Decimal('0.01')
+
+
+def priced_items():
+    """
+    Cart items annotated with the product columns a cart line shows, joined
+    in a single statement.
+    """
+    return CartItem.objects.annotate(
+        product_name=F('product__name'),
+        product_image=F('product__image'),
+        unit_price=F('product__price'),
+    ).order_by('id')
+
+
+def prefetch_priced_items():
+    return Prefetch('items', queryset=priced_items())
+
+
+def attach_pricing(carts):
+    """
+    Set `cart.pricing` on every cart: its priced lines, item count and grand
+    total. The lines are prefetched as `cart.items`, so carts fetched with
+    `prefetch_priced_items()` cost no further query. Arithmetic happens here
+    in Decimal rather than in SQL, since SQLite evaluates decimal
+    expressions as floats.
+    """
+    carts = list(carts)
+    prefetch_related_objects(carts, prefetch_priced_items())
+    return _apply_pricing(carts)
+
+
+async def aattach_pricing(carts):
+    carts = list(carts)
+    await sync_to_async(prefetch_related_objects)(carts, prefetch_priced_items())
+    return _apply_pricing(carts)
+
+
+def _apply_pricing(carts):
+    image_field = Product._meta.get_field('image')
+    for cart in carts:
+        cart.pricing = {'lines': list(cart.items.all()), 'item_count': 0, 'total': Decimal('0.00')}
+        for item in cart.pricing['lines']:
+            item.product_image = image_field.attr_class(None, image_field, item.product_image)
+            item.available = item.unit_price is not None
+            item.subtotal = (item.unit_price * item.quantity).quantize(CENT) if item.available else Decimal('0.00')
+            cart.pricing['item_count'] += item.quantity
+            cart.pricing['total'] += item.subtotal
+    return carts
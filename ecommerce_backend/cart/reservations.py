@@ -0,0 +1,108 @@
+"""
+Stock held for cart items. Adding or changing an item reserves the
+difference for `CART_RESERVATION_TTL` seconds, checkout commits it, and
+the sweeper gives expired holds back. Callers lock the items they change
+so a sweep can't release a hold they are about to adjust.
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from products import inventory
+
+from .models import CartItem
+
+
+def locked_holdings(item_ids):
+    """Lock the items and map each id to the (product_id, quantity) it holds."""
+    rows = CartItem.objects.select_for_update().filter(pk__in=item_ids).values_list('pk', 'product_id', 'reserved_quantity')
+    return {pk: (product_id, held) for pk, product_id, held in rows}
+
+
+def hold_stock(items, previous=None):
+    """
+    Reserve stock for each item's quantity and push its expiry forward.
+    `previous` maps item ids to the (product_id, quantity) they held before,
+    as returned by `locked_holdings`. Sets the reservation fields on the
+    items for the caller to save, or raises ValidationError naming every
+    product that is short.
+    """
+    previous = previous or {}
+    deltas = defaultdict(int)
+    for item in items:
+        product_id, held = previous.get(item.pk, (item.product_id, 0))
+        deltas[product_id] -= held
+        deltas[item.product_id] += item.quantity
+
+    # Deltas are netted per product, so one cart moving units between its
+    # items touches each stock row once, always in the same order.
+    short = []
+    for product_id, delta in sorted(deltas.items()):
+        if delta < 0:
+            inventory.release(product_id, -delta)
+        elif delta > 0 and not inventory.reserve(product_id, delta):
+            short.append(str(product_id))
+    if short:
+        raise ValidationError({"items": f"Not enough stock for: {', '.join(short)}"})
+
+    reserved_until = timezone.now() + timedelta(seconds=settings.CART_RESERVATION_TTL)
+    for item in items:
+        item.reserved_quantity = item.quantity
+        item.reserved_until = reserved_until
+
+
+def _settle(items, settle):
+    totals = defaultdict(int)
+    for item in items:
+        if item.reserved_quantity:
+            totals[item.product_id] += item.reserved_quantity
+    for product_id, quantity in sorted(totals.items()):
+        settle(product_id, quantity)
+    CartItem.objects.filter(pk__in=[item.pk for item in items]).update(reserved_quantity=0, reserved_until=None)
+
+
+def commit_holdings(items):
+    """Consume the stock held by locked `items`, at checkout."""
+    _settle(items, inventory.commit)
+
+
+def release_holdings(items):
+    """Give back the stock held by locked `items`, before they are deleted."""
+    _settle(items, inventory.release)
+
+
+def release_item(item):
+    """
+    Give back what an unlocked item held, if nobody else has already: the
+    conditional update claims the hold, so a concurrent sweep or delete
+    can't release it twice.
+    """
+    if item.reserved_quantity and CartItem.objects.filter(
+        pk=item.pk, reserved_quantity=item.reserved_quantity,
+    ).update(reserved_quantity=0, reserved_until=None):
+        inventory.release(item.product_id, item.reserved_quantity)
+
+
+def release_expired(batch_size=500, now=None):
+    """
+    Release every hold that expired before `now`, one batch per transaction.
+    Rows locked by a cart being changed are skipped until the next sweep.
+    Returns the number of items released.
+    """
+    now = now or timezone.now()
+    released = 0
+    while True:
+        with transaction.atomic():
+            items = list(
+                CartItem.objects.filter(reserved_quantity__gt=0, reserved_until__lt=now)
+                .select_for_update(skip_locked=True)
+                .only('product_id', 'reserved_quantity')[:batch_size]
+            )
+            release_holdings(items)
+        released += len(items)
+        if len(items) < batch_size:
+            return released
@@ -1,16 +1,89 @@
 from rest_framework import serializers
+from products.models import Product
 from .models import Cart, CartItem
+from .bulk import MAX_OPERATIONS
+from .pricing import attach_pricing
+
+class CartLineSerializer(serializers.ModelSerializer):
+    product_name = serializers.CharField(read_only=True)
+    product_image = serializers.ImageField(read_only=True)
+    unit_price = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
+    subtotal = serializers.DecimalField(max_digits=12, decimal_places=2, read_only=True)
+    available = serializers.BooleanField(read_only=True)
+
+    class Meta:
+        model = CartItem
+        fields = ['id', 'product_id', 'quantity', 'product_name', 'product_image', 'unit_price', 'subtotal', 'available']
+
+class CartListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        # Price every cart on the page with one query instead of one per cart.
+        carts = data.all() if hasattr(data, 'all') else data
+        return super().to_representation(attach_pricing(carts))
 
 class CartSerializer(serializers.ModelSerializer):
     user = serializers.ReadOnlyField(source='user.username')
     items = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
+    lines = CartLineSerializer(source='pricing.lines', many=True, read_only=True)
+    item_count = serializers.IntegerField(source='pricing.item_count', read_only=True)
+    total = serializers.DecimalField(max_digits=12, decimal_places=2, source='pricing.total', read_only=True)
 
     class Meta:
         model = Cart
         fields = '__all__'
         read_only_fields = ['user']
+        list_serializer_class = CartListSerializer
+
+    def to_representation(self, instance):
+        if not hasattr(instance, 'pricing'):
+            attach_pricing([instance])
+        return super().to_representation(instance)
+
+class OpenCartField(serializers.PrimaryKeyRelatedField):
+    """Only the requesting user's open carts take items, and so hold stock."""
+
+    def get_queryset(self):
+        request = self.context.get('request')
+        if request is None:
+            return Cart.objects.none()
+        return super().get_queryset().filter(user=request.user)
 
 class CartItemSerializer(serializers.ModelSerializer):
+    cart = OpenCartField(queryset=Cart.objects.filter(status='Cart'), error_messages={'does_not_exist': 'Cart not found.'})
+    # Keeps the field name clients already send; validating it loads only the id.
+    product_id = serializers.PrimaryKeyRelatedField(source='product', queryset=Product.objects.only('id'))
+
     class Meta:
         model = CartItem
-        fields = '__all__'
\ No newline at end of file
+        fields = ['id', 'cart', 'product_id', 'quantity', 'reserved_quantity', 'reserved_until']
+
+
+class CartItemOperationSerializer(serializers.Serializer):
+    OPERATIONS = ['add', 'update', 'remove']
+    REQUIRED_FIELDS = {
+        'add': ['cart', 'product_id', 'quantity'],
+        'update': ['id', 'quantity'],
+        'remove': ['id'],
+    }
+
+    op = serializers.ChoiceField(choices=OPERATIONS)
+    id = serializers.UUIDField(required=False)
+    cart = serializers.UUIDField(required=False)
+    product_id = serializers.UUIDField(required=False)
+    quantity = serializers.IntegerField(required=False, min_value=1)
+
+    def validate(self, data):
+        missing = {field: "This field is required." for field in self.REQUIRED_FIELDS[data['op']] if field not in data}
+        if missing:
+            raise serializers.ValidationError(missing)
+        return data
+
+class BulkCartItemSerializer(serializers.Serializer):
+    operations = serializers.ListField(
+        child=CartItemOperationSerializer(), allow_empty=False, max_length=MAX_OPERATIONS
+    )
+
+class CartItemOperationResultSerializer(serializers.Serializer):
+    op = serializers.CharField()
+    status = serializers.CharField()
+    item = CartItemSerializer()
@@ -0,0 +1,12 @@
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
+
+from .models import CartItem
+from .reservations import release_item
+
+
+@receiver(pre_delete, sender=CartItem)
+def release_reserved_stock(sender, instance, **kwargs):
+    # Catches every delete, including cascades from carts and users; paths
+    # that delete many items release them in bulk first.
+    release_item(instance)
@@ -1,8 +1,16 @@
 from django.urls import path
-from .views import CartViewSet, CartItemViewSet
+from . import async_views
+from .views import CartViewSet, CartItemViewSet, CheckoutView, BulkCartItemView, CurrentCartView, GuestCartView, GuestCartItemsView
 
 urlpatterns = [
     path('', CartViewSet.as_view({'get': 'list', 'post': 'create'}), name='cart'),
+    path('current/', CurrentCartView.as_view(), name='cart-current'),
+    path('guest/', GuestCartView.as_view(), name='cart-guest'),
+    path('guest/items/', GuestCartItemsView.as_view(), name='cart-guest-items'),
+    path('<uuid:pk>/', CartViewSet.as_view({'get': 'retrieve', 'put': 'update', 'delete': 'destroy'}), name='cart-detail'),
+    path('async/<uuid:pk>/', async_views.cart_detail, name='cart-detail-async'),
+    path('<uuid:pk>/checkout/', CheckoutView.as_view(), name='cart-checkout'),
     path('items/', CartItemViewSet.as_view({'get': 'list', 'post': 'create'}), name='cartitem'),
+    path('items/bulk/', BulkCartItemView.as_view(), name='cartitem-bulk'),
     path('items/<str:pk>/', CartItemViewSet.as_view({'put': 'update', 'delete': 'destroy'}), name='cartitem-detail'),
 ]
\ No newline at end of file
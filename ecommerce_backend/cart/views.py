@@ -1,16 +1,30 @@
 from rest_framework import viewsets
+from rest_framework.exceptions import ValidationError
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from rest_framework import status
+from django.db import IntegrityError, transaction
+from django.shortcuts import get_object_or_404
 from .models import Cart, CartItem
-from rest_framework.permissions import IsAuthenticated
-from rest_framework_simplejwt.authentication import JWTAuthentication
-from .serializers import CartSerializer, CartItemSerializer
-from django.contrib.auth import get_user_model
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.throttling import ScopedRateThrottle
+from users.authentication import CachedJWTAuthentication
+from .serializers import CartSerializer, CartItemSerializer, BulkCartItemSerializer, CartItemOperationResultSerializer
+from .bulk import apply_item_operations
+from .checkout import checkout_cart
+from .current import get_current_cart
+from .pricing import prefetch_priced_items
+from .guest import guest_carts, issue_guest_token
+from .reservations import hold_stock, locked_holdings, release_holdings
+from orders.idempotency import idempotent_response
+from orders.serializers import OrdersSerializer
+from ecommerce_backend.query_planning import QueryPlanMixin
 
-class CartViewSet(viewsets.ModelViewSet):
+class CartViewSet(QueryPlanMixin, viewsets.ModelViewSet):
     serializer_class = CartSerializer
     permission_classes = [IsAuthenticated]
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
+    query_budget = {'list': 4, 'retrieve': 4}
 
     def get_permissions(self):
         if self.action in ['create', 'update', 'destroy']:
@@ -18,16 +32,128 @@ class CartViewSet(viewsets.ModelViewSet):
         return []
 
     def get_queryset(self):
-        return Cart.objects.filter(user=self.request.user)
+        if getattr(self, 'swagger_fake_view', False):
+            return Cart.objects.none()
+        return Cart.objects.filter(user=self.request.user).prefetch_related(prefetch_priced_items())
     
     def perform_create(self, serializer):
-        user = get_user_model().objects.get(username=self.request.user.username)
-        serializer.save(user=user)
+        self._save(serializer, user=self.request.user)
+
+    def perform_update(self, serializer):
+        self._save(serializer)
+
+    def _save(self, serializer, **kwargs):
+        try:
+            with transaction.atomic():
+                serializer.save(**kwargs)
+        except IntegrityError:
+            raise ValidationError({"status": "You already have an open cart; use /cart/current/."})
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        # One pass for all the items rather than one release per cascaded delete.
+        release_holdings(list(CartItem.objects.filter(cart=instance).select_for_update()))
+        instance.delete()
+
+class CurrentCartView(APIView):
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [CachedJWTAuthentication]
+    query_budget = 3
+
+    def get(self, request, *args, **kwargs):
+        cart = get_current_cart(request.user)
+        return Response(CartSerializer(cart).data, status=status.HTTP_200_OK)
+
+class GuestCartView(APIView):
+    permission_classes = [AllowAny]
+    authentication_classes = []
+    throttle_classes = [ScopedRateThrottle]
+    throttle_scope = 'guest_cart'
+
+    def get(self, request, *args, **kwargs):
+        return Response(CartSerializer(guest_carts(request).get()).data)
+
+    def post(self, request, *args, **kwargs):
+        cart = Cart.objects.create(user=None, status='Cart')
+        return Response(
+            {'token': issue_guest_token(cart), 'cart': CartSerializer(cart).data}, status=status.HTTP_201_CREATED,
+        )
+
+class GuestCartItemsView(APIView):
+    permission_classes = [AllowAny]
+    authentication_classes = []
+    throttle_classes = [ScopedRateThrottle]
+    throttle_scope = 'guest_cart'
+
+    def post(self, request, *args, **kwargs):
+        carts = guest_carts(request)
+        serializer = BulkCartItemSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        # Anonymous carts hold no stock, or a script could tie up a product's
+        # whole inventory; the merge on login reserves them.
+        results = apply_item_operations(carts, serializer.validated_data['operations'], reserve=False)
+        return Response({'results': CartItemOperationResultSerializer(results, many=True).data})
 
 class CartItemViewSet(viewsets.ModelViewSet):
     serializer_class = CartItemSerializer
     permission_classes = [IsAuthenticated]
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
+    cursor_ordering = ('id',)
+    query_budget = {'list': 2, 'create': 9, 'update': 11}
 
     def get_queryset(self):
-        return CartItem.objects.filter(cart__user=self.request.user)
\ No newline at end of file
+        if getattr(self, 'swagger_fake_view', False):
+            return CartItem.objects.none()
+        return CartItem.objects.filter(cart__user=self.request.user)
+
+    @transaction.atomic
+    def perform_create(self, serializer):
+        item = CartItem(**serializer.validated_data)
+        hold_stock([item])
+        serializer.save(reserved_quantity=item.reserved_quantity, reserved_until=item.reserved_until)
+
+    @transaction.atomic
+    def perform_update(self, serializer):
+        instance = serializer.instance
+        previous = locked_holdings([instance.pk])
+        product = serializer.validated_data.get('product')
+        item = CartItem(
+            pk=instance.pk,
+            product_id=product.pk if product is not None else instance.product_id,
+            quantity=serializer.validated_data.get('quantity', instance.quantity),
+        )
+        hold_stock([item], previous)
+        serializer.save(reserved_quantity=item.reserved_quantity, reserved_until=item.reserved_until)
+
+class BulkCartItemView(APIView):
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [CachedJWTAuthentication]
+
+    def post(self, request, *args, **kwargs):
+        serializer = BulkCartItemSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = apply_item_operations(
+            Cart.objects.filter(user=request.user), serializer.validated_data['operations'],
+        )
+        return Response({'results': CartItemOperationResultSerializer(results, many=True).data})
+
+def checkout_response(request, pk):
+    """Check out the user's cart `pk`, at most once per Idempotency-Key."""
+    def handler():
+        order = checkout_cart(
+            pk,
+            request.user,
+            shipping_address=request.data.get('shipping_address'),
+            billing_address=request.data.get('billing_address'),
+        )
+        return Response(OrdersSerializer(order).data, status=status.HTTP_201_CREATED)
+
+    return idempotent_response(request, handler)
+
+class CheckoutView(APIView):
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [CachedJWTAuthentication]
+
+    def post(self, request, pk, *args, **kwargs):
+        get_object_or_404(Cart, pk=pk, user=request.user)
+        return checkout_response(request, pk)
@@ -0,0 +1,17 @@
+from django.apps import AppConfig
+
+
+class EcommerceBackendConfig(AppConfig):
+    name = 'ecommerce_backend'
+
+    def ready(self):
+        from django.db import connections
+        from django.db.backends.signals import connection_created
+
+        from . import metrics, query_inspector
+
+        metrics.install_serializer_timer()
+        for install in (metrics.install_query_hook, query_inspector.install_query_hook):
+            connection_created.connect(install)
+            for connection in connections.all(initialized_only=True):
+                install(connection)
@@ -5,3 +5,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "ecommerce_backend.settings")
 
 application = get_asgi_application()
+
+# Build the OpenAPI document now rather than on the first request.
+from ecommerce_backend.schema import schema_cache  # noqa: E402
+
+schema_cache.warm()
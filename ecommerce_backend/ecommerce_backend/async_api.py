@@ -0,0 +1,43 @@
+from functools import wraps
+
+from django.http import Http404, JsonResponse
+from django.views.decorators.http import require_safe
+from rest_framework import exceptions, status
+from rest_framework.request import Request
+from rest_framework.utils.encoders import JSONEncoder
+
+from users.authentication import CachedJWTAuthentication
+
+
+def async_read_view(authenticated=True):
+    """
+    Wrap an async read-only view so it runs natively under ASGI.
+
+    The view receives a DRF `Request` (for `query_params` and serializer
+    context) and must return a Django response. JWT authentication goes
+    through `CachedJWTAuthentication.aauthenticate`, and API exceptions are
+    rendered as `{"detail": ...}` JSON like the DRF views do.
+    """
+    def decorator(view):
+        @require_safe
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            authenticator = CachedJWTAuthentication()
+            drf_request = Request(request, authenticators=())
+            try:
+                result = await authenticator.aauthenticate(request)
+                if result is not None:
+                    drf_request.user, drf_request.auth = result
+                elif authenticated:
+                    raise exceptions.NotAuthenticated()
+                return await view(drf_request, *args, **kwargs)
+            except exceptions.APIException as exc:
+                detail = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+                response = JsonResponse(detail, encoder=JSONEncoder, status=exc.status_code, safe=False)
+                if exc.status_code == status.HTTP_401_UNAUTHORIZED:
+                    response['WWW-Authenticate'] = authenticator.authenticate_header(request)
+                return response
+            except Http404:
+                return JsonResponse({'detail': 'Not found.'}, status=status.HTTP_404_NOT_FOUND)
+        return wrapper
+    return decorator
@@ -0,0 +1,210 @@
+import itertools
+import math
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from cart.current import get_current_cart
+from cart.models import Cart, CartItem
+from products.models import Product
+
+from .datagen import DataGenerator
+
+STOREFRONT_PASSWORD = 'bench-password'
+STOREFRONT_FLOWS = ['register', 'login', 'listing_cold', 'listing_cached', 'product_detail', 'cart_add', 'cart_update', 'checkout']
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def summarize(samples):
+    """Summarize a list of durations in seconds as millisecond statistics."""
+    count = len(samples)
+    total = sum(samples)
+    return {
+        'count': count,
+        'mean_ms': round(total / count * 1000, 3) if count else 0.0,
+        'p50_ms': round(percentile(samples, 50) * 1000, 3),
+        'p95_ms': round(percentile(samples, 95) * 1000, 3),
+        'p99_ms': round(percentile(samples, 99) * 1000, 3),
+        'max_ms': round(max(samples) * 1000, 3) if count else 0.0,
+        'throughput_per_s': round(count / total, 1) if total else 0.0,
+    }
+
+
+def measure(func, iterations, warmup=1):
+    """Call `func(i)` `iterations` times and summarize the wall-clock timings."""
+    for i in range(warmup):
+        func(i)
+    samples = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        func(i)
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def load_test(url, concurrency, requests, headers=None, timeout=30):
+    """
+    Issue `requests` GETs against `url` from `concurrency` threads and
+    summarize the latencies. Throughput is measured over the wall clock of
+    the whole run, not per request.
+    """
+    samples, errors = [], []
+    lock = threading.Lock()
+    remaining = iter(range(requests))
+    start_barrier = threading.Barrier(concurrency + 1)
+
+    def worker():
+        local_samples, local_errors = [], 0
+        start_barrier.wait()
+        while True:
+            with lock:
+                if next(remaining, None) is None:
+                    break
+            request = urllib.request.Request(url, headers=headers or {})
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request, timeout=timeout) as response:
+                    response.read()
+            except (urllib.error.URLError, OSError):
+                local_errors += 1
+                continue
+            local_samples.append(time.perf_counter() - start)
+        with lock:
+            samples.extend(local_samples)
+            errors.append(local_errors)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    start_barrier.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    stats = summarize(samples)
+    stats['throughput_per_s'] = round(len(samples) / elapsed, 1) if elapsed else 0.0
+    stats['errors'] = sum(errors)
+    return stats
+
+
+def format_row(label, stats):
+    return (
+        f"{label:<28} mean {stats['mean_ms']:>9.3f} ms  p50 {stats['p50_ms']:>9.3f} ms  "
+        f"p95 {stats['p95_ms']:>9.3f} ms  p99 {stats['p99_ms']:>9.3f} ms"
+    )
+
+
+def seed_storefront(users, products, carts, items_per_cart, orders, seed=0):
+    """
+    Seed the current database for the storefront flows and return what
+    they draw from: the seeded users, every product id and the open carts.
+    """
+    DataGenerator('bench', seed=seed, password=STOREFRONT_PASSWORD).run(users, products, carts, items_per_cart, orders)
+    return {
+        'users': list(get_user_model().objects.filter(username__startswith='bench-user-')),
+        'product_ids': list(Product.objects.values_list('id', flat=True)),
+        'open_carts': list(Cart.objects.filter(status='Cart', user__isnull=False).select_related('user')),
+    }
+
+
+def authenticated_client(user):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+    return client
+
+
+def storefront_flow(flow, rng, seeded, iterations):
+    """
+    Build one storefront flow over data from `seed_storefront`. Returns
+    `(request, errors)`: `request(i)` makes one call through the full
+    Django stack and `errors` collects unexpected status codes. Raises
+    ValueError when the seeded data can't support `iterations` calls.
+    """
+    user = rng.choice(seeded['users'])
+    client = authenticated_client(user)
+    product_ids = seeded['product_ids']
+    errors = []
+
+    def check(response, expected):
+        if response.status_code != expected:
+            errors.append(response.status_code)
+
+    if flow == 'register':
+        anonymous = APIClient()
+        run_id = uuid.uuid4().hex[:8]
+        usernames = (f'new-{run_id}-{n}' for n in itertools.count())
+
+        def request(i):
+            check(anonymous.post('/users/register/', {'username': next(usernames), 'password': STOREFRONT_PASSWORD}), 201)
+    elif flow == 'login':
+        anonymous = APIClient()
+
+        def request(i):
+            username = rng.choice(seeded['users']).username
+            check(anonymous.post('/users/login/', {'username': username, 'password': STOREFRONT_PASSWORD}), 200)
+    elif flow == 'listing_cold':
+        def request(i):
+            cache.clear()
+            check(client.get('/products/listing/'), 200)
+    elif flow == 'listing_cached':
+        def request(i):
+            check(client.get('/products/listing/'), 200)
+    elif flow == 'product_detail':
+        def request(i):
+            check(client.get(f'/products/{rng.choice(product_ids)}/'), 200)
+    elif flow in ('cart_add', 'cart_update'):
+        cart = get_current_cart(user)
+        item_ids = []
+        # A cart has one line per product, so only add ones it doesn't hold yet.
+        in_cart = set(cart.items.values_list('product_id', flat=True))
+        new_product_ids = (pk for pk in rng.sample(product_ids, len(product_ids)) if pk not in in_cart)
+
+        def request(i):
+            if flow == 'cart_add' or not item_ids:
+                response = client.post(
+                    '/cart/items/', {'cart': cart.pk, 'product_id': next(new_product_ids), 'quantity': 1}, format='json'
+                )
+                check(response, 201)
+                if response.status_code == 201:
+                    item_ids.append(response.data['id'])
+                return
+            item = CartItem.objects.only('product_id').get(pk=rng.choice(item_ids))
+            check(client.put(
+                f'/cart/items/{item.pk}/',
+                {'cart': cart.pk, 'product_id': item.product_id, 'quantity': rng.randint(1, 9)},
+                format='json',
+            ), 200)
+        if flow == 'cart_update':
+            # Untimed setup so every measured request is an update.
+            for i in range(20):
+                request(i)
+    elif flow == 'checkout':
+        carts = list(seeded['open_carts'])
+        if len(carts) < iterations + 1:
+            raise ValueError(
+                "checkout needs more users with an open cart than iterations; raise --users and --carts or lower --orders."
+            )
+        clients = {}
+
+        def request(i):
+            cart = carts.pop()
+            owner = clients.setdefault(cart.user_id, authenticated_client(cart.user))
+            check(owner.post(f'/cart/{cart.pk}/checkout/', {}, format='json'), 201)
+    else:
+        raise ValueError(f"Unknown flow {flow}.")
+    return request, errors
@@ -0,0 +1,285 @@
+"""
+Seeded, referentially consistent synthetic data for every app.
+
+Products and carts get ids derived from the run prefix and their index, so
+cart items can reference any product without keeping millions of ids in
+memory, and the same seed and prefix always produce the same data.
+"""
+import hashlib
+import random
+import time
+import uuid
+from array import array
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import DEFAULT_DB_ALIAS, connection, connections, transaction
+
+from cart.models import Cart, CartItem
+from orders.models import Order, OrderLine
+from products.cache import invalidate_product
+from products.models import Product
+from products.search import FTS_TABLE, FTS_TRIGGERS_SQL, install_fts_index
+
+CENT = Decimal('0.01')
+PRODUCT_TYPES = ['shoes', 'shirts', 'pants', 'hats', 'bags', 'jackets', 'socks', 'watches']
+ADJECTIVES = ['classic', 'light', 'rugged', 'slim', 'vintage', 'urban', 'trail', 'premium', 'everyday', 'waterproof']
+COLOURS = ['black', 'white', 'navy', 'olive', 'red', 'grey', 'tan', 'blue']
+ORDER_STATUSES = ['Received', 'Shipped', 'Delivered']
+
+
+def _digest(prefix, kind, index):
+    return hashlib.blake2b(f'{prefix}:{kind}:{index}'.encode(), digest_size=16).digest()
+
+
+def product_id(prefix, index):
+    return uuid.UUID(bytes=_digest(prefix, 'product', index), version=4)
+
+
+def product_price(prefix, index):
+    # Derived from the id digest so cart totals can be computed without a lookup.
+    cents = 199 + int.from_bytes(_digest(prefix, 'product', index)[:4], 'big') % 50000
+    return (Decimal(cents) / 100).quantize(CENT)
+
+
+def product_traits(prefix, index):
+    """(adjective, colour, type) of a product, also derived from its digest."""
+    digest = _digest(prefix, 'product', index)
+    return ADJECTIVES[digest[4] % len(ADJECTIVES)], COLOURS[digest[5] % len(COLOURS)], PRODUCT_TYPES[digest[6] % len(PRODUCT_TYPES)]
+
+
+def product_name(prefix, index):
+    adjective, colour, product_type = product_traits(prefix, index)
+    return f'{adjective.title()} {colour} {product_type[:-1]} {index}'
+
+
+def cart_id(prefix, index):
+    return uuid.UUID(bytes=_digest(prefix, 'cart', index), version=4)
+
+
+@contextmanager
+def deferred_search_index():
+    """
+    Drop the FTS5 sync triggers for the block and rebuild the index once
+    afterwards, which is far cheaper than updating it row by row.
+    """
+    if connection.vendor != 'sqlite' or FTS_TABLE not in connection.introspection.table_names():
+        yield
+        return
+    with connection.cursor() as cursor:
+        for name in FTS_TRIGGERS_SQL:
+            cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+    try:
+        yield
+    finally:
+        install_fts_index(connection)
+
+
+class BulkWriter:
+    """
+    Inserts model instances in batches. `copy` uses PostgreSQL COPY
+    (psycopg 3), `executemany` a raw multi-row INSERT, and `orm`
+    bulk_create; the raw paths keep the generated timestamps, which
+    bulk_create would overwrite for auto_now_add fields.
+    """
+    METHODS = ('auto', 'copy', 'executemany', 'orm')
+
+    def __init__(self, method='auto'):
+        if method == 'auto':
+            method = 'copy' if self.supports_copy() else 'executemany'
+        if method == 'copy' and not self.supports_copy():
+            raise ValueError('COPY needs PostgreSQL with psycopg 3.')
+        self.method = method
+
+    @staticmethod
+    def supports_copy():
+        if connection.vendor != 'postgresql':
+            return False
+        connection.ensure_connection()
+        return hasattr(connection.connection.cursor(), 'copy')
+
+    def write(self, model, objects):
+        if not objects:
+            return
+        if self.method == 'orm':
+            model.objects.bulk_create(objects, batch_size=len(objects))
+            return
+
+        # Resolve the connection proxy once; per-value lookups dominate otherwise.
+        db = connections[DEFAULT_DB_ALIAS]
+        fields = [field for field in model._meta.concrete_fields if not (field.primary_key and getattr(objects[0], field.attname) is None)]
+        columns = ', '.join(db.ops.quote_name(field.column) for field in fields)
+        table = db.ops.quote_name(model._meta.db_table)
+        rows = [
+            [field.get_db_prep_save(getattr(obj, field.attname), db) for field in fields]
+            for obj in objects
+        ]
+        with db.cursor() as cursor:
+            if self.method == 'copy':
+                with cursor.cursor.copy(f'COPY {table} ({columns}) FROM STDIN') as copy:
+                    for row in rows:
+                        copy.write_row(row)
+            else:
+                placeholders = ', '.join(['%s'] * len(fields))
+                cursor.executemany(f'INSERT INTO {table} ({columns}) VALUES ({placeholders})', rows)
+
+
+class DataGenerator:
+    """
+    Generate users, products, carts with items, and orders in chunks of
+    `chunk_size` rows, each chunk in its own transaction. Memory is bounded
+    by the chunk size plus one integer per user.
+    """
+
+    def __init__(self, prefix, seed=0, chunk_size=5000, method='auto', days=365, password='password', progress=None):
+        self.prefix = prefix
+        self.rng = random.Random(seed)
+        self.chunk_size = chunk_size
+        self.writer = BulkWriter(method)
+        self.now = datetime.now(timezone.utc)
+        self.span = timedelta(days=days).total_seconds()
+        self.password = password
+        self.progress = progress or (lambda written, elapsed: None)
+        self.user_ids = array('q')
+        self.stats = []
+
+    def run(self, users, products, carts, items_per_cart, orders):
+        self.generate_users(users)
+        self.generate_products(products)
+        self.generate_carts(carts, items_per_cart, orders, products)
+        # Raw inserts bypass the product signals, so expire cached listings.
+        invalidate_product(None)
+        return self.stats
+
+    def _timestamp(self):
+        return self.now - timedelta(seconds=self.rng.random() * self.span)
+
+    def _write_chunks(self, chunks):
+        start, written = time.perf_counter(), {}
+        for chunk in chunks:
+            with transaction.atomic():
+                for model, objects in chunk:
+                    self.writer.write(model, objects)
+                    written[model.__name__] = written.get(model.__name__, 0) + len(objects)
+            self.progress(written, time.perf_counter() - start)
+        elapsed = time.perf_counter() - start
+        self.stats.append({
+            'models': dict(written),
+            'rows': sum(written.values()),
+            'seconds': round(elapsed, 2),
+            'rows_per_s': round(sum(written.values()) / elapsed) if elapsed else 0,
+        })
+
+    def _chunked(self, total):
+        for start in range(0, total, self.chunk_size):
+            yield range(start, min(start + self.chunk_size, total))
+
+    def generate_users(self, total):
+        User = get_user_model()
+        # Hashing once keeps PBKDF2 out of the loop; every user shares the password.
+        password = make_password(self.password)
+
+        def chunks():
+            for indexes in self._chunked(total):
+                users = [
+                    User(
+                        username=f'{self.prefix}-user-{index}',
+                        email=f'{self.prefix}-user-{index}@example.com',
+                        password=password,
+                        date_joined=self._timestamp(),
+                    )
+                    for index in indexes
+                ]
+                yield [(User, users)]
+                usernames = [user.username for user in users]
+                self.user_ids.extend(User.objects.filter(username__in=usernames).values_list('id', flat=True))
+
+        self._write_chunks(chunks())
+
+    def generate_products(self, total):
+        def chunks():
+            for indexes in self._chunked(total):
+                objects = []
+                for index in indexes:
+                    created_at = self._timestamp()
+                    adjective, colour, product_type = product_traits(self.prefix, index)
+                    objects.append(Product(
+                        id=product_id(self.prefix, index),
+                        name=product_name(self.prefix, index),
+                        description=f'A {adjective} {colour} {product_type[:-1]} built for everyday use.',
+                        price=product_price(self.prefix, index),
+                        type=product_type,
+                        brand=f'brand-{int(self.rng.paretovariate(1.2)) % 200}',
+                        user_id=self.rng.choice(self.user_ids) if self.user_ids else None,
+                        created_at=created_at,
+                        updated_at=created_at,
+                    ))
+                yield [(Product, objects)]
+
+        with deferred_search_index():
+            self._write_chunks(chunks())
+
+    def generate_carts(self, total, items_per_cart, orders, products):
+        """
+        The first `orders` carts are checked out and get an order with its
+        lines each. Every user has at most one open cart, so open carts
+        beyond the number of users are guest carts.
+        """
+        if orders > total:
+            raise ValueError('Every order needs its own cart.')
+
+        def chunks():
+            for indexes in self._chunked(total):
+                carts, items, order_rows, lines = [], [], [], []
+                for index in indexes:
+                    created_at = self._timestamp()
+                    paid = index < orders
+                    if paid:
+                        user_id = self.rng.choice(self.user_ids) if self.user_ids else None
+                    else:
+                        user_id = self.user_ids[index - orders] if index - orders < len(self.user_ids) else None
+                    cart = Cart(
+                        id=cart_id(self.prefix, index),
+                        user_id=user_id,
+                        created_at=created_at,
+                        status='Paid' if paid else 'Cart',
+                    )
+                    carts.append(cart)
+                    order = Order(
+                        id=uuid.UUID(int=self.rng.getrandbits(128), version=4),
+                        cart_id=cart.id,
+                        user_id=cart.user_id,
+                        created_at=created_at + timedelta(minutes=self.rng.randint(1, 120)),
+                        status=self.rng.choice(ORDER_STATUSES),
+                        total_price=Decimal('0.00'),
+                    ) if paid else None
+                    count = min(products, self.rng.randint(1, max(1, items_per_cart * 2 - 1)))
+                    for product_index in self.rng.sample(range(products), count):
+                        quantity = self.rng.randint(1, 4)
+                        items.append(CartItem(
+                            id=uuid.UUID(int=self.rng.getrandbits(128), version=4),
+                            cart_id=cart.id,
+                            product_id=product_id(self.prefix, product_index),
+                            quantity=quantity,
+                        ))
+                        if order is not None:
+                            unit_price = product_price(self.prefix, product_index)
+                            lines.append(OrderLine(
+                                id=uuid.UUID(int=self.rng.getrandbits(128), version=4),
+                                order_id=order.id,
+                                product_id=product_id(self.prefix, product_index),
+                                product_name=product_name(self.prefix, product_index),
+                                unit_price=unit_price,
+                                quantity=quantity,
+                                subtotal=unit_price * quantity,
+                            ))
+                            order.total_price += unit_price * quantity
+                            order.item_count += quantity
+                    if order is not None:
+                        order_rows.append(order)
+                yield [(Cart, carts), (CartItem, items), (Order, order_rows), (OrderLine, lines)]
+
+        self._write_chunks(chunks())
@@ -0,0 +1,59 @@
+import os
+
+import django
+from django.core.exceptions import ImproperlyConfigured
+
+
+def database_config(base_dir):
+    """
+    Build the default DATABASES entry from the environment.
+
+    DB_ENGINE=sqlite (default) uses the WAL-enabled SQLite backend.
+    DB_ENGINE=postgresql reads DB_NAME/DB_USER/DB_PASSWORD/DB_HOST/DB_PORT,
+    keeps connections open for DB_CONN_MAX_AGE seconds with health checks,
+    and supports DB_POOL=pgbouncer (an external transaction pooler) or
+    DB_POOL=native (psycopg's pool, Django 5.1+).
+    """
+    engine = os.getenv('DB_ENGINE', 'sqlite')
+    if engine == 'sqlite':
+        return {
+            "ENGINE": "ecommerce_backend.sqlite3",
+            "NAME": os.getenv('DB_NAME', base_dir / "db.sqlite3"),
+            "OPTIONS": {
+                "timeout": int(os.getenv('DB_TIMEOUT', 20)),
+                "pragmas": {"journal_mode": os.getenv('DB_SQLITE_JOURNAL_MODE', 'WAL')},
+            },
+            # A file rather than shared-cache memory, so threaded tests get
+            # SQLite's normal locking and busy timeout.
+            "TEST": {"NAME": os.getenv('DB_TEST_NAME', base_dir / "test_db.sqlite3")},
+        }
+    if engine != 'postgresql':
+        raise ImproperlyConfigured(f"Unsupported DB_ENGINE '{engine}', use 'sqlite' or 'postgresql'.")
+
+    config = {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": os.getenv('DB_NAME', 'ecommerce'),
+        "USER": os.getenv('DB_USER', 'postgres'),
+        "PASSWORD": os.getenv('DB_PASSWORD', ''),
+        "HOST": os.getenv('DB_HOST', 'localhost'),
+        "PORT": os.getenv('DB_PORT', '5432'),
+        "CONN_MAX_AGE": int(os.getenv('DB_CONN_MAX_AGE', 60)),
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {},
+    }
+    pool = os.getenv('DB_POOL', '')
+    if pool == 'pgbouncer':
+        # Transaction pooling can't keep a named cursor open across queries.
+        config["DISABLE_SERVER_SIDE_CURSORS"] = True
+    elif pool == 'native':
+        if django.VERSION < (5, 1):
+            raise ImproperlyConfigured("DB_POOL=native requires Django 5.1 or later.")
+        # Pooled connections are returned to the pool, not kept per thread.
+        config["CONN_MAX_AGE"] = 0
+        config["OPTIONS"]["pool"] = {
+            "min_size": int(os.getenv('DB_POOL_MIN_SIZE', 2)),
+            "max_size": int(os.getenv('DB_POOL_MAX_SIZE', 20)),
+        }
+    elif pool:
+        raise ImproperlyConfigured(f"Unsupported DB_POOL '{pool}', use 'pgbouncer' or 'native'.")
+    return config
@@ -0,0 +1,155 @@
+import mimetypes
+import posixpath
+import re
+from pathlib import Path
+
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date, parse_etags, quote_etag
+from django.views.decorators.http import require_safe
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+DEFAULT_CACHE_CONTROL = 'public, max-age=3600, must-revalidate'
+
+# Encodings precompressed by CompressedManifestStaticFilesStorage, in
+# order of preference.
+PRECOMPRESSED = (('br', '.br'), ('gzip', '.gz'))
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+RENDITION_RE = re.compile(r'(^|/)renditions/[0-9a-f]{16}-\d+w\.webp$')
+CHUNK_SIZE = 64 * 1024
+
+_hashed_static_names = None
+
+
+def is_hashed_static(path):
+    global _hashed_static_names
+    if _hashed_static_names is None:
+        _hashed_static_names = frozenset(getattr(staticfiles_storage, 'hashed_files', {}).values())
+    return path in _hashed_static_names
+
+
+def is_immutable_media(path):
+    return bool(RENDITION_RE.search(path))
+
+
+@require_safe
+def serve_static(request, path, document_root):
+    return serve_file(request, path, document_root, immutable=is_hashed_static(path), precompressed=True)
+
+
+@require_safe
+def serve_media(request, path, document_root):
+    return serve_file(request, path, document_root, immutable=is_immutable_media(path))
+
+
+def serve_file(request, path, document_root, immutable=False, precompressed=False):
+    """
+    Serve a file below `document_root` with validators, long-lived caching
+    for content-addressed names, precompressed variants and single byte
+    ranges. Meant for deployments without a separate file server.
+    """
+    path = posixpath.normpath(path).lstrip('/')
+    fullpath = Path(safe_join(document_root, path))
+    if not fullpath.is_file():
+        raise Http404('File not found.')
+
+    content_type, _ = mimetypes.guess_type(str(fullpath))
+    content_type = content_type or 'application/octet-stream'
+    encoding = None
+    if precompressed:
+        accepted = accepted_encodings(request.headers.get('Accept-Encoding', ''))
+        # Highest q-value first; ties keep the PRECOMPRESSED order.
+        candidates = sorted(
+            ((accepted.get(name, accepted.get('*', 0)), name, suffix) for name, suffix in PRECOMPRESSED),
+            key=lambda candidate: -candidate[0],
+        )
+        for quality, name, suffix in candidates:
+            if quality > 0 and fullpath.with_name(fullpath.name + suffix).is_file():
+                encoding, fullpath = name, fullpath.with_name(fullpath.name + suffix)
+                break
+
+    stat = fullpath.stat()
+    etag = quote_etag(f'{stat.st_mtime_ns:x}-{stat.st_size:x}' + (f'-{encoding}' if encoding else ''))
+    headers = {
+        'ETag': etag,
+        'Last-Modified': http_date(stat.st_mtime),
+        'Cache-Control': IMMUTABLE_CACHE_CONTROL if immutable else DEFAULT_CACHE_CONTROL,
+        'Accept-Ranges': 'bytes' if encoding is None else 'none',
+    }
+
+    if_none_match = parse_etags(request.headers.get('If-None-Match', ''))
+    if etag in if_none_match or '*' in if_none_match:
+        response = HttpResponseNotModified()
+    elif encoding is None and 'Range' in request.headers and _if_range_matches(request, etag):
+        response = _range_response(fullpath, stat.st_size, request.headers['Range'], content_type)
+    else:
+        response = FileResponse(fullpath.open('rb'), content_type=content_type)
+        if encoding:
+            response['Content-Encoding'] = encoding
+    for header, value in headers.items():
+        response[header] = value
+    if precompressed:
+        patch_vary_headers(response, ['Accept-Encoding'])
+    return response
+
+
+def accepted_encodings(header):
+    """Map each content coding in an Accept-Encoding header to its q-value."""
+    accepted = {}
+    for part in header.split(','):
+        coding, *params = [piece.strip() for piece in part.split(';')]
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding.lower()] = quality
+    return accepted
+
+
+def _if_range_matches(request, etag):
+    # A stale If-Range means the client's partial copy is outdated, so the
+    # whole file is sent instead.
+    if_range = request.headers.get('If-Range')
+    return if_range is None or if_range == etag
+
+
+def _range_response(fullpath, size, header, content_type):
+    match = RANGE_RE.match(header.strip())
+    if not match or match.groups() == ('', ''):
+        # Multiple or malformed ranges: fall back to the full file.
+        return FileResponse(fullpath.open('rb'), content_type=content_type)
+
+    first, last = match.groups()
+    if first == '':
+        start, end = max(0, size - int(last)), size - 1
+    else:
+        start, end = int(first), min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    response = StreamingHttpResponse(_read_range(fullpath, start, end - start + 1), status=206, content_type=content_type)
+    response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response['Content-Length'] = str(end - start + 1)
+    return response
+
+
+def _read_range(fullpath, start, length):
+    with fullpath.open('rb') as file:
+        file.seek(start)
+        while length > 0:
+            chunk = file.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
@@ -0,0 +1,111 @@
+import json
+import random
+import subprocess
+import time
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+
+from ecommerce_backend.benchmarking import STOREFRONT_FLOWS, format_row, measure, seed_storefront, storefront_flow
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway test database with users, products, carts and "
+        "orders, then measure the storefront flows through the full Django "
+        "stack and report p50/p95/p99 latency and throughput per flow."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=500)
+        parser.add_argument('--products', type=int, default=10000)
+        parser.add_argument('--carts', type=int, default=1000)
+        parser.add_argument('--items-per-cart', type=int, default=5)
+        parser.add_argument('--orders', type=int, default=500)
+        parser.add_argument('--iterations', type=int, default=200, help="Measured requests per flow.")
+        parser.add_argument('--flows', nargs='+', choices=STOREFRONT_FLOWS, default=STOREFRONT_FLOWS)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--fast-passwords', action='store_true',
+            help="Hash passwords with MD5 so register/login measure the app rather than PBKDF2.",
+        )
+        parser.add_argument('--output', help="Write the results as JSON to this file.")
+        parser.add_argument('--compare', help="A previous --output file to compare p95 latencies against.")
+
+    def handle(self, *args, **options):
+        if options['orders'] > options['carts']:
+            raise CommandError("--orders cannot exceed --carts; every order checks out a cart.")
+        baseline = self._load(options['compare']) if options['compare'] else None
+
+        hashers = ['django.contrib.auth.hashers.MD5PasswordHasher'] if options['fast_passwords'] else settings.PASSWORD_HASHERS
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            with override_settings(PASSWORD_HASHERS=hashers):
+                cache.clear()
+                rng = random.Random(options['seed'])
+                seeded = self._seed(options)
+                results = {flow: self._run(flow, rng, seeded, options['iterations']) for flow in options['flows']}
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        report = {
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'commit': self._commit(),
+            'database': connection.vendor,
+            'volumes': {key: options[key] for key in ('users', 'products', 'carts', 'items_per_cart', 'orders')},
+            'iterations': options['iterations'],
+            'fast_passwords': options['fast_passwords'],
+            'results': results,
+        }
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(report, output, indent=2)
+
+        for flow, stats in results.items():
+            row = format_row(flow, stats) + f"  {stats['throughput_per_s']:.0f} req/s"
+            if stats['errors']:
+                row += f"  {stats['errors']} errors"
+            previous = (baseline or {}).get('results', {}).get(flow)
+            if previous and previous['p95_ms']:
+                row += f"  p95 {(stats['p95_ms'] - previous['p95_ms']) / previous['p95_ms']:+.1%}"
+            self.stdout.write(row)
+
+    def _load(self, path):
+        try:
+            with open(path) as baseline:
+                return json.load(baseline)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Cannot read {path}: {exc}")
+
+    def _commit(self):
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+                cwd=settings.BASE_DIR,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def _seed(self, options):
+        start = time.perf_counter()
+        seeded = seed_storefront(
+            options['users'], options['products'], options['carts'], options['items_per_cart'], options['orders'],
+            seed=options['seed'],
+        )
+        self.stdout.write(f"Seeded in {time.perf_counter() - start:.1f}s")
+        return seeded
+
+    def _run(self, flow, rng, seeded, iterations):
+        try:
+            request, errors = storefront_flow(flow, rng, seeded, iterations)
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        stats = measure(request, iterations)
+        stats['errors'] = len(errors)
+        return stats
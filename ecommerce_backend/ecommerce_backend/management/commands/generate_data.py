@@ -0,0 +1,53 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from ecommerce_backend.datagen import BulkWriter, DataGenerator
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate seeded synthetic users, products, carts, cart items and "
+        "orders in batches, reporting rows per second. Runs with the same "
+        "seed and prefix produce the same data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--products', type=int, default=100000)
+        parser.add_argument('--carts', type=int, default=50000)
+        parser.add_argument('--items-per-cart', type=int, default=3, help="Average items per cart.")
+        parser.add_argument('--orders', type=int, default=20000, help="Carts checked out into orders.")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--prefix', help="Prefix for usernames and derived ids; defaults to gen<seed>.")
+        parser.add_argument('--chunk-size', type=int, default=5000)
+        parser.add_argument('--method', choices=BulkWriter.METHODS, default='auto')
+        parser.add_argument('--password', default='password', help="Password shared by every generated user.")
+
+    def handle(self, *args, **options):
+        prefix = options['prefix'] or f"gen{options['seed']}"
+        if options['orders'] > options['carts']:
+            raise CommandError("--orders cannot exceed --carts; every order checks out a cart.")
+        if options['carts'] and not options['products']:
+            raise CommandError("Carts need products to hold.")
+        if get_user_model().objects.filter(username__startswith=f'{prefix}-user-').exists():
+            raise CommandError(f"Data with prefix {prefix!r} already exists; pass another --prefix or --seed.")
+
+        def progress(written, elapsed):
+            rows = sum(written.values())
+            summary = ', '.join(f'{count} {name}' for name, count in written.items())
+            self.stdout.write(f"  {summary} ({rows / elapsed if elapsed else 0:,.0f} rows/s)")
+
+        try:
+            generator = DataGenerator(
+                prefix, seed=options['seed'], chunk_size=options['chunk_size'], method=options['method'],
+                password=options['password'], progress=progress,
+            )
+        except ValueError as exc:
+            raise CommandError(exc)
+        self.stdout.write(f"Writing with {generator.writer.method}.")
+        phases = generator.run(
+            options['users'], options['products'], options['carts'], options['items_per_cart'], options['orders'],
+        )
+        for phase in phases:
+            models = ', '.join(f'{count} {name}' for name, count in phase['models'].items())
+            self.stdout.write(self.style.SUCCESS(f"{models} in {phase['seconds']}s ({phase['rows_per_s']:,} rows/s)"))
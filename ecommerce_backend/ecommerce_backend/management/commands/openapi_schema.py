@@ -0,0 +1,42 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ecommerce_backend.schema import build_schema, comparable, encode_schema
+
+
+class Command(BaseCommand):
+    help = (
+        "Write the OpenAPI schema to a file (swagger.json by default), or "
+        "with --check fail if that file no longer matches the live code."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=str(settings.OPENAPI_SCHEMA_FILE))
+        parser.add_argument('--url', default='http://127.0.0.1:8080', help="Base API URL; sets host and schemes.")
+        parser.add_argument('--check', action='store_true', help="Compare instead of writing; exit 1 on drift.")
+
+    def handle(self, *args, **options):
+        output = Path(options['output'])
+        document = encode_schema(build_schema(url=options['url']))
+
+        if not options['check']:
+            output.write_bytes(document)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {output}."))
+            return
+
+        if not output.exists():
+            raise CommandError(f"{output} does not exist; run openapi_schema to create it.")
+        live, stored = comparable(document), comparable(output.read_bytes())
+        if live != stored:
+            changed = sorted(
+                set(live.get('paths', {})) ^ set(stored.get('paths', {}))
+                | {path for path in live.get('paths', {}) if live['paths'][path] != stored.get('paths', {}).get(path)}
+            )
+            if live.get('definitions') != stored.get('definitions'):
+                changed.append('definitions')
+            raise CommandError(
+                f"{output} is out of date ({', '.join(changed) or 'metadata'} changed); run openapi_schema to update it."
+            )
+        self.stdout.write(self.style.SUCCESS(f"{output} matches the live schema."))
@@ -0,0 +1,280 @@
+import functools
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import require_safe
+from rest_framework.renderers import JSONRenderer
+from rest_framework.serializers import BaseSerializer
+
+from users.authentication import user_cache
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class RequestStats:
+    """Timings collected while one request is handled."""
+    __slots__ = ('queries', 'sql_time', 'serialize_time', 'render_time', 'serializing')
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_time = 0.0
+        self.serialize_time = 0.0
+        self.render_time = 0.0
+        self.serializing = False
+
+
+# Set by the middleware; sync_to_async copies the context, so queries run
+# in worker threads of async views are still attributed to the request.
+current_stats = ContextVar('current_stats', default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    """Execute wrapper installed on every database connection."""
+    stats = current_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.sql_time += time.perf_counter() - start
+
+
+def install_query_hook(connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def _timed_data(fget):
+    @functools.wraps(fget)
+    def data(serializer):
+        stats = current_stats.get()
+        # Serializers reading other serializers' .data are timed once.
+        if stats is None or stats.serializing:
+            return fget(serializer)
+        stats.serializing = True
+        start = time.perf_counter()
+        try:
+            return fget(serializer)
+        finally:
+            stats.serializing = False
+            stats.serialize_time += time.perf_counter() - start
+    data.timed = True
+    return data
+
+
+def install_serializer_timer():
+    """
+    Time `.data` on every DRF serializer, which is where views turn
+    instances into primitives (and where lazy relations are loaded, so
+    that SQL time is counted in both).
+    """
+    if not getattr(BaseSerializer.data.fget, 'timed', False):
+        BaseSerializer.data = property(_timed_data(BaseSerializer.data.fget))
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self, name, labels):
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            yield f'{name}_bucket', {**labels, 'le': _format_value(bound)}, cumulative
+        yield f'{name}_bucket', {**labels, 'le': '+Inf'}, self.count
+        yield f'{name}_sum', labels, self.sum
+        yield f'{name}_count', labels, self.count
+
+
+class MetricsRegistry:
+    """
+    Per-endpoint request metrics, labelled by method and URL route (the
+    pattern, not the path, to keep cardinality bounded). Every worker
+    process keeps its own registry.
+    """
+    HISTOGRAMS = {
+        'http_request_duration_seconds': ('Request latency.', LATENCY_BUCKETS),
+        'http_request_db_queries': ('Database queries per request.', QUERY_BUCKETS),
+        'http_request_db_seconds': ('Time spent in SQL per request.', LATENCY_BUCKETS),
+        'http_response_serialize_seconds': ('Time spent in serializer .data.', LATENCY_BUCKETS),
+        'http_response_render_seconds': ('Time spent rendering the response body.', LATENCY_BUCKETS),
+        'http_response_size_bytes': ('Response body size.', SIZE_BUCKETS),
+    }
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._responses = {}
+
+    def observe(self, method, route, status, duration, stats, size):
+        key = (method, route)
+        values = {
+            'http_request_duration_seconds': duration,
+            'http_request_db_queries': stats.queries,
+            'http_request_db_seconds': stats.sql_time,
+            'http_response_serialize_seconds': stats.serialize_time,
+            'http_response_render_seconds': stats.render_time,
+        }
+        if size is not None:
+            values['http_response_size_bytes'] = size
+        with self._lock:
+            histograms = self._histograms.get(key)
+            if histograms is None:
+                histograms = self._histograms[key] = {
+                    name: Histogram(buckets) for name, (_, buckets) in self.HISTOGRAMS.items()
+                }
+            for name, value in values.items():
+                histograms[name].observe(value)
+            response_key = (method, route, str(status))
+            self._responses[response_key] = self._responses.get(response_key, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._histograms.clear()
+            self._responses.clear()
+
+    def exposition(self):
+        """Render every metric in the Prometheus text format."""
+        lines = []
+        with self._lock:
+            lines += _header('http_responses_total', 'counter', 'Responses by status code.')
+            for (method, route, status), count in sorted(self._responses.items()):
+                lines.append(_sample('http_responses_total', {'method': method, 'route': route, 'status': status}, count))
+            for name, (help_text, _) in self.HISTOGRAMS.items():
+                lines += _header(name, 'histogram', help_text)
+                for (method, route), histograms in sorted(self._histograms.items()):
+                    for sample_name, labels, value in histograms[name].samples(name, {'method': method, 'route': route}):
+                        lines.append(_sample(sample_name, labels, value))
+
+        cache_stats = user_cache.stats()
+        lines += _header('auth_user_cache_hits_total', 'counter', 'Authenticated user cache hits.')
+        lines.append(_sample('auth_user_cache_hits_total', {}, cache_stats['hits']))
+        lines += _header('auth_user_cache_misses_total', 'counter', 'Authenticated user cache misses.')
+        lines.append(_sample('auth_user_cache_misses_total', {}, cache_stats['misses']))
+        lines += _header('auth_user_cache_size', 'gauge', 'Users currently cached.')
+        lines.append(_sample('auth_user_cache_size', {}, cache_stats['size']))
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+def _header(name, kind, help_text):
+    return [f'# HELP {name} {help_text}', f'# TYPE {name} {kind}']
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _sample(name, labels, value):
+    if labels:
+        rendered = ','.join(
+            '{}="{}"'.format(key, str(label).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+            for key, label in labels.items()
+        )
+        name = f'{name}{{{rendered}}}'
+    return f'{name} {_format_value(value)}'
+
+
+class MetricsMiddleware:
+    """
+    Record latency, query count, SQL, serializer and render time and response size
+    for every request, and describe them in a `Server-Timing` header when
+    `SERVER_TIMING` is enabled. Supports both sync and async stacks.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.server_timing = getattr(settings, 'SERVER_TIMING', False)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats, token, start = self._start()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_stats.reset(token)
+        return self._finish(request, response, stats, start)
+
+    async def __acall__(self, request):
+        stats, token, start = self._start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_stats.reset(token)
+        return self._finish(request, response, stats, start)
+
+    def _start(self):
+        stats = RequestStats()
+        return stats, current_stats.set(stats), time.perf_counter()
+
+    def _finish(self, request, response, stats, start):
+        duration = time.perf_counter() - start
+        match = request.resolver_match
+        route = match.route if match is not None else 'unmatched'
+        if getattr(response, 'streaming', False):
+            size = int(response['Content-Length']) if response.has_header('Content-Length') else None
+        else:
+            size = len(response.content)
+        registry.observe(request.method, route, response.status_code, duration, stats, size)
+
+        if self.server_timing:
+            response['Server-Timing'] = ', '.join([
+                f'app;dur={duration * 1000:.1f}',
+                f'db;dur={stats.sql_time * 1000:.1f};desc="{stats.queries} queries"',
+                f'serialize;dur={stats.serialize_time * 1000:.1f}',
+                f'render;dur={stats.render_time * 1000:.1f}',
+            ])
+        return response
+
+
+class TimedJSONRenderer(JSONRenderer):
+    """JSON renderer that reports its time to the metrics middleware."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        start = time.perf_counter()
+        try:
+            return super().render(data, accepted_media_type, renderer_context)
+        finally:
+            stats = current_stats.get()
+            if stats is not None:
+                stats.render_time += time.perf_counter() - start
+
+
+@require_safe
+def metrics_view(request):
+    """
+    Prometheus scrape endpoint. With METRICS_TOKEN set it requires that
+    bearer token; without one it only answers while DEBUG is on.
+    """
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if not token:
+        if not settings.DEBUG:
+            raise Http404
+    elif not constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponseForbidden()
+    return HttpResponse(registry.exposition(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,133 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination that seeks on the full ordering tuple instead of an
+    offset, so every page is a single indexed range scan.
+
+    Views can override the ordering with a `cursor_ordering` attribute; the
+    last field should be unique (usually the primary key) to keep it stable.
+    """
+    ordering = ('-created_at', '-id')
+    page_size_query_param = 'page_size'
+    max_page_size = getattr(settings, 'MAX_PAGE_SIZE', 100)
+
+    def get_ordering(self, request, queryset, view):
+        return tuple(getattr(view, 'cursor_ordering', self.ordering))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page([row async for row in queryset])
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """Return the queryset slice for the requested page, plus one row to detect more."""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.model = queryset.model
+        self.reverse, self.position = self.decode_cursor(request)
+
+        ordering = _reverse_ordering(self.ordering) if self.reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if self.position is not None:
+            queryset = queryset.filter(_seek(ordering, self.position))
+        return queryset[:self.page_size + 1]
+
+    def set_page(self, results):
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if self.reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = self.position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.position is not None
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(False, self._get_position(self.page[-1]))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(True, self._get_position(self.page[0]))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return False, None
+
+        try:
+            padding = '=' * (-len(encoded) % 4)
+            token = json.loads(urlsafe_b64decode(encoded + padding))
+            values = token['p']
+            if len(values) != len(self.ordering):
+                raise ValueError('Cursor does not match the ordering.')
+            position = [
+                self.model._meta.get_field(field.lstrip('-')).to_python(value)
+                for field, value in zip(self.ordering, values)
+            ]
+            return bool(token.get('r')), position
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, reverse, position):
+        token = {'p': position}
+        if reverse:
+            token['r'] = 1
+        encoded = urlsafe_b64encode(json.dumps(token, separators=(',', ':')).encode()).decode().rstrip('=')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def _get_position(self, instance):
+        position = []
+        for field in self.ordering:
+            attname = self.model._meta.get_field(field.lstrip('-')).attname
+            if isinstance(instance, dict):
+                value = instance.get(attname, instance.get(field.lstrip('-')))
+            else:
+                value = getattr(instance, attname)
+            position.append(value.isoformat() if hasattr(value, 'isoformat') else str(value))
+        return position
+
+
+def _reverse_ordering(ordering):
+    return tuple(field[1:] if field.startswith('-') else '-' + field for field in ordering)
+
+
+def _seek(ordering, position):
+    """
+    Build the lexicographic "row comes after `position`" condition, i.e.
+    (a, b) > (x, y) expanded to `a > x OR (a = x AND b > y)`.
+    """
+    condition = Q()
+    equal = {}
+    for field, value in zip(ordering, position):
+        name = field.lstrip('-')
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        condition |= Q(**equal, **{f'{name}__{lookup}': value})
+        equal[name] = value
+    return condition
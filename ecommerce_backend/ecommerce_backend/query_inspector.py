@@ -0,0 +1,180 @@
+import logging
+import re
+import time
+import traceback
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = str(Path(settings.BASE_DIR).resolve())
+# Frames of the query hooks themselves never explain where a query came from.
+IGNORED_FRAMES = (__file__, metrics.__file__, '/site-packages/', '/dist-packages/', '<frozen ')
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST_RE = re.compile(r'\bIN\s*\((?:\s*(?:%s|\?|\d+)\s*,?)+\)', re.IGNORECASE)
+_SPACE_RE = re.compile(r'\s+')
+
+
+def normalize_sql(sql):
+    """
+    Reduce a statement to its shape: literals and placeholders become `?`
+    and IN lists collapse to `IN (...)`, so queries that differ only in
+    their parameters group together.
+    """
+    sql = _STRING_RE.sub('?', sql)
+    sql = _IN_LIST_RE.sub('IN (...)', sql)
+    sql = _NUMBER_RE.sub('?', sql.replace('%s', '?'))
+    return _SPACE_RE.sub(' ', sql).strip()
+
+
+def origin_frame():
+    """The innermost stack frame in project code, as `path:line in function`."""
+    for frame in reversed(traceback.extract_stack()):
+        if frame.filename.startswith(PROJECT_ROOT) and not any(part in frame.filename for part in IGNORED_FRAMES):
+            return f'{Path(frame.filename).relative_to(PROJECT_ROOT)}:{frame.lineno} in {frame.name}'
+    return None
+
+
+class QueryLog:
+    """Every statement one request (or block) executed, grouped by shape."""
+
+    def __init__(self, slow_threshold=None):
+        self.slow_threshold = slow_threshold
+        self.groups = defaultdict(list)
+        self.slow = []
+        self.count = 0
+
+    def add(self, sql, duration):
+        self.count += 1
+        shape = normalize_sql(sql)
+        group = self.groups[shape]
+        # Only the first occurrence needs a stack walk to locate the caller.
+        group.append((duration, origin_frame() if not group else None))
+        if self.slow_threshold is not None and duration >= self.slow_threshold:
+            self.slow.append((sql, duration, group[-1][1] or group[0][1]))
+
+    def repeated(self, threshold):
+        """(count, shape, origin) for every shape run at least `threshold` times."""
+        return sorted(
+            ((len(runs), shape, runs[0][1]) for shape, runs in self.groups.items() if len(runs) >= threshold),
+            reverse=True,
+        )
+
+
+current_log = ContextVar('current_query_log', default=None)
+
+
+def inspect_query(execute, sql, params, many, context):
+    """Execute wrapper installed on every database connection."""
+    log = current_log.get()
+    if log is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        log.add(sql, time.perf_counter() - start)
+
+
+def install_query_hook(connection, **kwargs):
+    if inspect_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(inspect_query)
+
+
+@contextmanager
+def capture_queries(slow_threshold=None):
+    """Collect the queries run in the block, including sync_to_async threads."""
+    log = QueryLog(slow_threshold)
+    token = current_log.set(log)
+    try:
+        yield log
+    finally:
+        current_log.reset(token)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def view_query_budget(match, method):
+    """
+    The `query_budget` declared on the resolved view function or class, if
+    any. A viewset may map action names to budgets instead, leaving actions
+    whose cost grows with the data (cascading deletes, checkout) unbudgeted.
+    """
+    func = getattr(match, 'func', None)
+    view_class = getattr(func, 'cls', None) or getattr(func, 'view_class', None)
+    budget = getattr(view_class, 'query_budget', getattr(func, 'query_budget', None))
+    if isinstance(budget, dict):
+        action = (getattr(func, 'actions', None) or {}).get(method.lower())
+        return budget.get(action)
+    return budget
+
+
+class QueryInspectorMiddleware:
+    """
+    Development/staging aid, enabled with `QUERY_INSPECTOR`. Logs every
+    statement shape a request repeats `QUERY_INSPECTOR_REPEAT_THRESHOLD`
+    times or more (the N+1 pattern) and every query slower than
+    `QUERY_INSPECTOR_SLOW_MS`, with the view and the project frame that
+    issued it. Views may declare a `query_budget`; with
+    `QUERY_INSPECTOR_STRICT` exceeding it or repeating a query raises
+    `QueryBudgetExceeded`, which fails tests.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'QUERY_INSPECTOR', False)
+        self.repeat_threshold = getattr(settings, 'QUERY_INSPECTOR_REPEAT_THRESHOLD', 5)
+        self.slow_threshold = getattr(settings, 'QUERY_INSPECTOR_SLOW_MS', 100) / 1000
+        self.strict = getattr(settings, 'QUERY_INSPECTOR_STRICT', False)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+        with capture_queries(self.slow_threshold) as log:
+            response = self.get_response(request)
+        self.report(request, log)
+        return response
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+        with capture_queries(self.slow_threshold) as log:
+            response = await self.get_response(request)
+        self.report(request, log)
+        return response
+
+    def report(self, request, log):
+        match = request.resolver_match
+        view = (match.view_name or match._func_path) if match is not None else request.path
+        problems = []
+
+        for sql, duration, origin in log.slow:
+            logger.warning('Slow query (%.1f ms) in %s from %s: %s', duration * 1000, view, origin, sql)
+        for count, shape, origin in log.repeated(self.repeat_threshold):
+            logger.warning('Query repeated %d times in %s from %s: %s', count, view, origin, shape)
+            problems.append(f'{count}x {shape} (from {origin})')
+
+        budget = view_query_budget(match, request.method)
+        if budget is not None and log.count > budget:
+            logger.warning('%s ran %d queries, over its budget of %d', view, log.count, budget)
+            problems.insert(0, f'{log.count} queries, budget {budget}')
+
+        if self.strict and problems:
+            raise QueryBudgetExceeded(f'{request.method} {request.path} ({view}): ' + '; '.join(problems))
@@ -0,0 +1,70 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+def plan_queryset(queryset, serializer_class, restrict_columns=True):
+    """
+    Apply select_related/prefetch_related/only() to `queryset` so that
+    serializing it with `serializer_class` needs no further queries.
+    """
+    select, prefetch, columns = set(), set(), set()
+    load_all = not restrict_columns
+
+    for field in serializer_class().fields.values():
+        if field.write_only:
+            continue
+        if field.source == '*' or isinstance(field, serializers.SerializerMethodField):
+            load_all = True
+            continue
+
+        model = queryset.model
+        path = []
+        for depth, attr in enumerate(field.source_attrs, start=1):
+            try:
+                model_field = model._meta.get_field(attr)
+            except FieldDoesNotExist:
+                # A property or method; we can't know what it touches.
+                load_all = True
+                break
+            path.append(attr)
+            if model_field.many_to_many or model_field.one_to_many:
+                prefetch.add('__'.join(path))
+                break
+            if not model_field.is_relation:
+                columns.add('__'.join(path))
+                break
+            if depth == len(field.source_attrs):
+                if isinstance(field, serializers.BaseSerializer):
+                    select.add('__'.join(path))
+                    load_all = True
+                else:
+                    columns.add('__'.join(path))
+                break
+            select.add('__'.join(path))
+            model = model_field.related_model
+
+    if select:
+        queryset = queryset.select_related(*sorted(select))
+    if prefetch:
+        queryset = queryset.prefetch_related(*sorted(prefetch))
+    if columns and not load_all:
+        queryset = queryset.only(*sorted(columns))
+    return queryset
+
+
+class QueryPlanMixin:
+    """
+    Generic view mixin that plans the queryset from the view's serializer.
+
+    Column restriction is only applied to read requests, so writes still
+    operate on fully loaded instances.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        return plan_queryset(
+            queryset,
+            self.get_serializer_class(),
+            restrict_columns=self.request.method in SAFE_METHODS,
+        )
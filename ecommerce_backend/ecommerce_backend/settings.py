@@ -3,6 +3,8 @@ from pathlib import Path
 
 from dotenv import load_dotenv
 
+from .db import database_config
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 load_dotenv()
@@ -28,18 +30,36 @@ INSTALLED_APPS = [
     'cart',
     'corsheaders',
     'drf_yasg',
+    'ecommerce_backend',
 ]
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'ecommerce_backend.metrics.TimedJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PAGINATION_CLASS': 'ecommerce_backend.pagination.KeysetPagination',
+    'PAGE_SIZE': int(os.getenv('PAGE_SIZE', 20)),
+    'DEFAULT_THROTTLE_RATES': {
+        # Anonymous guest-cart requests, per client IP.
+        'guest_cart': os.getenv('GUEST_CART_THROTTLE_RATE', '60/min'),
+    },
 }
 
+MAX_PAGE_SIZE = int(os.getenv('MAX_PAGE_SIZE', 100))
+
+AUTH_USER_CACHE_TTL = int(os.getenv('AUTH_USER_CACHE_TTL', 60))
+AUTH_USER_CACHE_SIZE = int(os.getenv('AUTH_USER_CACHE_SIZE', 10000))
+
 MIDDLEWARE = [
+    "ecommerce_backend.metrics.MetricsMiddleware",
+    "ecommerce_backend.query_inspector.QueryInspectorMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -70,17 +90,25 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "ecommerce_backend.wsgi.application"
 
-DATABASES = {
+CACHES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
-        'USER': 'your_db_user',
-        'PASSWORD': 'your_db_password',
-        'HOST': 'localhost',
-        'PORT': '5432',
+        "BACKEND": os.getenv('CACHE_BACKEND', "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv('CACHE_LOCATION', "ecommerce"),
     }
 }
 
+PRODUCT_CACHE_TIMEOUT = int(os.getenv('PRODUCT_CACHE_TIMEOUT', 300))
+
+# Seconds a cart item holds its stock; release_expired_reservations frees it afterwards.
+CART_RESERVATION_TTL = int(os.getenv('CART_RESERVATION_TTL', 900))
+
+# Seconds a guest cart token stays valid; purge_guest_carts deletes carts left longer.
+GUEST_CART_MAX_AGE = int(os.getenv('GUEST_CART_MAX_AGE', 30 * 24 * 3600))
+
+DATABASES = {
+    "default": database_config(BASE_DIR),
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -105,6 +133,24 @@ USE_I18N = True
 USE_TZ = True
 
 STATIC_URL = "static/"
+STATIC_ROOT = Path(os.getenv('STATIC_ROOT', BASE_DIR / "staticfiles"))
+
+MEDIA_URL = "media/"
+MEDIA_ROOT = Path(os.getenv('MEDIA_ROOT', BASE_DIR / "media"))
+
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    # Hashed, precompressed names only outside DEBUG; until collectstatic
+    # has written the manifest the storage falls back to plain names.
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+        if DEBUG else "ecommerce_backend.storage.CompressedManifestStaticFilesStorage",
+    },
+}
+
+# Serve STATIC_ROOT and MEDIA_ROOT from Django itself, with caching,
+# precompression and range support, when no file server sits in front.
+SERVE_FILES = os.getenv('SERVE_FILES', '0') == '1'
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
@@ -115,6 +161,8 @@ CORS_ALLOWED_ORIGINS = [
 
 
 SWAGGER_SETTINGS = {
+    # The UI loads the cached document instead of regenerating it.
+    'SPEC_URL': 'schema-json',
     'SECURITY_DEFINITIONS': {
         'Bearer': {
             'type': 'apiKey',
@@ -123,4 +171,20 @@ SWAGGER_SETTINGS = {
             'description': "Enter 'Bearer <your_token>' to authenticate.",
         }
     }
-}
\ No newline at end of file
+}
+
+OPENAPI_SCHEMA_FILE = BASE_DIR.parent / "swagger.json"
+SWAGGER_UI_CACHE_TIMEOUT = int(os.getenv('SWAGGER_UI_CACHE_TIMEOUT', 3600))
+
+# Per-request timings in a Server-Timing header; they reveal internals, so
+# only enable them where the clients are trusted.
+SERVER_TIMING = os.getenv('SERVER_TIMING', '1' if DEBUG else '0') == '1'
+# When set, /metrics requires "Authorization: Bearer <METRICS_TOKEN>";
+# when unset, /metrics is only served with DEBUG on.
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+# N+1 and slow query detection for development and staging.
+QUERY_INSPECTOR = os.getenv('QUERY_INSPECTOR', '0') == '1'
+QUERY_INSPECTOR_REPEAT_THRESHOLD = int(os.getenv('QUERY_INSPECTOR_REPEAT_THRESHOLD', 5))
+QUERY_INSPECTOR_SLOW_MS = int(os.getenv('QUERY_INSPECTOR_SLOW_MS', 100))
+QUERY_INSPECTOR_STRICT = os.getenv('QUERY_INSPECTOR_STRICT', '0') == '1'
@@ -0,0 +1,27 @@
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    SQLite backend that switches every new connection to WAL mode, so
+    readers no longer block the single writer, and applies tuned pragmas.
+    Override them with a `pragmas` dict in the database OPTIONS. How long
+    a writer waits for the lock is the `timeout` option (DB_TIMEOUT).
+    """
+    default_pragmas = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -20000,
+        'temp_store': 'MEMORY',
+    }
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        self.pragmas = {**self.default_pragmas, **params.pop('pragmas', {})}
+        return params
+
+    def get_new_connection(self, conn_params):
+        connection = super().get_new_connection(conn_params)
+        for name, value in self.pragmas.items():
+            connection.execute(f'PRAGMA {name} = {value}')
+        return connection
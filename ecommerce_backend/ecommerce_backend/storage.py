@@ -0,0 +1,57 @@
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:  # Brotli variants are optional.
+    brotli = None
+
+# Formats that are already compressed gain nothing from another pass.
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.mjs', '.map', '.json', '.svg', '.html', '.txt', '.xml', '.ico', '.ttf', '.otf', '.eot')
+MIN_COMPRESS_SIZE = 256
+
+
+def compressed_variants(content):
+    """Yield (suffix, bytes) for each encoding that actually saves space."""
+    gzipped = gzip.compress(content, compresslevel=9, mtime=0)
+    if len(gzipped) < len(content):
+        yield '.gz', gzipped
+    if brotli is not None:
+        brotlied = brotli.compress(content, quality=11)
+        if len(brotlied) < len(content):
+            yield '.br', brotlied
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    Manifest storage that also writes `.gz` and (when the `brotli` package
+    is installed) `.br` siblings of every hashed file at collectstatic
+    time, so they can be served without compressing per request.
+
+    Until collectstatic has written a manifest (development, test runs
+    with DEBUG off) files keep their plain names instead of raising.
+    """
+
+    def stored_name(self, name):
+        if not self.hashed_files:
+            return name
+        return super().stored_name(name)
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+        for name in sorted(set(self.hashed_files.values())):
+            if not name.endswith(COMPRESSIBLE_EXTENSIONS):
+                continue
+            with self.open(name) as original:
+                content = original.read()
+            if len(content) < MIN_COMPRESS_SIZE:
+                continue
+            for suffix, compressed in compressed_variants(content):
+                if self.exists(name + suffix):
+                    self.delete(name + suffix)
+                self._save(name + suffix, ContentFile(compressed))
+                yield name + suffix, name + suffix, True
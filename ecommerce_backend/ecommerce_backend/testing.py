@@ -0,0 +1,54 @@
+from contextlib import contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+
+from .query_inspector import capture_queries
+
+
+@contextmanager
+def assert_max_queries(max_queries, using=DEFAULT_DB_ALIAS):
+    """
+    Fail if the wrapped block runs more than `max_queries` queries.
+
+        with assert_max_queries(3):
+            client.get('/products/')
+    """
+    with CaptureQueriesContext(connections[using]) as context:
+        yield context
+    executed = len(context.captured_queries)
+    if executed > max_queries:
+        statements = '\n'.join(
+            f'{index}. {query["sql"]}' for index, query in enumerate(context.captured_queries, start=1)
+        )
+        raise AssertionError(
+            f'{executed} queries executed, at most {max_queries} expected.\n'
+            f'Captured queries were:\n{statements}'
+        )
+
+
+@contextmanager
+def assert_no_repeated_queries(threshold=2):
+    """
+    Fail if the wrapped block runs any statement shape `threshold` or more
+    times, the signature of an N+1 query.
+
+        with assert_no_repeated_queries():
+            client.get('/cart/')
+    """
+    with capture_queries() as log:
+        yield log
+    repeated = log.repeated(threshold)
+    if repeated:
+        statements = '\n'.join(f'{count}x from {origin}: {shape}' for count, shape, origin in repeated)
+        raise AssertionError(f'Repeated queries executed:\n{statements}')
+
+
+class QueryBudgetMixin:
+    """TestCase mixin exposing the query assertions as assertion methods."""
+
+    def assertMaxQueries(self, max_queries, using=DEFAULT_DB_ALIAS):
+        return assert_max_queries(max_queries, using=using)
+
+    def assertNoRepeatedQueries(self, threshold=2):
+        return assert_no_repeated_queries(threshold)
@@ -0,0 +1,66 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.test import SimpleTestCase
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from users.authentication import UserCache, user_cache
+
+
+class CachedRevocationTests(APITestCase):
+    """A token revoked by a password change is refused even from the cache."""
+
+    def setUp(self):
+        # simplejwt rebinds api_settings on setting_changed, which modules
+        # that imported it never see, so patch the shared instance instead.
+        patcher = mock.patch.object(api_settings, 'CHECK_REVOKE_TOKEN', True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        user_cache.clear()
+        self.user = get_user_model().objects.create_user(username='shopper', password='password')
+
+    def get(self, token):
+        return self.client.get('/cart/current/', HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_cache_hit_checks_revocation(self):
+        old_token = AccessToken.for_user(self.user)
+        # A password change that sends no signal, as from another worker.
+        get_user_model().objects.filter(pk=self.user.pk).update(password=make_password('changed'))
+        self.user.refresh_from_db()
+        self.assertEqual(self.get(AccessToken.for_user(self.user)).status_code, 200)
+        self.assertEqual(user_cache.stats()['size'], 1)
+
+        response = self.get(old_token)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.data['code'], 'password_changed')
+
+
+class UserCacheTests(SimpleTestCase):
+
+    def test_stale_lookup_is_not_stored(self):
+        cache = UserCache(maxsize=10, ttl=60)
+        version = cache.version('1')
+        cache.invalidate('1')
+        cache.set('1', version, 'old row')
+        self.assertIsNone(cache.get('1', cache.version('1')))
+        cache.set('1', cache.version('1'), 'new row')
+        self.assertEqual(cache.get('1', cache.version('1')), 'new row')
+
+    def test_versions_are_bounded(self):
+        cache = UserCache(maxsize=10, ttl=60)
+        for user_id in range(100):
+            cache.invalidate(str(user_id))
+        self.assertEqual(len(cache._versions), 10)
+        self.assertEqual(cache.version('0'), 0)
+        self.assertGreater(cache.version('99'), 0)
+
+    def test_versions_expire(self):
+        cache = UserCache(maxsize=10, ttl=60)
+        with mock.patch('users.authentication.time.monotonic', return_value=1000.0):
+            cache.invalidate('1')
+        with mock.patch('users.authentication.time.monotonic', return_value=1061.0):
+            cache.invalidate('2')
+        self.assertEqual(list(cache._versions), ['2'])
@@ -0,0 +1,55 @@
+"""
+pytest-benchmark cases for the storefront flows, built from the same
+`ecommerce_backend.benchmarking` helpers as `manage.py benchmark_storefront`.
+Skipped unless pytest-benchmark is installed:
+
+    pytest ecommerce_backend/tests/test_benchmarks.py --benchmark-json=bench.json
+"""
+import itertools
+import os
+import random
+import unittest
+
+try:
+    import pytest_benchmark  # noqa: F401
+except ImportError:
+    raise unittest.SkipTest("pytest-benchmark is not installed.")
+
+import django
+import pytest
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ecommerce_backend.settings')
+django.setup()
+
+from django.core.cache import cache  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment  # noqa: E402
+
+from ecommerce_backend.benchmarking import STOREFRONT_FLOWS, seed_storefront, storefront_flow  # noqa: E402
+
+VOLUMES = {'users': 50, 'products': 500, 'carts': 80, 'items_per_cart': 5, 'orders': 10}
+ROUNDS = 30
+WARMUP_ROUNDS = 2
+
+
+@pytest.fixture(scope='module')
+def seeded():
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        # Register and login should measure the app, not PBKDF2.
+        with override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher']):
+            cache.clear()
+            yield seed_storefront(**VOLUMES)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+@pytest.mark.parametrize('flow', STOREFRONT_FLOWS)
+def test_storefront_flow(benchmark, seeded, flow):
+    request, errors = storefront_flow(flow, random.Random(0), seeded, ROUNDS + WARMUP_ROUNDS)
+    calls = itertools.count()
+    benchmark.extra_info['volumes'] = VOLUMES
+    benchmark.pedantic(lambda: request(next(calls)), rounds=ROUNDS, warmup_rounds=WARMUP_ROUNDS)
+    assert errors == []
@@ -0,0 +1,67 @@
+import threading
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase, TransactionTestCase
+
+from cart.current import get_current_cart
+from cart.models import Cart
+
+
+class CurrentCartTests(TestCase):
+    """A user has at most one open cart, which get_current_cart claims."""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username='shopper', password='password')
+
+    def test_second_open_cart_is_rejected(self):
+        Cart.objects.create(user=self.user, status='Cart')
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Cart.objects.create(user=self.user, status='Cart')
+
+    def test_paid_and_guest_carts_are_not_limited(self):
+        Cart.objects.create(user=self.user, status='Cart')
+        Cart.objects.create(user=self.user, status='Paid')
+        Cart.objects.create(user=self.user, status='Paid')
+        Cart.objects.create(user=None, status='Cart')
+        Cart.objects.create(user=None, status='Cart')
+        self.assertEqual(Cart.objects.filter(user=self.user).count(), 3)
+
+    def test_claims_existing_cart(self):
+        cart = Cart.objects.create(user=self.user, status='Cart')
+        self.assertEqual(get_current_cart(self.user).pk, cart.pk)
+        self.assertEqual(get_current_cart(self.user).pk, cart.pk)
+
+    def test_creates_cart_once(self):
+        first = get_current_cart(self.user)
+        self.assertEqual(get_current_cart(self.user).pk, first.pk)
+        self.assertEqual(Cart.objects.filter(user=self.user, status='Cart').count(), 1)
+
+
+class CurrentCartRaceTests(TransactionTestCase):
+    """Concurrent first requests all end up with the same open cart."""
+
+    def test_concurrent_claims(self):
+        user = get_user_model().objects.create_user(username='shopper', password='password')
+        threads = 8
+        barrier = threading.Barrier(threads)
+        carts, errors = [], []
+
+        def claim():
+            try:
+                barrier.wait()
+                carts.append(get_current_cart(user).pk)
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connection.close()
+
+        workers = [threading.Thread(target=claim) for _ in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(set(carts)), 1)
+        self.assertEqual(list(Cart.objects.filter(user=user, status='Cart').values_list('pk', flat=True)), carts[:1])
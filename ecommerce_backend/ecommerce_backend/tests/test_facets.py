@@ -0,0 +1,60 @@
+from decimal import Decimal
+
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+
+from products.models import Product
+
+
+class ProductFacetTests(APITestCase):
+    """Each facet is counted with every filter except its own."""
+
+    def setUp(self):
+        cache.clear()
+        for name, brand, type, price in [
+            ('Desk lamp', 'Acme', 'Lighting', '10.00'),
+            ('Floor lamp', 'Acme', 'Lighting', '40.00'),
+            ('Kettle', 'Acme', 'Kitchen', '25.00'),
+            ('Pendant', 'Globex', 'Lighting', '60.00'),
+            ('Toaster', 'Initech', 'Kitchen', '30.00'),
+        ]:
+            Product.objects.create(name=name, description='', brand=brand, type=type, price=price)
+
+    def facets(self, **params):
+        response = self.client.get('/products/facets/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def counts(self, facet):
+        return {row['value']: row['count'] for row in facet}
+
+    def test_unfiltered(self):
+        data = self.facets()
+        self.assertEqual(data['count'], 5)
+        self.assertEqual(self.counts(data['brand']), {'Acme': 3, 'Globex': 1, 'Initech': 1})
+        self.assertEqual(self.counts(data['type']), {'Lighting': 3, 'Kitchen': 2})
+
+    def test_selected_brand_keeps_other_brands(self):
+        data = self.facets(brand='Acme')
+        self.assertEqual(data['count'], 3)
+        self.assertEqual(self.counts(data['brand']), {'Acme': 3, 'Globex': 1, 'Initech': 1})
+        self.assertEqual(self.counts(data['type']), {'Lighting': 2, 'Kitchen': 1})
+        self.assertEqual(data['price']['min'], Decimal('10.00'))
+        self.assertEqual(data['price']['max'], Decimal('40.00'))
+
+    def test_brand_and_type(self):
+        data = self.facets(brand='Acme', type='Lighting')
+        self.assertEqual(data['count'], 2)
+        self.assertEqual(self.counts(data['brand']), {'Acme': 2, 'Globex': 1})
+        self.assertEqual(self.counts(data['type']), {'Lighting': 2, 'Kitchen': 1})
+
+    def test_price_range_ignores_price_filter(self):
+        data = self.facets(type='Lighting', min_price='20')
+        self.assertEqual(data['count'], 2)
+        self.assertEqual(self.counts(data['brand']), {'Acme': 1, 'Globex': 1})
+        self.assertEqual(self.counts(data['type']), {'Lighting': 2, 'Kitchen': 2})
+        self.assertEqual(data['price']['min'], Decimal('10.00'))
+        self.assertEqual(data['price']['max'], Decimal('60.00'))
+
+    def test_invalid_price(self):
+        self.assertEqual(self.client.get('/products/facets/', {'min_price': 'cheap'}).status_code, 400)
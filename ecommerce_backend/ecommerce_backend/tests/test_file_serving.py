@@ -0,0 +1,50 @@
+import tempfile
+from pathlib import Path
+
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+
+from ecommerce_backend.file_serving import accepted_encodings, serve_file
+
+MANIFEST_STORAGE = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'ecommerce_backend.storage.CompressedManifestStaticFilesStorage'},
+}
+
+
+class UncollectedStaticTests(TestCase):
+    """Pages using {% static %} render before collectstatic has run."""
+
+    def test_swagger_without_manifest(self):
+        with tempfile.TemporaryDirectory() as root:
+            with override_settings(DEBUG=False, STATIC_ROOT=root, STORAGES=MANIFEST_STORAGE):
+                response = self.client.get('/swagger/')
+        self.assertEqual(response.status_code, 200)
+
+
+class PrecompressedTests(SimpleTestCase):
+
+    def setUp(self):
+        self.root = tempfile.TemporaryDirectory()
+        self.addCleanup(self.root.cleanup)
+        for name in ('app.js', 'app.js.br', 'app.js.gz'):
+            Path(self.root.name, name).write_text(name)
+
+    def encoding(self, header):
+        request = RequestFactory().get('/static/app.js', HTTP_ACCEPT_ENCODING=header)
+        response = serve_file(request, 'app.js', self.root.name, precompressed=True)
+        return response.get('Content-Encoding')
+
+    def test_prefers_brotli(self):
+        self.assertEqual(self.encoding('gzip, deflate, br'), 'br')
+
+    def test_refused_encodings_are_skipped(self):
+        self.assertEqual(self.encoding('br;q=0, gzip'), 'gzip')
+        self.assertIsNone(self.encoding('br;q=0, gzip;q=0'))
+        self.assertIsNone(self.encoding('identity'))
+
+    def test_highest_quality_wins(self):
+        self.assertEqual(self.encoding('br;q=0.5, gzip;q=0.8'), 'gzip')
+        self.assertEqual(self.encoding('*;q=0.1, gzip;q=0'), 'br')
+
+    def test_parse(self):
+        self.assertEqual(accepted_encodings('GZip;q=0.5, br'), {'gzip': 0.5, 'br': 1.0})
@@ -0,0 +1,127 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from cart.guest import SALT, guest_cart_id, issue_guest_token
+from cart.models import Cart, CartItem
+from products.models import Inventory, Product
+
+
+class GuestTokenTests(TestCase):
+
+    def setUp(self):
+        self.cart = Cart.objects.create(user=None)
+
+    def test_round_trip(self):
+        self.assertEqual(guest_cart_id(issue_guest_token(self.cart)), str(self.cart.pk))
+
+    def test_forged_tokens(self):
+        token = issue_guest_token(self.cart)
+        for forged in (
+            token[:-1] + ('A' if token[-1] != 'A' else 'B'),
+            signing.dumps(str(self.cart.pk), salt='another-salt'),
+            signing.dumps(str(self.cart.pk), salt=SALT, key='not-the-secret-key'),
+            '',
+        ):
+            with self.subTest(token=forged):
+                self.assertIsNone(guest_cart_id(forged))
+
+    def test_expired_token(self):
+        token = issue_guest_token(self.cart)
+        with self.settings(GUEST_CART_MAX_AGE=60), mock.patch('django.core.signing.time.time', return_value=2e10):
+            self.assertIsNone(guest_cart_id(token))
+
+    def test_endpoint_rejects_forged_token(self):
+        cache.clear()
+        response = self.client.get('/cart/guest/', HTTP_X_CART_TOKEN='forged')
+        self.assertEqual(response.status_code, 403)
+
+
+class MergeGuestCartTests(APITestCase):
+    """Logging in with a guest token merges the guest cart and holds its stock."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(username='shopper', password='password')
+        self.lamp = Product.objects.create(name='Lamp', description='', price='10.00')
+        self.rug = Product.objects.create(name='Rug', description='', price='20.00')
+        Inventory.objects.create(product=self.lamp, available=4, reserved=1)
+        Inventory.objects.create(product=self.rug, available=5)
+
+        self.cart = Cart.objects.create(user=self.user)
+        self.line = CartItem.objects.create(cart=self.cart, product=self.lamp, quantity=1, reserved_quantity=1)
+        self.guest = Cart.objects.create(user=None)
+        CartItem.objects.create(cart=self.guest, product=self.lamp, quantity=2)
+        CartItem.objects.create(cart=self.guest, product=self.rug, quantity=3)
+
+    def login(self):
+        return self.client.post('/users/login/', {
+            'username': 'shopper', 'password': 'password', 'guest_cart_token': issue_guest_token(self.guest),
+        }, format='json')
+
+    def stock(self, product):
+        inventory = Inventory.objects.get(product=product)
+        return inventory.available, inventory.reserved
+
+    def test_merge_holds_stock(self):
+        response = self.login()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['cart'], self.cart.pk)
+        self.assertFalse(Cart.objects.filter(pk=self.guest.pk).exists())
+
+        lines = {item.product_id: item for item in CartItem.objects.filter(cart=self.cart)}
+        self.assertEqual(lines[self.lamp.pk].pk, self.line.pk)
+        self.assertEqual((lines[self.lamp.pk].quantity, lines[self.lamp.pk].reserved_quantity), (3, 3))
+        self.assertEqual((lines[self.rug.pk].quantity, lines[self.rug.pk].reserved_quantity), (3, 3))
+        self.assertIsNotNone(lines[self.rug.pk].reserved_until)
+        self.assertEqual(self.stock(self.lamp), (2, 3))
+        self.assertEqual(self.stock(self.rug), (2, 3))
+
+    def test_shortage_merges_nothing(self):
+        Inventory.objects.filter(product=self.rug).update(available=2)
+        response = self.login()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('access', response.data)
+        self.assertNotIn('cart', response.data)
+        self.assertIn(str(self.rug.pk), str(response.data['cart_errors']))
+
+        self.assertTrue(Cart.objects.filter(pk=self.guest.pk).exists())
+        self.assertEqual(list(CartItem.objects.filter(cart=self.cart).values_list('quantity', 'reserved_quantity')), [(1, 1)])
+        self.assertEqual(self.stock(self.lamp), (4, 1))
+        self.assertEqual(self.stock(self.rug), (2, 0))
+
+    def test_merged_guest_token_is_spent(self):
+        token = issue_guest_token(self.guest)
+        self.login()
+        response = self.client.get('/cart/guest/', HTTP_X_CART_TOKEN=token)
+        self.assertEqual(response.status_code, 404)
+
+
+class PurgeGuestCartsTests(TestCase):
+
+    def test_purge(self):
+        product = Product.objects.create(name='Lamp', description='', price='10.00')
+        Inventory.objects.create(product=product, available=8, reserved=2)
+        user = get_user_model().objects.create_user(username='shopper', password='password')
+        old = timezone.now() - timedelta(days=60)
+
+        expired = Cart.objects.create(user=None, created_at=old)
+        CartItem.objects.create(cart=expired, product=product, quantity=2, reserved_quantity=2)
+        recent = Cart.objects.create(user=None)
+        owned = Cart.objects.create(user=user, created_at=old)
+
+        out = StringIO()
+        call_command('purge_guest_carts', '--seconds', str(30 * 24 * 3600), stdout=out)
+        self.assertIn('Deleted', out.getvalue())
+        self.assertEqual(set(Cart.objects.values_list('pk', flat=True)), {recent.pk, owned.pk})
+        # A hold left from before guest carts stopped reserving is given back.
+        inventory = Inventory.objects.get(product=product)
+        self.assertEqual((inventory.available, inventory.reserved), (10, 0))
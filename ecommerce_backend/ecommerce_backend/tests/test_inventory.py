@@ -0,0 +1,23 @@
+import json
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TransactionTestCase
+
+
+class OversellTests(TransactionTestCase):
+    """
+    Many threads race for one SKU through the cart reservation path; the
+    stock must end up exactly sold out, never below zero. Runs against a
+    real database file, since each thread needs its own connection.
+    """
+
+    def test_concurrent_adds_never_oversell(self):
+        stdout = StringIO()
+        # 8 threads want 80 units of 30; stress_inventory raises CommandError if any unit is sold twice.
+        call_command('stress_inventory', threads=8, attempts=10, stock=30, json=True, stdout=stdout)
+        results = json.loads(stdout.getvalue())
+        self.assertEqual(results['errors'], 0)
+        self.assertEqual(results['reserved_items'], 30)
+        self.assertEqual(results['rejected'], 50)
+        self.assertEqual((results['available'], results['reserved'], results['held_by_items']), (0, 30, 30))
@@ -0,0 +1,52 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+from rest_framework import serializers
+
+from ecommerce_backend.metrics import RequestStats, current_stats
+
+
+class MetricsAccessTests(SimpleTestCase):
+    """/metrics is never open to anyone outside development."""
+
+    @override_settings(DEBUG=False, METRICS_TOKEN='')
+    def test_disabled_without_token(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 404)
+
+    @override_settings(DEBUG=True, METRICS_TOKEN='')
+    def test_open_in_debug(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 200)
+
+    @override_settings(DEBUG=False, METRICS_TOKEN='s3cret')
+    def test_token_required(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+        self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer wrong').status_code, 403)
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer s3cret')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'http_responses_total', response.content)
+
+
+class SerializerTimingTests(SimpleTestCase):
+    """Serializer `.data` is timed apart from rendering, once per outermost call."""
+
+    class ItemSerializer(serializers.Serializer):
+        name = serializers.CharField()
+
+    def test_outermost_call_is_timed(self):
+        stats = RequestStats()
+        token = current_stats.set(stats)
+        self.addCleanup(current_stats.reset, token)
+        clock = iter([1.0, 1.25])
+        with mock.patch('ecommerce_backend.metrics.time.perf_counter', lambda: next(clock)):
+            data = self.ItemSerializer([{'name': 'Lamp'}, {'name': 'Rug'}], many=True).data
+        self.assertEqual(data, [{'name': 'Lamp'}, {'name': 'Rug'}])
+        self.assertEqual(stats.serialize_time, 0.25)
+        self.assertFalse(stats.serializing)
+
+    def test_untimed_outside_requests(self):
+        self.assertEqual(self.ItemSerializer({'name': 'Lamp'}).data, {'name': 'Lamp'})
+
+    @override_settings(SERVER_TIMING=True, DEBUG=True)
+    def test_server_timing(self):
+        response = self.client.get('/metrics')
+        self.assertIn('serialize;dur=', response['Server-Timing'])
@@ -0,0 +1,106 @@
+from datetime import datetime
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+
+class MigrationTestCase(TransactionTestCase):
+    """
+    Roll the schema back to `migrate_from`, let the test add rows through
+    the historical models in `self.apps`, then `migrate()` to `migrate_to`.
+    """
+    migrate_from = []
+    migrate_to = []
+
+    def setUp(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.migrate_from)
+        self.apps = executor.loader.project_state(self.migrate_from).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def migrate(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.migrate_to)
+        return executor.loader.project_state(self.migrate_to).apps
+
+    def make_user(self, username):
+        return self.apps.get_model(settings.AUTH_USER_MODEL).objects.create(username=username)
+
+
+class OrderLinesBackfillTests(MigrationTestCase):
+    migrate_from = [('orders', '0014_order_cart_status_indexes'), ('cart', '0006_cartitem_product_fk')]
+    migrate_to = [('orders', '0015_order_lines')]
+
+    def test_backfill(self):
+        Product = self.apps.get_model('products', 'Product')
+        Cart = self.apps.get_model('cart', 'Cart')
+        CartItem = self.apps.get_model('cart', 'CartItem')
+        Order = self.apps.get_model('orders', 'Order')
+
+        user = self.make_user('shopper')
+        lamp = Product.objects.create(name='Lamp', description='', price='9.99')
+        rug = Product.objects.create(name='Rug', description='', price='20.00')
+        cart = Cart.objects.create(user=user, status='Paid')
+        CartItem.objects.create(cart=cart, product=lamp, quantity=3)
+        CartItem.objects.create(cart=cart, product=rug, quantity=1)
+        old = Order.objects.create(cart=cart)
+        checked_out = Order.objects.create(cart=cart, total_price='12.00')
+
+        apps = self.migrate()
+        Order = apps.get_model('orders', 'Order')
+        old = Order.objects.get(pk=old.pk)
+        self.assertEqual(old.user_id, user.pk)
+        self.assertEqual(old.item_count, 4)
+        self.assertEqual(old.total_price, Decimal('49.97'))
+        self.assertEqual(
+            sorted(old.lines.values_list('product_name', 'subtotal')),
+            [('Lamp', Decimal('29.97')), ('Rug', Decimal('20.00'))],
+        )
+        # A total recorded at checkout is kept.
+        self.assertEqual(Order.objects.get(pk=checked_out.pk).total_price, Decimal('12.00'))
+
+
+class OneOpenCartMigrationTests(MigrationTestCase):
+    migrate_from = [('cart', '0006_cartitem_product_fk'), ('orders', '0015_order_lines')]
+    migrate_to = [('cart', '0008_cartitem_one_line_per_product')]
+
+    def test_open_carts_are_merged(self):
+        Product = self.apps.get_model('products', 'Product')
+        Cart = self.apps.get_model('cart', 'Cart')
+        CartItem = self.apps.get_model('cart', 'CartItem')
+        Order = self.apps.get_model('orders', 'Order')
+
+        shopper, other = self.make_user('shopper'), self.make_user('other')
+        lamp = Product.objects.create(name='Lamp', description='', price='9.99')
+        rug = Product.objects.create(name='Rug', description='', price='20.00')
+
+        older = Cart.objects.create(user=shopper, status='Pending', created_at=datetime(2024, 1, 1))
+        CartItem.objects.create(cart=older, product=lamp, quantity=1, reserved_quantity=1)
+        CartItem.objects.create(cart=older, product=rug, quantity=2)
+        newest = Cart.objects.create(user=shopper, status='Cart', created_at=datetime(2024, 3, 1))
+        # Two lines for one product in the same cart, folded by 0008.
+        CartItem.objects.create(cart=newest, product=lamp, quantity=2, reserved_quantity=2)
+        CartItem.objects.create(cart=newest, product=lamp, quantity=1)
+        ordered = Cart.objects.create(user=shopper, status='Cart', created_at=datetime(2024, 2, 1))
+        Order.objects.create(cart=ordered, user=shopper)
+        pending = Cart.objects.create(user=other, status='Pending')
+
+        apps = self.migrate()
+        Cart = apps.get_model('cart', 'Cart')
+        CartItem = apps.get_model('cart', 'CartItem')
+
+        self.assertEqual(
+            set(Cart.objects.filter(user_id=shopper.pk).values_list('pk', 'status')),
+            {(newest.pk, 'Cart'), (ordered.pk, 'Paid')},
+        )
+        self.assertEqual(Cart.objects.get(pk=pending.pk).status, 'Cart')
+        self.assertEqual(
+            sorted(CartItem.objects.filter(cart_id=newest.pk).values_list('product__name', 'quantity', 'reserved_quantity')),
+            [('Lamp', 4, 3), ('Rug', 2, 0)],
+        )
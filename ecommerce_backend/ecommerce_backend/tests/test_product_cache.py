@@ -0,0 +1,30 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from products.models import Product
+
+
+@override_settings(ALLOWED_HOSTS=['shop.example', 'admin.example'])
+class CachedProductURLTests(APITestCase):
+    """Cached product bodies never hand one host's URLs to another."""
+
+    def setUp(self):
+        cache.clear()
+        user = get_user_model().objects.create_user(username='seller', password='password')
+        self.product = Product.objects.create(
+            name='Lamp', description='', price='9.00', user=user, image='products/lamp.jpg',
+        )
+
+    def image(self, url, host):
+        response = self.client.get(url, HTTP_HOST=host)
+        self.assertEqual(response.status_code, 200)
+        return response.json()['image']
+
+    def test_detail_per_host(self):
+        for url in (f'/products/{self.product.pk}/', f'/products/async/{self.product.pk}/'):
+            with self.subTest(url=url):
+                self.assertTrue(self.image(url, 'shop.example').startswith('http://shop.example/'))
+                self.assertTrue(self.image(url, 'admin.example').startswith('http://admin.example/'))
+
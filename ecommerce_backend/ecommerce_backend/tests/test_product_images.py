@@ -0,0 +1,73 @@
+import io
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from PIL import Image
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from products.images import render
+from products.models import Product
+
+RENDITIONS = {
+    'source': 'product_images/lamp.jpg',
+    'format': 'image/webp',
+    'sizes': [{'width': 160, 'height': 120, 'name': 'product_images/renditions/abc-160w.webp'}],
+}
+
+
+class StaleRenditionTests(APITestCase):
+    """Renditions are only served for the image they were made from."""
+
+    def setUp(self):
+        cache.clear()
+        user = get_user_model().objects.create_user(username='seller', password='password')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+        self.product = Product.objects.create(
+            name='Lamp', description='', price='9.00', user=user, image='product_images/lamp.jpg',
+        )
+        Product.objects.filter(pk=self.product.pk).update(renditions=RENDITIONS)
+
+    def images(self):
+        cache.clear()
+        detail = self.client.get(f'/products/{self.product.pk}/').json()['images']
+        listing = self.client.get('/products/listing/').json()['results'][0]['images']
+        search = self.client.get('/products/search/?q=lamp').json()['results'][0]['images']
+        self.assertEqual(detail, listing)
+        self.assertEqual(detail, search)
+        return detail
+
+    def test_current_image(self):
+        self.assertTrue(self.images()['src'].endswith('abc-160w.webp'))
+
+    def test_replaced_image(self):
+        Product.objects.filter(pk=self.product.pk).update(image='product_images/desk.jpg')
+        self.assertIsNone(self.images())
+
+    def test_cleared_image(self):
+        Product.objects.filter(pk=self.product.pk).update(image=None)
+        self.assertIsNone(self.images())
+
+
+class RenderTests(SimpleTestCase):
+    """Renditions keep the transparency of their source image."""
+
+    def rendered_mode(self, image):
+        source = io.BytesIO()
+        image.save(source, 'PNG')
+        source.seek(0)
+        (_, _, content), = render(source, widths=(8,))
+        with Image.open(io.BytesIO(content)) as rendition:
+            return rendition.mode
+
+    def test_alpha_modes(self):
+        palette = Image.new('RGBA', (8, 8), (255, 0, 0, 128)).quantize()
+        for image in (Image.new('LA', (8, 8), (10, 128)), Image.new('RGBA', (8, 8), (1, 2, 3, 4)), palette):
+            with self.subTest(mode=image.mode):
+                self.assertEqual(self.rendered_mode(image), 'RGBA')
+
+    def test_opaque_modes(self):
+        for image in (Image.new('L', (8, 8), 10), Image.new('P', (8, 8), 3)):
+            with self.subTest(mode=image.mode):
+                self.assertEqual(self.rendered_mode(image), 'RGB')
@@ -0,0 +1,59 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from cart.checkout import checkout_cart
+from cart.models import Cart, CartItem
+from ecommerce_backend.testing import QueryBudgetMixin
+from products.models import Product
+from users.authentication import user_cache
+
+ROWS = 10
+
+
+class EndpointQueryCountTests(QueryBudgetMixin, APITestCase):
+    """
+    Page sizes must not change how many queries these endpoints run. Each
+    budget includes the one query that loads the user on an auth cache miss.
+    """
+
+    def setUp(self):
+        cache.clear()
+        user_cache.clear()
+        self.user = get_user_model().objects.create_user(username='shopper', password='password')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+        products = [
+            Product.objects.create(name=f'Product {n}', description='', price='1.00', user=self.user)
+            for n in range(ROWS)
+        ]
+        for product in products:
+            cart = Cart.objects.create(user=self.user)
+            CartItem.objects.create(cart=cart, product=product, quantity=2)
+            with transaction.atomic():
+                checkout_cart(cart.pk, self.user)
+        cart = Cart.objects.create(user=self.user)
+        CartItem.objects.bulk_create(CartItem(cart=cart, product=product, quantity=1) for product in products)
+
+    def assertQueryBudget(self, url, max_queries):
+        with self.assertNoRepeatedQueries(), self.assertMaxQueries(max_queries):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_product_list(self):
+        response = self.assertQueryBudget('/products/', 2)
+        self.assertEqual(len(response.data['results']), ROWS)
+
+    def test_user_products(self):
+        response = self.assertQueryBudget('/products/user-products/', 2)
+        self.assertEqual(len(response.data['results']), ROWS)
+
+    def test_cart_list(self):
+        response = self.assertQueryBudget('/cart/', 4)
+        self.assertEqual(len(response.data['results']), ROWS + 1)
+
+    def test_order_list(self):
+        response = self.assertQueryBudget('/orders/', 2)
+        self.assertEqual(len(response.data['results']), ROWS)
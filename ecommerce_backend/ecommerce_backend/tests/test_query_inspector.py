@@ -0,0 +1,92 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import resolve
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from cart.models import Cart, CartItem
+from ecommerce_backend.query_inspector import QueryBudgetExceeded, QueryInspectorMiddleware
+from products.models import Product
+from products.views import ProductListingViewSet
+from users.authentication import user_cache
+
+STRICT = {'QUERY_INSPECTOR': True, 'QUERY_INSPECTOR_STRICT': True}
+
+
+@override_settings(**STRICT)
+class DeclaredBudgetTests(APITestCase):
+    """The hot endpoints stay within the budgets they declare."""
+
+    def setUp(self):
+        cache.clear()
+        user_cache.clear()
+        self.user = get_user_model().objects.create_user(username='shopper', password='password')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+        self.products = [
+            Product.objects.create(name=f'Product {n}', description='', price='1.00', user=self.user)
+            for n in range(5)
+        ]
+        self.cart = Cart.objects.create(user=self.user)
+        CartItem.objects.bulk_create(CartItem(cart=self.cart, product=product, quantity=1) for product in self.products[:4])
+
+    def get(self, url):
+        user_cache.clear()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, url)
+
+    def test_reads(self):
+        for url in [
+            '/products/', f'/products/{self.products[0].pk}/', '/products/listing/', '/products/user-products/',
+            '/cart/', f'/cart/{self.cart.pk}/', '/cart/current/', '/cart/items/', '/orders/',
+        ]:
+            self.get(url)
+
+    def test_cart_item_writes(self):
+        user_cache.clear()
+        response = self.client.post(
+            '/cart/items/', {'cart': self.cart.pk, 'product_id': self.products[4].pk, 'quantity': 1}, format='json',
+        )
+        self.assertEqual(response.status_code, 201)
+        user_cache.clear()
+        response = self.client.put(
+            f"/cart/items/{response.data['id']}/",
+            {'cart': self.cart.pk, 'product_id': self.products[4].pk, 'quantity': 3},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_overrun_is_flagged(self):
+        cache.clear()
+        with mock.patch.object(ProductListingViewSet, 'query_budget', {'list': 0}):
+            with self.assertLogs('ecommerce_backend.query_inspector', 'WARNING') as logs:
+                with self.assertRaisesMessage(QueryBudgetExceeded, 'budget 0'):
+                    self.client.get('/products/listing/')
+        self.assertIn('over its budget of 0', logs.output[-1])
+
+
+class RepeatedQueryTests(TestCase):
+    def inspect(self, runs):
+        request = RequestFactory().get('/products/listing/')
+        request.resolver_match = resolve('/products/listing/')
+
+        def get_response(request):
+            for _ in range(runs):
+                Product.objects.count()
+
+        QueryInspectorMiddleware(get_response)(request)
+
+    @override_settings(QUERY_INSPECTOR_REPEAT_THRESHOLD=3, **STRICT)
+    def test_repeated_query_is_flagged(self):
+        self.inspect(runs=2)
+        with self.assertLogs('ecommerce_backend.query_inspector', 'WARNING'):
+            with self.assertRaisesMessage(QueryBudgetExceeded, '3x SELECT COUNT(*)'):
+                self.inspect(runs=3)
+
+    @override_settings(QUERY_INSPECTOR=True, QUERY_INSPECTOR_REPEAT_THRESHOLD=3)
+    def test_repeated_query_is_logged(self):
+        with self.assertLogs('ecommerce_backend.query_inspector', 'WARNING') as logs:
+            self.inspect(runs=3)
+        self.assertIn('Query repeated 3 times', logs.output[0])
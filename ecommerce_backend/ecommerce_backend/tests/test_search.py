@@ -0,0 +1,104 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APITestCase
+
+from products import search
+from products.models import Product
+from products.search import FTS5SearchBackend, InvertedIndexSearchBackend
+
+
+class SearchBackendTests:
+    """Behaviour both backends share; subclasses say how to get one."""
+
+    def setUp(self):
+        self.backend = self.make_backend()
+        self.lamp = self.add(name='Desk lamp', description='Warm light for reading.', brand='Acme')
+        self.shade = self.add(name='Shade', description='Fits any lamp base.', brand='Globex')
+        self.kettle = self.add(name='Kettle', description='Boils water.', brand='Acme')
+
+    def add(self, **fields):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Product.objects.create(price='10.00', **fields)
+
+    def ids(self, query, limit=10):
+        return [pk for pk, _ in self.backend.search(query, limit)]
+
+    def test_name_outranks_description(self):
+        self.assertEqual(self.ids('lamp'), [self.lamp.pk, self.shade.pk])
+
+    def test_all_terms_must_match(self):
+        self.assertEqual(self.ids('acme lamp'), [self.lamp.pk])
+
+    def test_last_term_is_a_prefix(self):
+        self.assertEqual(self.ids('ket'), [self.kettle.pk])
+        self.assertEqual(self.ids('ket water'), [])
+
+    def test_limit(self):
+        self.assertEqual(self.ids('lamp', limit=1), [self.lamp.pk])
+
+    def test_empty_and_unknown_queries(self):
+        self.assertEqual(self.ids(''), [])
+        self.assertEqual(self.ids('  !?  '), [])
+        self.assertEqual(self.ids('submarine'), [])
+
+    def test_save_updates_index(self):
+        self.ids('lamp')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.kettle.name = 'Lamp kettle'
+            self.kettle.save()
+        self.assertCountEqual(self.ids('lamp'), [self.lamp.pk, self.shade.pk, self.kettle.pk])
+        self.assertEqual(self.ids('boils'), [self.kettle.pk])
+
+    def test_delete_updates_index(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.lamp.delete()
+        self.assertEqual(self.ids('lamp'), [self.shade.pk])
+
+
+class FTS5SearchTests(SearchBackendTests, TestCase):
+
+    def make_backend(self):
+        if not FTS5SearchBackend.is_available():
+            self.skipTest('SQLite was built without FTS5.')
+        return FTS5SearchBackend()
+
+
+class InvertedIndexSearchTests(SearchBackendTests, TestCase):
+
+    def make_backend(self):
+        backend = InvertedIndexSearchBackend()
+        # The product signals update whichever backend is active.
+        patcher = mock.patch.object(search, '_backend', backend)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return backend
+
+
+class ProductSearchViewTests(APITestCase):
+
+    def setUp(self):
+        user = get_user_model().objects.create_user(username='seller', password='password')
+        self.lamp = Product.objects.create(
+            name='Desk lamp', description='', price='10.00', user=user, image='product_images/lamp.jpg',
+        )
+
+    def test_results(self):
+        response = self.client.get('/products/search/', {'q': 'lamp'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['query'], 'lamp')
+        result, = response.data['results']
+        self.assertEqual(result['id'], str(self.lamp.pk))
+        self.assertGreater(result['score'], 0)
+        self.assertEqual(result['image'], 'http://testserver/media/product_images/lamp.jpg')
+
+    def test_unknown_query(self):
+        response = self.client.get('/products/search/', {'q': 'submarine'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'], [])
+
+    def test_missing_query(self):
+        for params in ({}, {'q': '   '}):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get('/products/search/', params).status_code, 400)
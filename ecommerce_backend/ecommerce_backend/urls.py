@@ -1,20 +1,14 @@
 # filepath: ecommerce_backend/urls.py
+from django.conf import settings
 from django.urls import include, path, re_path
-from drf_yasg import openapi
 from drf_yasg.views import get_schema_view
 from rest_framework import permissions
 
+from .metrics import metrics_view
+from .schema import API_INFO, schema_document
+
 schema_view = get_schema_view(
-   openapi.Info(
-      title="eCommerce Backend API",
-      default_version='v1',
-      description="AUTHENTICATION INSTRUCTIONS: \n" \
-      "To authenticate the swagger UI playground: \n\n" \
-      "    1. use the /login and/or /register endpoint to obtain the access token\n" \
-      "    2. copy the access key\n" \
-      "    3. navigate to the swagger ui 'Authenticate' button and type, 'Bearer <paste access token here>'.\n\n" \
-      "After, all other requests requiring authentication can be made."
-   ),
+   API_INFO,
    public=True,
    permission_classes=(permissions.AllowAny,),
 )
@@ -25,6 +19,17 @@ urlpatterns = [
    path('orders/', include('orders.urls')),
    path('cart/', include('cart.urls')),
 
-   path('swagger/', schema_view.with_ui('swagger', cache_timeout=0)),
-   re_path(r"^swagger(?P<format>\.json|\.yaml)$", schema_view.without_ui(cache_timeout=0), name="schema-json"),
-]
\ No newline at end of file
+   path('metrics', metrics_view, name='metrics'),
+
+   path('swagger/', schema_view.with_ui('swagger', cache_timeout=settings.SWAGGER_UI_CACHE_TIMEOUT)),
+   path('swagger.json', schema_document, {'format': 'json'}, name='schema-json'),
+   path('swagger.yaml', schema_document, {'format': 'yaml'}, name='schema-yaml'),
+]
+
+if settings.SERVE_FILES:
+   from .file_serving import serve_media, serve_static
+
+   urlpatterns += [
+      re_path(r'^%s(?P<path>.*)$' % settings.STATIC_URL.lstrip('/'), serve_static, {'document_root': settings.STATIC_ROOT}),
+      re_path(r'^%s(?P<path>.*)$' % settings.MEDIA_URL.lstrip('/'), serve_media, {'document_root': settings.MEDIA_ROOT}),
+   ]
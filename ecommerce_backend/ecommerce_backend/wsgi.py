@@ -5,3 +5,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "ecommerce_backend.settings")
 
 application = get_wsgi_application()
+
+# Build the OpenAPI document now rather than on the first request.
+from ecommerce_backend.schema import schema_cache  # noqa: E402
+
+schema_cache.warm()
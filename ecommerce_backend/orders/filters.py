@@ -0,0 +1,67 @@
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from .models import Order
+
+
+class OrderFilterBackend(BaseFilterBackend):
+    """
+    Filter orders by `status` (repeatable) and by a `created_after` /
+    `created_before` range given as ISO dates or datetimes.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+        statuses = [value for value in params.getlist('status') if value != '']
+        valid_statuses = {choice for choice, _ in Order.STATUS_CHOICES}
+        invalid = [value for value in statuses if value not in valid_statuses]
+        if invalid:
+            raise ValidationError({'status': f"Unknown status: {', '.join(invalid)}."})
+        if statuses:
+            queryset = queryset.filter(status__in=statuses)
+
+        # Bounds stay on the bare column so the created_at indexes serve the range.
+        for name, lookup in (('created_after', 'gte'), ('created_before', 'lte')):
+            bound = self._get_bound(params, name, lookup)
+            if bound is not None:
+                queryset = queryset.filter(**{f'created_at__{bound[1]}': bound[0]})
+        return queryset
+
+    def _get_bound(self, params, name, lookup):
+        """
+        Return (value, lookup). A plain date covers the whole day in the
+        current time zone, so an upper bound becomes `lt` the next midnight.
+        """
+        value = params.get(name)
+        if value in (None, ''):
+            return None
+        try:
+            # parse_datetime would also accept a bare date, as midnight.
+            day = parse_date(value)
+            if day is None:
+                parsed = parse_datetime(value)
+                if parsed is not None:
+                    return parsed, lookup
+        except ValueError:
+            day = None
+        if day is None:
+            raise ValidationError({name: 'Use an ISO 8601 date or datetime.'})
+        if lookup == 'lte':
+            return self._midnight(day + timedelta(days=1)), 'lt'
+        return self._midnight(day), lookup
+
+    def _midnight(self, day):
+        start = datetime.combine(day, time.min)
+        return timezone.make_aware(start) if settings.USE_TZ else start
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {'name': 'status', 'required': False, 'in': 'query', 'schema': {'type': 'string'}},
+            {'name': 'created_after', 'required': False, 'in': 'query', 'schema': {'type': 'string', 'format': 'date-time'}},
+            {'name': 'created_before', 'required': False, 'in': 'query', 'schema': {'type': 'string', 'format': 'date-time'}},
+        ]
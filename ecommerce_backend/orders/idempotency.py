@@ -0,0 +1,72 @@
+import hashlib
+import json
+
+from django.db import IntegrityError, transaction
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from .models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+
+
+def _fingerprint(request):
+    digest = hashlib.sha256()
+    digest.update(request.method.encode())
+    digest.update(request.path.encode())
+    digest.update(json.dumps(request.data, cls=JSONEncoder, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+def _replay(stored, fingerprint):
+    if stored.request_fingerprint != fingerprint:
+        return Response(
+            {"detail": f"{IDEMPOTENCY_HEADER} was already used for a different request."},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    response = Response(json.loads(stored.response_body), status=stored.response_status)
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def idempotent_response(request, handler):
+    """
+    Run `handler()` at most once per (user, Idempotency-Key).
+
+    The key row is inserted before the handler runs, in the transaction
+    that later stores the response. A concurrent request with the same key
+    waits on the unique index until the first one finishes, then replays
+    its response; if the first one failed, nothing was stored and the
+    request may be retried.
+    """
+    key = request.headers.get(IDEMPOTENCY_HEADER)
+    if not key:
+        with transaction.atomic():
+            return handler()
+
+    fingerprint = _fingerprint(request)
+    stored = IdempotencyKey.objects.filter(user=request.user, key=key).first()
+    if stored is not None:
+        return _replay(stored, fingerprint)
+
+    try:
+        with transaction.atomic():
+            stored = IdempotencyKey.objects.create(
+                user=request.user,
+                key=key,
+                request_fingerprint=fingerprint,
+                response_status=0,
+                response_body='',
+            )
+            response = handler()
+            stored.response_status = response.status_code
+            stored.response_body = json.dumps(response.data, cls=JSONEncoder)
+            stored.save(update_fields=['response_status', 'response_body'])
+    except IntegrityError:
+        # A concurrent request with the same key committed first.
+        stored = IdempotencyKey.objects.filter(user=request.user, key=key).first()
+        if stored is None:
+            raise
+        return _replay(stored, fingerprint)
+    return response
@@ -0,0 +1,110 @@
+# Generated by Django 5.0.1 on 2026-10-18 19:27
+
+import django.db.models.deletion
+import uuid
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+CENT = Decimal('0.01')
+
+
+def backfill_orders(apps, schema_editor):
+    """
+    Give existing orders their user, item count, lines and total, a batch
+    at a time. The lines can only use today's product names and prices;
+    items whose product is gone are left out. Orders checked out since
+    0013 already carry their real total and keep it.
+    """
+    Order = apps.get_model('orders', 'Order')
+    OrderLine = apps.get_model('orders', 'OrderLine')
+    CartItem = apps.get_model('cart', 'CartItem')
+    Product = apps.get_model('products', 'Product')
+
+    last_pk = None
+    while True:
+        batch = Order.objects.filter(cart__isnull=False).order_by('pk').select_related('cart')
+        if last_pk is not None:
+            batch = batch.filter(pk__gt=last_pk)
+        orders = list(batch[:BATCH_SIZE])
+        if not orders:
+            return
+        last_pk = orders[-1].pk
+
+        items = list(CartItem.objects.filter(cart_id__in=[order.cart_id for order in orders]))
+        products = Product.objects.only('name', 'price').in_bulk({item.product_id for item in items})
+        items_by_cart = {}
+        for item in items:
+            items_by_cart.setdefault(item.cart_id, []).append(item)
+
+        lines = []
+        for order in orders:
+            order.user_id = order.cart.user_id
+            order.item_count = 0
+            total = Decimal('0.00')
+            for item in items_by_cart.get(order.cart_id, []):
+                order.item_count += item.quantity
+                product = products.get(item.product_id)
+                if product is not None:
+                    subtotal = (product.price * item.quantity).quantize(CENT)
+                    total += subtotal
+                    lines.append(OrderLine(
+                        order=order,
+                        product_id=item.product_id,
+                        product_name=product.name,
+                        unit_price=product.price,
+                        quantity=item.quantity,
+                        subtotal=subtotal,
+                    ))
+            if not order.total_price:
+                order.total_price = total
+        Order.objects.bulk_update(orders, ['user', 'item_count', 'total_price'])
+        OrderLine.objects.bulk_create(lines)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cart', '0005_cartitem_reservation'),
+        ('orders', '0014_order_cart_status_indexes'),
+        ('products', '0012_inventory'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderLine',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('product_id', models.UUIDField()),
+                ('product_name', models.CharField(max_length=255)),
+                ('unit_price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('quantity', models.PositiveIntegerField()),
+                ('subtotal', models.DecimalField(decimal_places=2, max_digits=12)),
+            ],
+            options={
+                'ordering': ['product_name', 'id'],
+            },
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='item_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='orders', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['user', 'created_at', 'id'], name='order_user_created_idx'),
+        ),
+        migrations.AddField(
+            model_name='orderline',
+            name='order',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lines', to='orders.order'),
+        ),
+        migrations.RunPython(backfill_orders, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,11 @@
 import uuid
 from django.db import models
+from django.contrib.auth import get_user_model
 from cart.models import Cart
 from datetime import datetime
 
+User = get_user_model()
+
 class Order(models.Model):
     STATUS_CHOICES = [
         ('Received', 'Received'),
@@ -12,8 +15,53 @@ class Order(models.Model):
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     cart = models.ForeignKey(Cart, on_delete=models.CASCADE, related_name='orders', null=True, blank=True)  # Allow null temporarily
+    # Copied from the cart at checkout so order history never joins carts or products.
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='orders', null=True, blank=True)
     created_at = models.DateTimeField(default=datetime.now)
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='Received')
+    total_price = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    item_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'created_at', 'id'], name='order_user_created_idx'),
+            models.Index(fields=['created_at', 'id'], name='order_created_idx'),
+            models.Index(fields=['cart', 'created_at', 'id'], name='order_cart_created_idx'),
+            models.Index(fields=['status', 'created_at'], name='order_status_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"Order {self.id} - {self.status}"
+
+class OrderLine(models.Model):
+    """A cart item as it was bought: product name and price at checkout."""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='lines')
+    product_id = models.UUIDField()
+    product_name = models.CharField(max_length=255)
+    unit_price = models.DecimalField(max_digits=10, decimal_places=2)
+    quantity = models.PositiveIntegerField()
+    subtotal = models.DecimalField(max_digits=12, decimal_places=2)
+
+    class Meta:
+        ordering = ['product_name', 'id']
+
+    def __str__(self):
+        return f"OrderLine {self.id} - Order {self.order_id}"
+
+class IdempotencyKey(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='idempotency_keys')
+    key = models.CharField(max_length=255)
+    request_fingerprint = models.CharField(max_length=64)
+    response_status = models.PositiveSmallIntegerField()
+    response_body = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'key'], name='unique_idempotency_key_per_user'),
+        ]
 
     def __str__(self):
-        return f"Order {self.id} - {self.status}"
\ No newline at end of file
+        return f"IdempotencyKey {self.key} - {self.user_id}"
@@ -1,9 +1,32 @@
 from rest_framework import serializers
-from .models import Order
+from .models import Order, OrderLine
 
 class OrdersSerializer(serializers.ModelSerializer):
     # cart = serializers.PrimaryKeyRelatedField(read_only=True)  # Include cart field
     class Meta:
         model = Order
         fields = '__all__'
-        read_only_fields = ['total_price']
\ No newline at end of file
+        read_only_fields = ['user', 'total_price', 'item_count']
+
+    def validate_cart(self, cart):
+        request = self.context.get('request')
+        if cart is not None and request is not None and cart.user_id != request.user.id:
+            raise serializers.ValidationError("Cart not found.")
+        return cart
+
+class OrderListSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Order
+        fields = ['id', 'status', 'created_at', 'total_price', 'item_count', 'cart']
+        read_only_fields = fields
+
+class OrderLineSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = OrderLine
+        fields = ['product_id', 'product_name', 'unit_price', 'quantity', 'subtotal']
+        read_only_fields = fields
+
+class OrderDetailSerializer(OrdersSerializer):
+    lines = OrderLineSerializer(many=True, read_only=True)
+    shipping_address = serializers.CharField(source='cart.shipping_address', read_only=True, default='')
+    billing_address = serializers.CharField(source='cart.billing_address', read_only=True, default='')
@@ -1,23 +1,42 @@
 from cart.models import Cart
+from cart.views import checkout_response
 from rest_framework import viewsets
+from rest_framework.generics import get_object_or_404
 from .models import Order
 from rest_framework.permissions import IsAuthenticated
-from rest_framework_simplejwt.authentication import JWTAuthentication
-from .serializers import OrdersSerializer
+from users.authentication import CachedJWTAuthentication
+from ecommerce_backend.query_planning import QueryPlanMixin
+from .filters import OrderFilterBackend
+from .serializers import OrderDetailSerializer, OrderListSerializer, OrdersSerializer
 
-class OrdersViewSet(viewsets.ModelViewSet):
+class OrdersViewSet(QueryPlanMixin, viewsets.ModelViewSet):
     serializer_class = OrdersSerializer
     permission_classes = [IsAuthenticated]
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
+    filter_backends = [OrderFilterBackend]
+    # Checkout (create) updates one stock row per product, so it has no budget.
+    query_budget = {'list': 2, 'retrieve': 3}
 
-    def get_permissions(self):
-        if self.action in ['create', 'update', 'destroy']:
-            return [IsAuthenticated()]
-        return []
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return OrderListSerializer
+        if self.action == 'retrieve':
+            return OrderDetailSerializer
+        return OrdersSerializer
 
     def get_queryset(self):
-        return Order.objects.filter()
-    
+        if getattr(self, 'swagger_fake_view', False):
+            return Order.objects.none()
+        return Order.objects.filter(user=self.request.user)
+
+    def create(self, request, *args, **kwargs):
+        # Orders are placed by checking out a cart, which commits its stock and
+        # snapshots its lines. Without a `cart` the user's open one is used.
+        carts = Cart.objects.filter(user=request.user)
+        cart_id = request.data.get('cart')
+        cart = get_object_or_404(carts, pk=cart_id) if cart_id else get_object_or_404(carts, status='Cart')
+        return checkout_response(request, cart.pk)
+
     # def perform_create(self, serializer):
     #     cart_id = self.request.data.get('cart')  # Get cart ID from the request body
     #     if not cart_id:
@@ -26,4 +45,4 @@ class OrdersViewSet(viewsets.ModelViewSet):
     #     order = serializer.save(cart=cart)  # Link cart to order
     #     total_price = sum(item.price * item.quantity for item in cart.items.all())  # Calculate total price from cart items
     #     order.total_price = total_price
-    #     order.save()
\ No newline at end of file
+    #     order.save()
@@ -0,0 +1,32 @@
+from django.http import Http404
+
+from ecommerce_backend.async_api import async_read_view
+from ecommerce_backend.pagination import KeysetPagination
+from .cache import acached_response, alisting_key, detail_key
+from .filters import ProductFilterBackend
+from .images import attach_rendition_sets
+from .models import Product
+from .serializers import ProductSerializer
+
+
+@async_read_view()
+async def product_listing(request):
+    """Async twin of the `listing/` endpoint, sharing its cache entries' shape."""
+    async def build():
+        products = ProductFilterBackend().filter_queryset(request, Product.objects.all(), None)
+        products = products.values('id', 'image', 'renditions', 'description', 'price', 'created_at')
+        paginator = KeysetPagination()
+        page = attach_rendition_sets(await paginator.apaginate_queryset(products, request), request.build_absolute_uri)
+        return paginator.get_paginated_response(page).data
+    return await acached_response(request, await alisting_key(request), build)
+
+
+@async_read_view(authenticated=False)
+async def product_detail(request, pk):
+    async def build():
+        try:
+            product = await Product.objects.select_related('user').aget(pk=pk)
+        except Product.DoesNotExist:
+            raise Http404
+        return ProductSerializer(product, context={'request': request}).data
+    return await acached_response(request, detail_key(pk), build)
@@ -0,0 +1,106 @@
+import csv
+import io
+import json
+from functools import partial
+
+from django.db import transaction
+from rest_framework.utils.encoders import JSONEncoder
+
+from .cache import invalidate_product
+from .models import Product
+from .search import get_search_backend
+from .serializers import ProductSerializer
+
+FORMATS = ('csv', 'jsonl')
+IMPORT_FIELDS = ['name', 'description', 'price', 'type', 'brand']
+EXPORT_FIELDS = ['id', 'name', 'description', 'price', 'image', 'type', 'brand', 'created_at', 'updated_at']
+MAX_REPORTED_ERRORS = 1000
+
+
+def detect_format(filename, default='csv'):
+    name = (filename or '').lower()
+    if name.endswith(('.jsonl', '.ndjson')):
+        return 'jsonl'
+    if name.endswith('.csv'):
+        return 'csv'
+    return default
+
+
+def iter_rows(stream, file_format):
+    """
+    Yield (row_number, row) pairs from a binary stream one record at a time,
+    so the whole file is never held in memory.
+    """
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    if file_format == 'csv':
+        for number, row in enumerate(csv.DictReader(text), start=1):
+            yield number, row
+        return
+    for number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield number, None
+            continue
+        yield number, row if isinstance(row, dict) else None
+
+
+def import_products(rows, user, batch_size=1000):
+    """
+    Validate each row with ProductSerializer and insert the valid ones with
+    bulk_create, committing one batch at a time.
+    """
+    report = {'created': 0, 'failed': 0, 'errors': []}
+    batch = []
+
+    def flush():
+        with transaction.atomic():
+            Product.objects.bulk_create(batch)
+            # bulk_create sends no signals, so do what the handlers would.
+            transaction.on_commit(partial(invalidate_product, None))
+            backend = get_search_backend()
+            for product in batch:
+                transaction.on_commit(partial(backend.update, product))
+        report['created'] += len(batch)
+        batch.clear()
+
+    for number, row in rows:
+        if row is None:
+            errors = {'non_field_errors': ['Row is not a valid JSON object.']}
+        else:
+            # Empty CSV cells mean "not given", so model defaults still apply.
+            data = {field: row[field] for field in IMPORT_FIELDS if row.get(field) not in (None, '')}
+            serializer = ProductSerializer(data=data)
+            if serializer.is_valid():
+                batch.append(Product(user=user, **serializer.validated_data))
+                if len(batch) >= batch_size:
+                    flush()
+                continue
+            errors = serializer.errors
+        report['failed'] += 1
+        if len(report['errors']) < MAX_REPORTED_ERRORS:
+            report['errors'].append({'row': number, 'errors': errors})
+
+    if batch:
+        flush()
+    return report
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+def export_products(queryset, file_format, chunk_size=2000):
+    """Yield the queryset as CSV or JSON lines, streaming it in chunks."""
+    rows = queryset.order_by('created_at', 'id').values(*EXPORT_FIELDS).iterator(chunk_size=chunk_size)
+    if file_format == 'csv':
+        writer = csv.DictWriter(_Echo(), fieldnames=EXPORT_FIELDS)
+        yield writer.writeheader()
+        for row in rows:
+            yield writer.writerow(row)
+        return
+    for row in rows:
+        yield json.dumps(row, cls=JSONEncoder) + '\n'
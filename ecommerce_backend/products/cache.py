@@ -0,0 +1,103 @@
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponseNotModified, JsonResponse
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+LISTING_VERSION_KEY = 'products:listing:version'
+
+
+def listing_key(request):
+    digest = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+    return f'products:listing:{get_listing_version()}:{digest}'
+
+
+def detail_key(pk):
+    return f'products:detail:{pk}'
+
+
+def get_listing_version():
+    version = cache.get(LISTING_VERSION_KEY)
+    if version is None:
+        # Start from the clock so an evicted counter never reuses old keys.
+        cache.add(LISTING_VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(LISTING_VERSION_KEY)
+    return version
+
+
+async def aget_listing_version():
+    version = await cache.aget(LISTING_VERSION_KEY)
+    if version is None:
+        await cache.aadd(LISTING_VERSION_KEY, time.time_ns(), timeout=None)
+        version = await cache.aget(LISTING_VERSION_KEY)
+    return version
+
+
+async def alisting_key(request):
+    digest = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+    return f'products:listing:{await aget_listing_version()}:{digest}'
+
+
+def invalidate_product(pk):
+    try:
+        cache.incr(LISTING_VERSION_KEY)
+    except ValueError:
+        cache.set(LISTING_VERSION_KEY, time.time_ns(), timeout=None)
+    if pk is not None:
+        cache.delete(detail_key(pk))
+
+
+def _cache_entry(data):
+    body = json.dumps(data, cls=JSONEncoder, sort_keys=True).encode()
+    return quote_etag(hashlib.md5(body).hexdigest()), data
+
+
+def _not_modified(request, etag):
+    if_none_match = parse_etags(request.headers.get('If-None-Match', ''))
+    return etag in if_none_match or '*' in if_none_match
+
+
+def request_origin(request):
+    return f'{request.scheme}://{request.get_host()}'
+
+
+def cached_response(request, key, build):
+    """
+    Serve `build()` through the cache, answering If-None-Match with a 304
+    when the client already holds the current representation. Bodies carry
+    absolute URLs, so `key` holds one entry per scheme and host; keeping
+    them under one key lets `invalidate_product` drop them all at once.
+    """
+    entries = cache.get(key) or {}
+    entry = entries.get(request_origin(request))
+    if entry is None:
+        entry = entries[request_origin(request)] = _cache_entry(build())
+        cache.set(key, entries, settings.PRODUCT_CACHE_TIMEOUT)
+
+    etag, data = entry
+    if _not_modified(request, etag):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+    return Response(data, headers={'ETag': etag})
+
+
+async def acached_response(request, key, build):
+    """Async variant of `cached_response` for plain Django async views."""
+    entries = await cache.aget(key) or {}
+    entry = entries.get(request_origin(request))
+    if entry is None:
+        entry = entries[request_origin(request)] = _cache_entry(await build())
+        await cache.aset(key, entries, settings.PRODUCT_CACHE_TIMEOUT)
+
+    etag, data = entry
+    if _not_modified(request, etag):
+        response = HttpResponseNotModified()
+    else:
+        response = JsonResponse(data, encoder=JSONEncoder, safe=False)
+    response['ETag'] = etag
+    return response
@@ -0,0 +1,115 @@
+from decimal import Decimal, InvalidOperation
+
+from django.db.models import Count, Max, Min
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+
+class ProductFilterBackend(BaseFilterBackend):
+    """
+    Filter products by `type`, `brand` and `owner` (each repeatable) and by
+    a `min_price`/`max_price` range.
+    """
+    multi_value_params = {'type': 'type', 'brand': 'brand', 'owner': 'user__username'}
+
+    def filter_queryset(self, request, queryset, view):
+        return self.apply(request.query_params, queryset)
+
+    def apply(self, params, queryset, exclude=()):
+        """Filter `queryset` by `params`, ignoring the parameters in `exclude`."""
+        for param, lookup in self.multi_value_params.items():
+            if param in exclude:
+                continue
+            values = [value for value in params.getlist(param) if value != '']
+            if len(values) == 1:
+                queryset = queryset.filter(**{lookup: values[0]})
+            elif values:
+                queryset = queryset.filter(**{f'{lookup}__in': values})
+
+        min_price = None if 'min_price' in exclude else self._get_price(params, 'min_price')
+        max_price = None if 'max_price' in exclude else self._get_price(params, 'max_price')
+        if min_price is not None:
+            queryset = queryset.filter(price__gte=min_price)
+        if max_price is not None:
+            queryset = queryset.filter(price__lte=max_price)
+        return queryset
+
+    def _get_price(self, params, name):
+        value = params.get(name)
+        if value in (None, ''):
+            return None
+        try:
+            price = Decimal(value)
+        except InvalidOperation:
+            raise ValidationError({name: 'A valid number is required.'})
+        if not price.is_finite() or price < 0:
+            raise ValidationError({name: 'A valid number is required.'})
+        return price
+
+    def get_schema_operation_parameters(self, view):
+        parameters = [
+            {'name': param, 'required': False, 'in': 'query', 'schema': {'type': 'string'}}
+            for param in self.multi_value_params
+        ]
+        parameters += [
+            {'name': param, 'required': False, 'in': 'query', 'schema': {'type': 'number'}}
+            for param in ('min_price', 'max_price')
+        ]
+        return parameters
+
+
+FACET_PARAMS = {'brand': ('brand',), 'type': ('type',), 'price': ('min_price', 'max_price')}
+
+
+def facet_counts(queryset, params):
+    """
+    Count products per brand and per type, plus the price range. Each facet
+    is counted with every filter except its own, so choosing a brand still
+    lists the other brands; facets whose own filter is unset share a single
+    GROUP BY (brand, type) query over the fully filtered products.
+    """
+    backend = ProductFilterBackend()
+    summaries = {}
+
+    def summary(exclude):
+        if exclude not in summaries:
+            summaries[exclude] = _summarize(backend.apply(params, queryset, exclude))
+        return summaries[exclude]
+
+    counts = {'count': summary(())['count']}
+    for facet, own in FACET_PARAMS.items():
+        selected = any(value != '' for param in own for value in params.getlist(param))
+        counts[facet] = summary(own if selected else ())[facet]
+    return counts
+
+
+def _summarize(queryset):
+    rows = (
+        queryset.order_by()
+        .values('brand', 'type')
+        .annotate(count=Count('id'), min_price=Min('price'), max_price=Max('price'))
+    )
+    brands, types = {}, {}
+    min_price = max_price = None
+    total = 0
+    for row in rows:
+        brands[row['brand']] = brands.get(row['brand'], 0) + row['count']
+        types[row['type']] = types.get(row['type'], 0) + row['count']
+        total += row['count']
+        if min_price is None or row['min_price'] < min_price:
+            min_price = row['min_price']
+        if max_price is None or row['max_price'] > max_price:
+            max_price = row['max_price']
+
+    def ordered(counts):
+        return [
+            {'value': value, 'count': count}
+            for value, count in sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+        ]
+
+    return {
+        'count': total,
+        'brand': ordered(brands),
+        'type': ordered(types),
+        'price': {'min': min_price, 'max': max_price},
+    }
@@ -0,0 +1,171 @@
+import hashlib
+import io
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection
+from PIL import Image, ImageOps
+
+from .cache import invalidate_product
+from .models import Product
+
+logger = logging.getLogger(__name__)
+
+# Rendition widths in pixels. Originals are never upscaled; a smaller
+# image gets one rendition at its own width instead.
+RENDITION_WIDTHS = (160, 320, 640, 1280)
+RENDITION_FORMAT = 'WEBP'
+RENDITION_QUALITY = 80
+RENDITION_DIR = 'product_images/renditions'
+
+
+def needs_renditions(product):
+    return bool(product.image) and (product.renditions or {}).get('source') != product.image.name
+
+
+def render(source, widths=RENDITION_WIDTHS):
+    """
+    Resize the image in `source` (a file) to each width and encode it as
+    WebP. Returns the renditions as (width, height, bytes), smallest first.
+    """
+    with Image.open(source) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if _has_alpha(image) else 'RGB')
+        renditions = []
+        for width in sorted(widths):
+            width = min(width, image.width)
+            height = max(1, round(image.height * width / image.width))
+            buffer = io.BytesIO()
+            image.resize((width, height), Image.LANCZOS).save(
+                buffer, RENDITION_FORMAT, quality=RENDITION_QUALITY, method=4
+            )
+            renditions.append((width, height, buffer.getvalue()))
+            if width == image.width:
+                break
+    return renditions
+
+
+def _has_alpha(image):
+    """Whether converting `image` to RGB would drop transparency."""
+    if any(band in ('A', 'a') for band in image.getbands()):
+        return True
+    if image.mode == 'P' and image.palette is not None and image.palette.mode == 'RGBA':
+        return True
+    return 'transparency' in image.info
+
+
+def generate_renditions(product_id):
+    """
+    Render and store the renditions of a product's current image, then
+    record them on the product. Files are named after a hash of their
+    content, so they can be cached forever and shared between products
+    with the same upload.
+    """
+    product = Product.objects.filter(pk=product_id).only('id', 'image', 'renditions').first()
+    if product is None or not needs_renditions(product):
+        return None
+
+    source = product.image.name
+    with default_storage.open(source, 'rb') as original:
+        renditions = render(original)
+
+    sizes = []
+    for width, height, content in renditions:
+        digest = hashlib.sha256(content).hexdigest()[:16]
+        name = f'{RENDITION_DIR}/{digest}-{width}w.webp'
+        if not default_storage.exists(name):
+            name = default_storage.save(name, ContentFile(content))
+        sizes.append({'width': width, 'height': height, 'name': name})
+    metadata = {'source': source, 'format': 'image/webp', 'sizes': sizes}
+
+    # Only record renditions for the image they were made from; a newer
+    # upload schedules its own job.
+    updated = Product.objects.filter(pk=product_id, image=source).update(renditions=metadata)
+    if updated:
+        invalidate_product(product_id)
+    return metadata
+
+
+def rendition_set(renditions, image_name, build_url=None):
+    """
+    srcset-ready description of stored renditions, or None if there are
+    none for the current image `image_name` yet (renditions of a replaced
+    or cleared image are never served). `build_url` turns a storage URL
+    into an absolute one.
+    """
+    renditions = renditions or {}
+    sizes = renditions.get('sizes')
+    if not sizes or not image_name or renditions.get('source') != image_name:
+        return None
+    build_url = build_url or (lambda url: url)
+    variants = [
+        {'width': size['width'], 'height': size['height'], 'url': build_url(default_storage.url(size['name']))}
+        for size in sizes
+    ]
+    return {
+        'type': renditions.get('format', 'image/webp'),
+        'src': variants[-1]['url'],
+        'srcset': ', '.join(f"{variant['url']} {variant['width']}w" for variant in variants),
+        'variants': variants,
+    }
+
+
+def attach_rendition_sets(rows, build_url=None):
+    """
+    Replace the `renditions` of `.values()` rows, which must include
+    `image`, with their rendition set.
+    """
+    for row in rows:
+        row['images'] = rendition_set(row.pop('renditions'), row['image'], build_url)
+    return rows
+
+
+class RenditionWorkerPool:
+    """
+    Process-wide thread pool that renders images outside the request.
+
+    Jobs are keyed by product so repeated saves don't queue duplicate work.
+    Jobs only live in memory; `generate_renditions` the management command
+    picks up anything lost to a restart.
+    """
+
+    def __init__(self, max_workers):
+        self.max_workers = max_workers
+        self._executor = None
+        self._pending = set()
+        self._lock = threading.Lock()
+
+    def submit(self, product_id):
+        with self._lock:
+            if product_id in self._pending:
+                return None
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix='renditions')
+            self._pending.add(product_id)
+            return self._executor.submit(self._run, product_id)
+
+    def _run(self, product_id):
+        # Release the key first so an upload made while this job runs
+        # queues a fresh one.
+        with self._lock:
+            self._pending.discard(product_id)
+        try:
+            return generate_renditions(product_id)
+        except Exception:
+            logger.exception('Could not render images for product %s', product_id)
+        finally:
+            connection.close()
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+rendition_pool = RenditionWorkerPool(getattr(settings, 'IMAGE_RENDITION_WORKERS', 2))
@@ -0,0 +1,68 @@
+"""
+Stock changes, each one a single conditional UPDATE. A reservation that
+would overdraw `available` matches no row instead of reading, checking and
+writing back, so concurrent carts can never take the same unit twice.
+"""
+from django.db.models import F, Sum
+
+from cart.models import CartItem
+
+from .models import Inventory
+
+
+def reserve(product_id, quantity):
+    """
+    Move `quantity` units from available to reserved. Returns False when
+    there isn't enough stock; untracked products always succeed.
+    """
+    updated = Inventory.objects.filter(product_id=product_id, available__gte=quantity).update(
+        available=F('available') - quantity,
+        reserved=F('reserved') + quantity,
+    )
+    if updated:
+        return True
+    # Only the failure path pays for telling "short" from "untracked".
+    return not Inventory.objects.filter(product_id=product_id).exists()
+
+
+def release(product_id, quantity):
+    """Return reserved units to available stock."""
+    Inventory.objects.filter(product_id=product_id, reserved__gte=quantity).update(
+        available=F('available') + quantity,
+        reserved=F('reserved') - quantity,
+    )
+
+
+def commit(product_id, quantity):
+    """Turn reserved units into sold ones, which leave stock for good."""
+    Inventory.objects.filter(product_id=product_id, reserved__gte=quantity).update(
+        reserved=F('reserved') - quantity,
+    )
+
+
+def set_on_hand(product_id, on_hand):
+    """
+    Set the physical count of a product, tracking it from now on. Units
+    held by carts stay reserved, so returns None if `on_hand` is below them.
+    """
+    inventory = Inventory.objects.filter(product_id=product_id).first()
+    if inventory is None:
+        # Carts may already hold the product while it was untracked.
+        held = CartItem.objects.filter(product_id=product_id, reserved_quantity__gt=0).aggregate(
+            total=Sum('reserved_quantity'),
+        )['total'] or 0
+        if on_hand < held:
+            return None
+        inventory, created = Inventory.objects.get_or_create(
+            product_id=product_id, defaults={'available': on_hand - held, 'reserved': held},
+        )
+        if created:
+            return inventory
+
+    updated = Inventory.objects.filter(product_id=product_id, reserved__lte=on_hand).update(
+        available=on_hand - F('reserved'),
+    )
+    if not updated:
+        return None
+    inventory.refresh_from_db()
+    return inventory
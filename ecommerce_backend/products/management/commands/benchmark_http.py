@@ -0,0 +1,64 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ecommerce_backend.benchmarking import format_row, load_test
+
+ENDPOINTS = {
+    'listing': ('/products/listing/', '/products/async/listing/'),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test read endpoints on running servers, e.g. the WSGI app "
+        "under gunicorn and the ASGI app under uvicorn, and compare their "
+        "latency percentiles and throughput at each concurrency level."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--wsgi-url', help="Base URL of the WSGI server, e.g. http://127.0.0.1:8000")
+        parser.add_argument('--asgi-url', help="Base URL of the ASGI server, e.g. http://127.0.0.1:8001")
+        parser.add_argument('--token', help="JWT access token sent as a Bearer credential.")
+        parser.add_argument('--product', help="Product id; also benchmarks the detail endpoints.")
+        parser.add_argument('--cart', help="Cart id (owned by the token's user); also benchmarks cart detail.")
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32])
+        parser.add_argument('--requests', type=int, default=500, help="Requests per run.")
+        parser.add_argument('--json', action='store_true', help="Print results as JSON.")
+
+    def handle(self, *args, **options):
+        servers = {
+            name: url.rstrip('/')
+            for name, url in (('wsgi', options['wsgi_url']), ('asgi', options['asgi_url']))
+            if url
+        }
+        if not servers:
+            raise CommandError("Pass --wsgi-url and/or --asgi-url.")
+
+        endpoints = dict(ENDPOINTS)
+        if options['product']:
+            endpoints['product'] = (f"/products/{options['product']}/", f"/products/async/{options['product']}/")
+        if options['cart']:
+            endpoints['cart'] = (f"/cart/{options['cart']}/", f"/cart/async/{options['cart']}/")
+        headers = {'Authorization': f"Bearer {options['token']}"} if options['token'] else {}
+
+        results = {}
+        for endpoint, paths in endpoints.items():
+            for name, base_url in servers.items():
+                # The async routes only exist to be served natively by ASGI.
+                path = paths[1] if name == 'asgi' else paths[0]
+                for concurrency in options['concurrency']:
+                    stats = load_test(base_url + path, concurrency, options['requests'], headers)
+                    results.setdefault(endpoint, {}).setdefault(name, {})[concurrency] = stats
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        for endpoint, runs in results.items():
+            self.stdout.write(endpoint)
+            for name, levels in runs.items():
+                for concurrency, stats in levels.items():
+                    self.stdout.write(
+                        format_row(f"  {name} x{concurrency}", stats)
+                        + f"  {stats['throughput_per_s']:.0f} req/s  {stats['errors']} errors"
+                    )
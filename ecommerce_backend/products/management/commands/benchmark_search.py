@@ -0,0 +1,104 @@
+import json
+import random
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+
+from ecommerce_backend.benchmarking import format_row, measure
+from products.models import Product
+from products.search import SEARCH_FIELDS, FTS5SearchBackend, InvertedIndexSearchBackend
+
+ADJECTIVES = ['vintage', 'wireless', 'compact', 'leather', 'organic', 'ergonomic', 'waterproof', 'classic',
+              'portable', 'handmade', 'smart', 'premium', 'foldable', 'lightweight', 'stainless', 'rustic']
+NOUNS = ['headphones', 'backpack', 'lamp', 'keyboard', 'jacket', 'kettle', 'speaker', 'watch', 'blender',
+         'notebook', 'sneakers', 'tent', 'camera', 'mug', 'chair', 'charger', 'drone', 'guitar']
+BRANDS = ['Acme', 'Globex', 'Initech', 'Umbrella', 'Hooli', 'Stark', 'Wayne', 'Wonka', 'Tyrell', 'Cyberdyne']
+TYPES = ['Electronics', 'Outdoors', 'Home', 'Apparel', 'Kitchen', 'Music', 'Office', 'Sports']
+SYLLABLES = ['ka', 'lo', 'mi', 'ra', 'ven', 'tor', 'sil', 'dan', 'pe', 'qu', 'zor', 'nel', 'bri', 'ust', 'fa']
+
+
+def build_vocabulary(rng, size=5000):
+    """Pseudo-words with Zipf-like weights, so term frequencies look like real text."""
+    words = set()
+    while len(words) < size:
+        words.add(''.join(rng.choices(SYLLABLES, k=rng.randint(2, 4))))
+    words = sorted(words)
+    rng.shuffle(words)
+    return words, [1 / rank for rank in range(1, size + 1)]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the product search backends against a naive icontains scan. "
+        "Synthetic products are created inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--products', type=int, default=100_000)
+        parser.add_argument('--queries', type=int, default=100)
+        parser.add_argument('--limit', type=int, default=20)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--json', action='store_true', help="Print results as JSON.")
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        self.words, self.weights = build_vocabulary(rng)
+        queries = [
+            ' '.join([rng.choice(NOUNS)] + rng.choices(self.words, self.weights, k=rng.choice((0, 1))))
+            for _ in range(options['queries'])
+        ]
+        limit = options['limit']
+        results = {'products': options['products'], 'queries': options['queries']}
+
+        with transaction.atomic():
+            self._seed(rng, options['products'])
+
+            def icontains(i):
+                condition = Q()
+                for term in queries[i].split():
+                    term_condition = Q()
+                    for field in SEARCH_FIELDS:
+                        term_condition |= Q(**{f'{field}__icontains': term})
+                    condition &= term_condition
+                # Same number of rows as the indexed backends return; a scan
+                # has nothing to rank them by.
+                list(Product.objects.filter(condition).values_list('id', *SEARCH_FIELDS)[:limit])
+
+            results['icontains'] = measure(icontains, len(queries))
+
+            if FTS5SearchBackend.is_available():
+                fts = FTS5SearchBackend()
+                results['fts5'] = measure(lambda i: fts.search(queries[i], limit), len(queries))
+
+            inverted = InvertedIndexSearchBackend()
+            start = time.perf_counter()
+            inverted.rebuild()
+            results['inverted_index_build_s'] = round(time.perf_counter() - start, 3)
+            results['inverted_index'] = measure(lambda i: inverted.search(queries[i], limit), len(queries))
+
+            transaction.set_rollback(True)
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(f"{results['products']} products, {results['queries']} queries")
+        for label in ('icontains', 'fts5', 'inverted_index'):
+            if label in results:
+                self.stdout.write(format_row(label, results[label]))
+        self.stdout.write(f"inverted index build: {results['inverted_index_build_s']} s")
+
+    def _seed(self, rng, count, batch_size=5000):
+        for start in range(0, count, batch_size):
+            Product.objects.bulk_create([
+                Product(
+                    name=f'{rng.choice(ADJECTIVES).title()} {rng.choice(NOUNS)}',
+                    description=' '.join(rng.choices(self.words, self.weights, k=12)),
+                    price=Decimal(rng.randint(100, 100_000)) / 100,
+                    brand=rng.choice(BRANDS),
+                    type=rng.choice(TYPES),
+                )
+                for _ in range(min(batch_size, count - start))
+            ])
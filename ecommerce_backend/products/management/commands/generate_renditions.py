@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from products.images import generate_renditions, needs_renditions
+from products.models import Product
+
+
+class Command(BaseCommand):
+    help = (
+        "Render missing or outdated image renditions in this process, e.g. "
+        "for products uploaded before renditions existed or jobs lost to a "
+        "restart."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help="Re-render every product image.")
+
+    def handle(self, *args, **options):
+        products = Product.objects.exclude(image='').exclude(image__isnull=True).only('id', 'image', 'renditions')
+        if options['force']:
+            products.update(renditions={})
+        rendered = failed = 0
+        for product in products.iterator(chunk_size=500):
+            if not needs_renditions(product):
+                continue
+            try:
+                generate_renditions(product.pk)
+                rendered += 1
+            except Exception as exc:
+                failed += 1
+                self.stderr.write(f"{product.pk}: {exc}")
+        self.stdout.write(self.style.SUCCESS(f"Rendered {rendered} products, {failed} failed."))
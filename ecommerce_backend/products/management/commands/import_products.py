@@ -0,0 +1,28 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from products.bulk_io import FORMATS, detect_format, import_products, iter_rows
+
+
+class Command(BaseCommand):
+    help = "Import products from a CSV or JSON-lines file for a seller."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--user', required=True, help="Username of the seller who will own the products.")
+        parser.add_argument('--format', choices=FORMATS, help="Defaults to the file extension, then csv.")
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get(username=options['user'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"User '{options['user']}' does not exist.")
+
+        file_format = options['format'] or detect_format(options['path'])
+        with open(options['path'], 'rb') as stream:
+            report = import_products(iter_rows(stream, file_format), user, batch_size=options['batch_size'])
+
+        for error in report['errors']:
+            self.stderr.write(f"row {error['row']}: {error['errors']}")
+        self.stdout.write(self.style.SUCCESS(f"Created {report['created']} products, {report['failed']} rows failed."))
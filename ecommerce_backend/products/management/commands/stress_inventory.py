@@ -0,0 +1,134 @@
+import json
+import threading
+import time
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, connections, transaction
+from django.db.models import Sum
+from rest_framework.exceptions import ValidationError
+
+from cart.models import Cart, CartItem
+from cart.reservations import hold_stock
+from ecommerce_backend.benchmarking import format_row, summarize
+from products.inventory import set_on_hand
+from products.models import Inventory, Product
+
+
+class Command(BaseCommand):
+    help = (
+        "Hammer the stock of one product from many threads, each adding it "
+        "to its own cart again and again, then check that no unit was sold twice. Runs "
+        "against the configured database; everything it creates is deleted "
+        "afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=16)
+        parser.add_argument('--attempts', type=int, default=50, help="Cart adds per thread.")
+        parser.add_argument('--stock', type=int, default=500)
+        parser.add_argument('--quantity', type=int, default=1, help="Units per cart add.")
+        parser.add_argument('--json', action='store_true', help="Print results as JSON.")
+
+    def handle(self, *args, **options):
+        user = get_user_model().objects.create(username=f'stress-{uuid.uuid4().hex[:12]}')
+        product = Product.objects.create(name='Hot SKU', description='Stress test product.', price='9.99', user=user)
+        try:
+            set_on_hand(product.pk, options['stock'])
+            results = self._run(user, product, options)
+            results.update(self._verify(product, options['stock'], options['quantity'], results['reserved_items']))
+        finally:
+            # Each thread shops as its own user, since a user has one open cart.
+            get_user_model().objects.filter(username__startswith=user.username).delete()
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+        else:
+            self.stdout.write(
+                format_row(f"{options['threads']} threads", results['latency'])
+                + f"  {results['reserved_items']} reserved  {results['rejected']} out of stock  {results['errors']} errors"
+            )
+            self.stdout.write(
+                f"stock {options['stock']}: {results['available']} available, {results['reserved']} reserved, "
+                f"{results['held_by_items']} held by cart items"
+            )
+        if results['problems']:
+            raise CommandError('; '.join(results['problems']))
+        if not options['json']:
+            self.stdout.write(self.style.SUCCESS("No unit was oversold."))
+
+    def _run(self, user, product, options):
+        samples, counts = [], {'reserved_items': 0, 'rejected': 0, 'errors': 0}
+        lock = threading.Lock()
+        start_barrier = threading.Barrier(options['threads'])
+
+        def worker(number):
+            try:
+                shopper = get_user_model().objects.create(username=f'{user.username}-{number}')
+                cart = Cart.objects.create(user=shopper, status='Cart')
+                local_samples, local_counts = [], dict.fromkeys(counts, 0)
+                item = None
+                start_barrier.wait()
+                for _ in range(options['attempts']):
+                    start = time.perf_counter()
+                    try:
+                        # A cart has one line per product, so the first add creates it
+                        # (perform_create) and later ones raise its quantity (perform_update).
+                        with transaction.atomic():
+                            if item is None:
+                                line = CartItem(cart=cart, product_id=product.pk, quantity=options['quantity'])
+                                hold_stock([line])
+                                line.save()
+                            else:
+                                # Only this thread touches its item, so its holding is known
+                                # without locked_holdings' read, which SQLite would have to
+                                # upgrade to a write lock mid-transaction.
+                                previous = {item.pk: (product.pk, item.reserved_quantity)}
+                                line = CartItem(
+                                    pk=item.pk, cart=cart, product_id=product.pk, quantity=item.quantity + options['quantity'],
+                                )
+                                hold_stock([line], previous)
+                                CartItem.objects.filter(pk=item.pk).update(
+                                    quantity=line.quantity,
+                                    reserved_quantity=line.reserved_quantity,
+                                    reserved_until=line.reserved_until,
+                                )
+                        item = line
+                        local_counts['reserved_items'] += 1
+                    except ValidationError:
+                        local_counts['rejected'] += 1
+                    except OperationalError:
+                        local_counts['errors'] += 1
+                        continue
+                    local_samples.append(time.perf_counter() - start)
+                with lock:
+                    samples.extend(local_samples)
+                    for key, value in local_counts.items():
+                        counts[key] += value
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=worker, args=(number,)) for number in range(options['threads'])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return {'vendor': connection.vendor, 'latency': summarize(samples), **counts}
+
+    def _verify(self, product, stock, quantity, reserved_items):
+        inventory = Inventory.objects.get(pk=product.pk)
+        held = CartItem.objects.filter(product_id=product.pk).aggregate(total=Sum('reserved_quantity'))['total'] or 0
+        problems = []
+        if inventory.on_hand != stock:
+            problems.append(f"available + reserved is {inventory.on_hand}, expected {stock}")
+        if inventory.reserved != held:
+            problems.append(f"inventory has {inventory.reserved} reserved but cart items hold {held}")
+        if held != reserved_items * quantity:
+            problems.append(f"{reserved_items} successful adds should hold {reserved_items * quantity} units, not {held}")
+        return {
+            'available': inventory.available,
+            'reserved': inventory.reserved,
+            'held_by_items': held,
+            'problems': problems,
+        }
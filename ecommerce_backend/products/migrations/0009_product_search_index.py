@@ -0,0 +1,61 @@
+from django.db import migrations
+
+# The DDL is frozen here rather than imported from products.search, so
+# this migration keeps doing what it did when it was written. The
+# post_migrate hook reinstalls the current index definition.
+CREATE_SQL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS products_product_fts USING fts5("
+    "name, description, brand, type, content='products_product', content_rowid='rowid', tokenize='unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS products_product_fts_ai AFTER INSERT ON products_product BEGIN "
+    "INSERT INTO products_product_fts(rowid, name, description, brand, type) "
+    "VALUES (new.rowid, new.name, new.description, new.brand, new.type); END",
+    "CREATE TRIGGER IF NOT EXISTS products_product_fts_ad AFTER DELETE ON products_product BEGIN "
+    "INSERT INTO products_product_fts(products_product_fts, rowid, name, description, brand, type) "
+    "VALUES ('delete', old.rowid, old.name, old.description, old.brand, old.type); END",
+    "CREATE TRIGGER IF NOT EXISTS products_product_fts_au AFTER UPDATE OF name, description, brand, type "
+    "ON products_product BEGIN "
+    "INSERT INTO products_product_fts(products_product_fts, rowid, name, description, brand, type) "
+    "VALUES ('delete', old.rowid, old.name, old.description, old.brand, old.type); "
+    "INSERT INTO products_product_fts(rowid, name, description, brand, type) "
+    "VALUES (new.rowid, new.name, new.description, new.brand, new.type); END",
+    "INSERT INTO products_product_fts(products_product_fts) VALUES('rebuild')",
+]
+
+DROP_SQL = [
+    "DROP TRIGGER IF EXISTS products_product_fts_ai",
+    "DROP TRIGGER IF EXISTS products_product_fts_ad",
+    "DROP TRIGGER IF EXISTS products_product_fts_au",
+    "DROP TABLE IF EXISTS products_product_fts",
+]
+
+
+def _supports_fts5(connection):
+    if connection.vendor != "sqlite":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA compile_options")
+        return "ENABLE_FTS5" in {row[0] for row in cursor.fetchall()}
+
+
+def create_search_index(apps, schema_editor):
+    # Other databases fall back to the in-process index in products.search.
+    if _supports_fts5(schema_editor.connection):
+        for sql in CREATE_SQL:
+            schema_editor.execute(sql)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        for sql in DROP_SQL:
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("products", "0008_product_product_created_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
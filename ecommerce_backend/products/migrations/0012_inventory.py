@@ -0,0 +1,22 @@
+# Generated by Django 5.0.1 on 2026-10-18 19:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0011_product_renditions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Inventory',
+            fields=[
+                ('product', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='inventory', serialize=False, to='products.product')),
+                ('available', models.PositiveIntegerField(default=0)),
+                ('reserved', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -10,11 +10,38 @@ class Product(models.Model):
     description = models.TextField()
     price = models.DecimalField(max_digits=10, decimal_places=2)
     image = models.ImageField(upload_to='product_images/', null=True, blank=True)
+    renditions = models.JSONField(default=dict, blank=True, editable=False)
     type = models.CharField(max_length=100, default="")
     brand = models.CharField(max_length=100, default="")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='product_created_idx'),
+            models.Index(fields=['user', 'created_at', 'id'], name='product_user_created_idx'),
+            models.Index(fields=['type', 'brand', 'price'], name='product_type_brand_price_idx'),
+            models.Index(fields=['brand', 'price'], name='product_brand_price_idx'),
+            models.Index(fields=['price'], name='product_price_idx'),
+        ]
+
+    def __str__(self):
+        return self.name
+
+class Inventory(models.Model):
+    """
+    Stock for one product. `available` units can still be put in carts and
+    `reserved` ones are held by carts; products without a row are not
+    stock-tracked.
+    """
+    product = models.OneToOneField(Product, on_delete=models.CASCADE, primary_key=True, related_name='inventory')
+    available = models.PositiveIntegerField(default=0)
+    reserved = models.PositiveIntegerField(default=0)
+
+    @property
+    def on_hand(self):
+        return self.available + self.reserved
+
     def __str__(self):
-        return self.name
\ No newline at end of file
+        return f"Inventory {self.product_id}: {self.available} available, {self.reserved} reserved"
@@ -0,0 +1,253 @@
+import bisect
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import connection
+from django.utils.module_loading import import_string
+
+from .models import Product
+
+FTS_TABLE = 'products_product_fts'
+SEARCH_FIELDS = ('name', 'description', 'brand', 'type')
+FIELD_WEIGHTS = {'name': 10.0, 'description': 1.0, 'brand': 4.0, 'type': 4.0}
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+_COLUMNS = ', '.join(SEARCH_FIELDS)
+_NEW_ROW = ', '.join(f'new.{field}' for field in SEARCH_FIELDS)
+_OLD_ROW = ', '.join(f'old.{field}' for field in SEARCH_FIELDS)
+FTS_TABLE_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    f"{_COLUMNS}, content='products_product', content_rowid='rowid', tokenize='unicode61')"
+)
+FTS_TRIGGERS_SQL = {
+    f'{FTS_TABLE}_ai': (
+        f'CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON products_product BEGIN '
+        f'INSERT INTO {FTS_TABLE}(rowid, {_COLUMNS}) VALUES (new.rowid, {_NEW_ROW}); END'
+    ),
+    f'{FTS_TABLE}_ad': (
+        f'CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON products_product BEGIN '
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_COLUMNS}) VALUES ('delete', old.rowid, {_OLD_ROW}); END"
+    ),
+    f'{FTS_TABLE}_au': (
+        f'CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE OF {_COLUMNS} ON products_product BEGIN '
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_COLUMNS}) VALUES ('delete', old.rowid, {_OLD_ROW}); "
+        f'INSERT INTO {FTS_TABLE}(rowid, {_COLUMNS}) VALUES (new.rowid, {_NEW_ROW}); END'
+    ),
+}
+
+
+def supports_fts5(connection):
+    if connection.vendor != 'sqlite':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA compile_options')
+        return 'ENABLE_FTS5' in {row[0] for row in cursor.fetchall()}
+
+
+def install_fts_index(connection):
+    """
+    Create the FTS5 table and its sync triggers if any are missing, and
+    rebuild the index in that case. SQLite drops triggers (and renumbers
+    rowids) when a migration remakes products_product, so this also runs
+    after every migrate.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'products_product'"
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+        if set(FTS_TRIGGERS_SQL) <= existing:
+            return False
+        cursor.execute(FTS_TABLE_SQL)
+        for name, sql in FTS_TRIGGERS_SQL.items():
+            if name not in existing:
+                cursor.execute(sql)
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES('rebuild')")
+    return True
+
+
+def drop_fts_index(connection):
+    with connection.cursor() as cursor:
+        for name in FTS_TRIGGERS_SQL:
+            cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+        cursor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+def tokenize(text):
+    return [token.lower() for token in TOKEN_RE.findall(text or '')]
+
+
+class FTS5SearchBackend:
+    """
+    SQLite FTS5 external-content index over the product table.
+
+    The index is kept in sync by triggers (see `install_fts_index`), so it
+    also sees `bulk_create` and queryset updates. Run the
+    `rebuild_search_index` command after a VACUUM, which may renumber
+    rowids.
+    """
+
+    @classmethod
+    def is_available(cls):
+        return connection.vendor == 'sqlite' and FTS_TABLE in connection.introspection.table_names()
+
+    def search(self, query, limit):
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        # Quote every term so user input can't inject FTS5 syntax; the
+        # last term is matched as a prefix for search-as-you-type.
+        match = ' '.join(f'"{token}"' for token in tokens) + '*'
+        weights = ', '.join(str(FIELD_WEIGHTS[field]) for field in SEARCH_FIELDS)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT p.id, bm25({FTS_TABLE}, {weights}) AS rank '
+                f'FROM {FTS_TABLE} JOIN products_product p ON p.rowid = {FTS_TABLE}.rowid '
+                f'WHERE {FTS_TABLE} MATCH %s ORDER BY rank LIMIT %s',
+                [match, limit],
+            )
+            return [(Product._meta.pk.to_python(pk), -rank) for pk, rank in cursor.fetchall()]
+
+    def update(self, product):
+        pass
+
+    def remove(self, pk):
+        pass
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES('rebuild')")
+
+
+class InvertedIndexSearchBackend:
+    """
+    Pure-Python BM25 inverted index, built lazily from the database and
+    updated from the product signals. The index is per-process.
+    """
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._built = False
+        self._postings = defaultdict(dict)
+        self._documents = {}
+        self._vocabulary = None
+        self._total_length = 0.0
+
+    def _terms(self, product):
+        terms = Counter()
+        for field in SEARCH_FIELDS:
+            for token in tokenize(getattr(product, field)):
+                terms[token] += FIELD_WEIGHTS[field]
+        return terms
+
+    def _ensure_built(self):
+        if not self._built:
+            self.rebuild()
+
+    def rebuild(self):
+        with self._lock:
+            self._postings.clear()
+            self._documents.clear()
+            self._vocabulary = None
+            self._total_length = 0.0
+            for product in Product.objects.only('id', *SEARCH_FIELDS).iterator(chunk_size=2000):
+                self._add(product)
+            self._built = True
+
+    def _add(self, product):
+        terms = self._terms(product)
+        for term, frequency in terms.items():
+            self._postings[term][product.pk] = frequency
+        length = sum(terms.values())
+        self._documents[product.pk] = (length, tuple(terms))
+        self._total_length += length
+        self._vocabulary = None
+
+    def remove(self, pk):
+        with self._lock:
+            document = self._documents.pop(pk, None)
+            if document is None:
+                return
+            length, terms = document
+            self._total_length -= length
+            for term in terms:
+                postings = self._postings[term]
+                postings.pop(pk, None)
+                if not postings:
+                    del self._postings[term]
+            self._vocabulary = None
+
+    def update(self, product):
+        with self._lock:
+            if not self._built:
+                return
+            self.remove(product.pk)
+            self._add(product)
+
+    def _prefixed(self, prefix):
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        end = bisect.bisect_left(self._vocabulary, prefix + '\U0010ffff')
+        return self._vocabulary[start:end]
+
+    def search(self, query, limit):
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        with self._lock:
+            self._ensure_built()
+            count = len(self._documents)
+            if not count:
+                return []
+            average_length = self._total_length / count
+
+            # Every term must match; the last one may match as a prefix.
+            *exact, last = tokens
+            term_groups = [[term] for term in exact]
+            term_groups.append(self._prefixed(last))
+
+            candidates = None
+            for group in term_groups:
+                matched = set()
+                for term in group:
+                    matched.update(self._postings.get(term, ()))
+                candidates = matched if candidates is None else candidates & matched
+                if not candidates:
+                    return []
+
+            scores = Counter()
+            for group in term_groups:
+                for term in group:
+                    postings = self._postings.get(term, {})
+                    idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                    for pk in candidates.intersection(postings):
+                        frequency = postings[pk]
+                        norm = self.k1 * (1 - self.b + self.b * self._documents[pk][0] / average_length)
+                        scores[pk] += idf * frequency * (self.k1 + 1) / (frequency + norm)
+            return scores.most_common(limit)
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_search_backend():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                backend_path = getattr(settings, 'PRODUCT_SEARCH_BACKEND', None)
+                if backend_path:
+                    _backend = import_string(backend_path)()
+                elif FTS5SearchBackend.is_available():
+                    _backend = FTS5SearchBackend()
+                else:
+                    _backend = InvertedIndexSearchBackend()
+    return _backend
@@ -1,10 +1,37 @@
 from rest_framework import serializers
-from .models import Product
+from .images import rendition_set
+from .models import Inventory, Product
+
+class RenditionSetField(serializers.Field):
+    """Resized WebP renditions of the image as srcset-ready metadata."""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('source', 'renditions')
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def get_attribute(self, instance):
+        # Renditions only count while they were made from the current image.
+        return super().get_attribute(instance), instance.image.name
+
+    def to_representation(self, value):
+        renditions, image_name = value
+        request = self.context.get('request')
+        return rendition_set(renditions, image_name, request.build_absolute_uri if request else None)
 
 class ProductSerializer(serializers.ModelSerializer):
     user = serializers.ReadOnlyField(source='user.username')
+    images = RenditionSetField()
 
     class Meta:
         model = Product
-        fields = ['id', 'name', 'description', 'price', 'image', 'type', 'brand', 'created_at', 'updated_at', 'user']
-        read_only_fields = ['user']
\ No newline at end of file
+        fields = ['id', 'name', 'description', 'price', 'image', 'images', 'type', 'brand', 'created_at', 'updated_at', 'user']
+        read_only_fields = ['user']
+
+class InventorySerializer(serializers.ModelSerializer):
+    on_hand = serializers.IntegerField(min_value=0)
+
+    class Meta:
+        model = Inventory
+        fields = ['product', 'on_hand', 'available', 'reserved']
+        read_only_fields = ['product', 'available', 'reserved']
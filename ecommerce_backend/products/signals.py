@@ -0,0 +1,41 @@
+from functools import partial
+
+from django.db import connections, transaction
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import receiver
+
+from .cache import invalidate_product
+from .images import needs_renditions, rendition_pool
+from .models import Product
+from .search import FTS_TABLE, get_search_backend, install_fts_index
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidate_product_cache(sender, instance, **kwargs):
+    # Wait for the commit so a concurrent read can't re-cache the old row.
+    transaction.on_commit(partial(invalidate_product, instance.pk))
+
+
+@receiver(post_save, sender=Product)
+def index_product(sender, instance, **kwargs):
+    transaction.on_commit(partial(get_search_backend().update, instance))
+
+
+@receiver(post_save, sender=Product)
+def schedule_renditions(sender, instance, raw=False, **kwargs):
+    if not raw and needs_renditions(instance):
+        transaction.on_commit(partial(rendition_pool.submit, instance.pk))
+
+
+@receiver(post_delete, sender=Product)
+def unindex_product(sender, instance, **kwargs):
+    transaction.on_commit(partial(get_search_backend().remove, instance.pk))
+
+
+@receiver(post_migrate)
+def repair_search_index(sender, using, **kwargs):
+    # Only repair an index that migration 0009 actually installed.
+    connection = connections[using]
+    if sender.name == 'products' and FTS_TABLE in connection.introspection.table_names():
+        install_fts_index(connection)
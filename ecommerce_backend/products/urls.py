@@ -1,11 +1,19 @@
 from django.urls import path
-from .views import ProductViewSet, ProductListingViewSet, UserProductViewSet, DeleteProductView, ProductEditView
+from . import async_views
+from .views import ProductViewSet, ProductListingViewSet, UserProductViewSet, DeleteProductView, ProductEditView, ProductStockView, ProductSearchView, ProductFacetView, ProductImportView, UserProductExportView
 
 urlpatterns = [
     path('', ProductViewSet.as_view({'get': 'list', 'post': 'create'}), name='product-list'),
     path('<uuid:pk>/', ProductViewSet.as_view({'get': 'retrieve', 'put': 'update', 'delete': 'destroy'}), name='product-detail'),
     path('listing/', ProductListingViewSet.as_view({'get': 'list'}), name='product-listing'),
+    path('async/listing/', async_views.product_listing, name='product-listing-async'),
+    path('async/<uuid:pk>/', async_views.product_detail, name='product-detail-async'),
+    path('search/', ProductSearchView.as_view(), name='product-search'),
+    path('facets/', ProductFacetView.as_view(), name='product-facets'),
     path('user-products/', UserProductViewSet.as_view({'get': 'list'}), name='user-product-list'),
+    path('user-products/export/', UserProductExportView.as_view(), name='user-product-export'),
+    path('import/', ProductImportView.as_view(), name='product-import'),
     path('<uuid:pk>/delete/', DeleteProductView.as_view(), name='product-delete'),
     path('<uuid:pk>/edit/', ProductEditView.as_view(), name='product-edit'),
+    path('<uuid:pk>/stock/', ProductStockView.as_view(), name='product-stock'),
 ]
\ No newline at end of file
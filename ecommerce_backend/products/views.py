@@ -2,18 +2,30 @@ from rest_framework import viewsets
 from rest_framework.mixins import ListModelMixin
 from rest_framework.viewsets import GenericViewSet
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from users.authentication import CachedJWTAuthentication
 from rest_framework.views import APIView
 from rest_framework import status
+from rest_framework.parsers import MultiPartParser
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
-from .models import Product
-from .serializers import ProductSerializer
+from ecommerce_backend.pagination import KeysetPagination
+from ecommerce_backend.query_planning import QueryPlanMixin, plan_queryset
+from .bulk_io import FORMATS, detect_format, export_products, import_products, iter_rows
+from .cache import cached_response, detail_key, listing_key
+from .filters import ProductFilterBackend, facet_counts
+from .images import attach_rendition_sets
+from .inventory import set_on_hand
+from .models import Inventory, Product
+from .search import get_search_backend
+from .serializers import InventorySerializer, ProductSerializer
 
-class ProductViewSet(viewsets.ModelViewSet):
+class ProductViewSet(QueryPlanMixin, viewsets.ModelViewSet):
     serializer_class = ProductSerializer
     permission_classes = [IsAuthenticated]
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
+    filter_backends = [ProductFilterBackend]
+    query_budget = {'list': 2, 'retrieve': 2, 'create': 2, 'update': 3}
 
     def get_permissions(self):
         if self.action == 'create':
@@ -27,34 +39,78 @@ class ProductViewSet(viewsets.ModelViewSet):
         serializer.save(user=self.request.user)
 
     def retrieve(self, request, *args, **kwargs):
-        product = self.get_object()
-        serializer = self.get_serializer(product)
-        return Response(serializer.data)
+        def build():
+            product = self.get_object()
+            return self.get_serializer(product).data
+        return cached_response(request, detail_key(kwargs['pk']), build)
 
 class ProductListingViewSet(viewsets.ModelViewSet):
     queryset = Product.objects.all()
     serializer_class = ProductSerializer
+    filter_backends = [ProductFilterBackend]
+    query_budget = {'list': 2}
 
     def list(self, request, *args, **kwargs):
-        products = self.queryset.values('id', 'image', 'description', 'price')
-        return Response(products)
+        def build():
+            products = self.filter_queryset(self.get_queryset())
+            products = products.values('id', 'image', 'renditions', 'description', 'price', 'created_at')
+            page = attach_rendition_sets(self.paginate_queryset(products), request.build_absolute_uri)
+            return self.get_paginated_response(page).data
+        return cached_response(request, listing_key(request), build)
 
-class UserProductViewSet(ListModelMixin, GenericViewSet):
+class UserProductViewSet(QueryPlanMixin, ListModelMixin, GenericViewSet):
     serializer_class = ProductSerializer
     permission_classes = [IsAuthenticated]
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
+    query_budget = {'list': 2}
 
     def get_queryset(self):
+        if getattr(self, 'swagger_fake_view', False):
+            return Product.objects.none()
         return Product.objects.filter(user=self.request.user)
 
     def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        page = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+class ProductImportView(APIView):
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [CachedJWTAuthentication]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request, *args, **kwargs):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({"detail": "Upload a CSV or JSON-lines file in the 'file' field."}, status=status.HTTP_400_BAD_REQUEST)
+        file_format = request.data.get('file_format') or detect_format(upload.name)
+        if file_format not in FORMATS:
+            return Response({"detail": f"file_format must be one of: {', '.join(FORMATS)}."}, status=status.HTTP_400_BAD_REQUEST)
+
+        report = import_products(iter_rows(upload, file_format), request.user)
+        response_status = status.HTTP_201_CREATED if report['created'] else status.HTTP_400_BAD_REQUEST
+        return Response(report, status=response_status)
+
+class UserProductExportView(APIView):
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [CachedJWTAuthentication]
+
+    def get(self, request, *args, **kwargs):
+        file_format = request.query_params.get('file_format', 'csv')
+        if file_format not in FORMATS:
+            return Response({"detail": f"file_format must be one of: {', '.join(FORMATS)}."}, status=status.HTTP_400_BAD_REQUEST)
+
+        content_type = 'text/csv' if file_format == 'csv' else 'application/x-ndjson'
+        response = StreamingHttpResponse(
+            export_products(Product.objects.filter(user=request.user), file_format),
+            content_type=content_type,
+        )
+        response['Content-Disposition'] = f'attachment; filename="products.{file_format}"'
+        return response
 
 class DeleteProductView(APIView):
     permission_classes = [IsAuthenticated]
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
 
     def delete(self, request, pk, *args, **kwargs):
         product = get_object_or_404(Product, pk=pk, user=request.user)
@@ -63,14 +119,63 @@ class DeleteProductView(APIView):
 
 class ProductEditView(APIView):
     permission_classes = [IsAuthenticated]
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
 
     def patch(self, request, pk, *args, **kwargs):
-        product = get_object_or_404(Product, pk=pk, user=request.user)
+        product = get_object_or_404(Product.objects.select_related('user'), pk=pk, user=request.user)
         editable_fields = ['name', 'description', 'price', 'image', 'type', 'brand']
         data = {key: value for key, value in request.data.items() if key in editable_fields}
         for field, value in data.items():
             setattr(product, field, value)
         product.save()
         serializer = ProductSerializer(product)
-        return Response(serializer.data, status=status.HTTP_200_OK)
\ No newline at end of file
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+class ProductStockView(APIView):
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [CachedJWTAuthentication]
+
+    def get(self, request, pk, *args, **kwargs):
+        get_object_or_404(Product, pk=pk, user=request.user)
+        inventory = get_object_or_404(Inventory, product_id=pk)
+        return Response(InventorySerializer(inventory).data, status=status.HTTP_200_OK)
+
+    def put(self, request, pk, *args, **kwargs):
+        get_object_or_404(Product, pk=pk, user=request.user)
+        serializer = InventorySerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        inventory = set_on_hand(pk, serializer.validated_data['on_hand'])
+        if inventory is None:
+            return Response({"detail": "on_hand cannot be lower than the quantity reserved by carts."}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(InventorySerializer(inventory).data, status=status.HTTP_200_OK)
+
+    def delete(self, request, pk, *args, **kwargs):
+        get_object_or_404(Product, pk=pk, user=request.user)
+        Inventory.objects.filter(product_id=pk).delete()
+        return Response({"detail": "Stock is no longer tracked for this product."}, status=status.HTTP_204_NO_CONTENT)
+
+class ProductFacetView(APIView):
+    permission_classes = [AllowAny]
+
+    def get(self, request, *args, **kwargs):
+        def build():
+            return facet_counts(Product.objects.all(), request.query_params)
+        return cached_response(request, listing_key(request), build)
+
+class ProductSearchView(APIView):
+    permission_classes = [AllowAny]
+
+    def get(self, request, *args, **kwargs):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({"detail": "The 'q' query parameter is required."}, status=status.HTTP_400_BAD_REQUEST)
+
+        limit = KeysetPagination().get_page_size(request)
+        ranked = get_search_backend().search(query, limit)
+        queryset = plan_queryset(Product.objects.all(), ProductSerializer)
+        products = queryset.in_bulk([pk for pk, _ in ranked])
+        ranked = [(products[pk], score) for pk, score in ranked if pk in products]
+
+        serializer = ProductSerializer([product for product, _ in ranked], many=True, context={'request': request})
+        results = [dict(data, score=round(score, 6)) for data, (_, score) in zip(serializer.data, ranked)]
+        return Response({'query': query, 'results': results})
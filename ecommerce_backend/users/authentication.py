@@ -0,0 +1,147 @@
+import copy
+import itertools
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+class UserCache:
+    """
+    Size-bounded LRU of authenticated users with a per-entry TTL.
+
+    Entries are keyed by (user id, version). Invalidating a user gives it a
+    new version, so a lookup that started before the invalidation can't
+    store a stale row where later requests would find it. Versions are
+    forgotten after `ttl` seconds, and beyond `maxsize` of them, after
+    which an unusually slow lookup could store a stale row for at most
+    `ttl` seconds. The cache is per-process; other workers see a change
+    once their entry expires.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        # user id -> (version, expiry), oldest invalidation first.
+        self._versions = OrderedDict()
+        self._next_version = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def _version(self, user_id):
+        record = self._versions.get(user_id)
+        return record[0] if record else 0
+
+    def version(self, user_id):
+        with self._lock:
+            return self._version(user_id)
+
+    def get(self, user_id, version):
+        key = (user_id, version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, user_id, version, user):
+        with self._lock:
+            if version != self._version(user_id):
+                return
+            self._entries[(user_id, version)] = (time.monotonic() + self.ttl, user)
+            self._entries.move_to_end((user_id, version))
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop((user_id, self._version(user_id)), None)
+            now = time.monotonic()
+            # Numbers are never reused, so a forgotten version can't come back.
+            self._versions[user_id] = (next(self._next_version), now + self.ttl)
+            self._versions.move_to_end(user_id)
+            while self._versions:
+                _, expires = next(iter(self._versions.values()))
+                if expires >= now and len(self._versions) <= self.maxsize:
+                    break
+                self._versions.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries)}
+
+
+user_cache = UserCache(
+    maxsize=getattr(settings, 'AUTH_USER_CACHE_SIZE', 10_000),
+    ttl=getattr(settings, 'AUTH_USER_CACHE_TTL', 60),
+)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT authentication that serves the token's user from `user_cache`."""
+
+    def get_user(self, validated_token):
+        user_id, version, user = self._cached_user(validated_token)
+        if user is None:
+            user = super().get_user(validated_token)
+            user_cache.set(user_id, version, user)
+        # Hand out a copy so per-request changes never leak into the cache.
+        return copy.copy(user)
+
+    async def aauthenticate(self, request):
+        """
+        Async counterpart of `authenticate` for plain Django async views.
+        Token validation needs no I/O; only a cache miss touches the
+        database, in a worker thread.
+        """
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        user_id, version, user = self._cached_user(validated_token)
+        if user is None:
+            user = await sync_to_async(super().get_user)(validated_token)
+            user_cache.set(user_id, version, user)
+        return copy.copy(user)
+
+    def _cached_user(self, validated_token):
+        try:
+            user_id = str(validated_token[api_settings.USER_ID_CLAIM])
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        version = user_cache.version(user_id)
+        user = user_cache.get(user_id, version)
+        if user is not None:
+            # The same checks JWTAuthentication.get_user makes on a fresh row.
+            if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+                raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+            if api_settings.CHECK_REVOKE_TOKEN and (
+                validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password)
+            ):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+        return user_id, version, user
@@ -8,11 +8,12 @@ User = get_user_model()
 class LoginSerializer(serializers.Serializer):
     username = serializers.CharField()
     password = serializers.CharField(write_only=True)
+    guest_cart_token = serializers.CharField(write_only=True, required=False)
 
     def validate(self, data):
-        user = authenticate(**data)
+        user = authenticate(username=data['username'], password=data['password'])
         if user and user.is_active:
-            return {"user": user}
+            return {"user": user, "guest_cart_token": data.get('guest_cart_token')}
         raise serializers.ValidationError("Invalid credentials.")
 
 class RegisterSerializer(serializers.ModelSerializer):
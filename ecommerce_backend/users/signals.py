@@ -0,0 +1,16 @@
+from functools import partial
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import user_cache
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def invalidate_cached_user(sender, instance, **kwargs):
+    # Any save covers password changes and deactivation. Waiting for the
+    # commit keeps a concurrent request from re-caching the old row.
+    transaction.on_commit(partial(user_cache.invalidate, str(instance.pk)))
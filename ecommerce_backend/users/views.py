@@ -2,12 +2,15 @@ import logging
 
 from django.contrib.auth.models import User
 from rest_framework import generics, permissions
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from cart.guest import guest_cart_id, merge_guest_cart
+
+from .authentication import CachedJWTAuthentication
 from .serializers import LoginSerializer, RegisterSerializer, UserDetailSerializer
 
 logger = logging.getLogger(__name__)
@@ -26,14 +29,26 @@ class LoginView(generics.GenericAPIView):
         serializer.is_valid(raise_exception=True)
         user = serializer.validated_data["user"]
         refresh = RefreshToken.for_user(user)
-        return Response({
+        data = {
             'refresh': str(refresh),
             'access': str(refresh.access_token),
-        })
+        }
+        token = serializer.validated_data["guest_cart_token"]
+        if token:
+            # A bad or expired token must not fail the login; nothing is merged.
+            cart_id = guest_cart_id(token)
+            if cart_id is not None:
+                try:
+                    data['cart'] = merge_guest_cart(cart_id, user).pk
+                except ValidationError as exc:
+                    # Nothing was merged; the guest cart is kept for the
+                    # shopper to adjust.
+                    data['cart_errors'] = exc.detail
+        return Response(data)
 
 class AllUsersView(APIView):
     permission_classes = [permissions.IsAdminUser]
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
 
     def get(self, request, *args, **kwargs):
         users = User.objects.all()
@@ -42,7 +57,7 @@ class AllUsersView(APIView):
 
 class CurrentUserView(APIView):
     permission_classes = [IsAuthenticated]
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [CachedJWTAuthentication]
 
     def get(self, request):
         logger.info(f"CurrentUserView accessed by user: {request.user.username}")
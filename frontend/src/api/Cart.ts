@@ -48,7 +48,8 @@ export const getFullCartItem = async (item: CartItem, accessToken: string | null
 
 
 export const fetchCart = async (accessToken: string | null): Promise<{ id: string }> => {
-  const response = await fetch(`${BASE_URL}/cart/`, {
+  // The backend creates the open cart on first use.
+  const response = await fetch(`${BASE_URL}/cart/current/`, {
     method: 'GET',
     headers: getAuthHeader(accessToken),
   });
@@ -56,19 +57,14 @@ export const fetchCart = async (accessToken: string | null): Promise<{ id: strin
   if (!response.ok) {
     throw new Error(`Failed to fetch cart: ${response.statusText}`);
   }
-  const data = await response.json();
-  console.log(data);
-  if (data.length === 0) {
-    createCart(accessToken);
-    return fetchCart(accessToken);
-  }
-
-  return data[0];
+  return response.json();
 };
 
 
 export const fetchCartItems = async (accessToken: string | null): Promise<FullCartItem[]> => {
-  const response = await fetch(`${BASE_URL}/cart/items/`, {
+  // /cart/items/ pages through the lines of every cart the user has had;
+  // the open cart carries all of its own lines in one response.
+  const response = await fetch(`${BASE_URL}/cart/current/`, {
     method: 'GET',
     headers: getAuthHeader(accessToken),
   });
@@ -77,8 +73,8 @@ export const fetchCartItems = async (accessToken: string | null): Promise<FullCa
     throw new Error(`Failed to fetch cart items: ${response.statusText}`);
   }
 
-  const items: CartItem[] = await response.json();
-
+  const cart: { id: string; lines: Omit<CartItem, 'cart'>[] } = await response.json();
+  const items: CartItem[] = cart.lines.map(({ id, product_id, quantity }) => ({ id, product_id, quantity, cart: cart.id }));
 
   const fullItems = await Promise.all(
     items.map(item => getFullCartItem(item, accessToken))
@@ -66,7 +66,7 @@ export const fetchUserListings = async (
 
 
     return {
-      listings: data,
+      listings: data.results,
     };
   } catch (error) {
     console.error('Error fetching user listings:', error);
@@ -145,7 +145,7 @@ export const fetchActiveListings = async (): Promise<ListingCardData[]> => {
     const data = await response.json();
 
 
-    return data.map((item: any) => ({
+    return data.results.map((item: any) => ({
       id: item.id,
       title: item.name,
       description: item.description,
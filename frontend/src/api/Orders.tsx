@@ -1,4 +1,4 @@
-import { ApiOrder, Order, Cart, CartItem } from '../types/listing';
+import { ApiOrder, Order } from '../types/listing';
 
 
 const BASE_URL = import.meta.env.PROD
@@ -22,26 +22,34 @@ export const fetchOrders = async (token: string): Promise<ApiOrder[]> => {
     console.log('Fetching orders from API...');
 
     try {
-        const response = await fetch(`${BASE_URL}/orders/`, {
-            method: 'GET',
-            headers: getAuthHeader(token),
-        });
+        const data: ApiOrder[] = [];
+        let url: string | null = `${BASE_URL}/orders/`;
+        // The list is cursor-paginated; follow `next` until the last page.
+        while (url) {
+            const response: Response = await fetch(url, {
+                method: 'GET',
+                headers: getAuthHeader(token),
+            });
 
-        if (!response.ok) {
-            if (response.status === 401) {
-                throw new Error('Unauthorized. Please log in again.');
-            }
+            if (!response.ok) {
+                if (response.status === 401) {
+                    throw new Error('Unauthorized. Please log in again.');
+                }
 
-            let errorBody = '';
-            try {
-                errorBody = await response.text();
-            } catch (parseError) {
+                let errorBody = '';
+                try {
+                    errorBody = await response.text();
+                } catch (parseError) {
 
+                }
+                throw new Error(`API Error: ${response.status} ${response.statusText}. ${errorBody}`);
             }
-            throw new Error(`API Error: ${response.status} ${response.statusText}. ${errorBody}`);
-        }
 
-        const data: ApiOrder[] = await response.json();
+            const page: { next: string | null; results: ApiOrder[] } = await response.json();
+            data.push(...page.results);
+            // `next` is an absolute backend URL; keep requests on BASE_URL.
+            url = page.next ? `${BASE_URL}/orders/${new URL(page.next).search}` : null;
+        }
         console.log('API Response:', data);
 
 
@@ -80,67 +88,9 @@ export const fetchOrderDetails = async (token: string, orderId: string): Promise
             throw new Error(`Error fetching order: ${orderResponse.statusText}`);
         }
 
+        // The order carries its own lines, priced as they were bought.
         const orderData: Order = await orderResponse.json();
 
-
-        if (orderData.cart) {
-            const cartResponse = await fetch(`${BASE_URL}/cart/${orderData.cart}/`, {
-                headers: getAuthHeader(token),
-            });
-
-            if (!cartResponse.ok) {
-                throw new Error(`Error fetching cart: ${cartResponse.statusText}`);
-            }
-
-            const cartData: Cart = await cartResponse.json();
-
-
-            const cartItemsResponse = await fetch(`${BASE_URL}/cart/items/`, {
-                headers: getAuthHeader(token),
-            });
-
-            if (!cartItemsResponse.ok) {
-                throw new Error(`Error fetching cart items: ${cartItemsResponse.statusText}`);
-            }
-
-            const allCartItems = await cartItemsResponse.json();
-
-
-            const cartItems: CartItem[] = allCartItems.filter((item: { cart: string }) =>
-                item.cart === cartData.id
-            );
-
-
-            const itemsWithProductDetails = await Promise.all(
-                cartItems.map(async (item: CartItem) => {
-                    const productResponse = await fetch(`${BASE_URL}/products/${item.product_id}/`, {
-                        headers: getAuthHeader(token),
-                    });
-
-                    if (productResponse.ok) {
-                        const product = await productResponse.json();
-                        return {
-                            ...item,
-                            product_name: product.name,
-                            price: parseFloat(product.price)
-                        };
-                    }
-
-                    return {
-                        ...item,
-                        product_name: 'Product unavailable',
-                        price: 0
-                    };
-                })
-            );
-
-
-            orderData.cartData = {
-                ...cartData,
-                items: itemsWithProductDetails
-            };
-        }
-
         return orderData;
     } catch (error) {
         console.error('Error fetching order details:', error);
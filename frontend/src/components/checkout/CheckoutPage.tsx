@@ -57,7 +57,7 @@ interface PaymentFormData {
 
 const CheckoutPage: React.FC = () => {
   const navigate = useNavigate();
-  const { cartId, cartItems, removeItem, } = useCart();
+  const { cartId, cartItems, clearCart } = useCart();
   const { accessToken } = useAuth();
 
   const [activeStep, setActiveStep] = useState(0);
@@ -89,12 +89,12 @@ const CheckoutPage: React.FC = () => {
   const [paymentErrors, setPaymentErrors] = useState<Partial<PaymentFormData>>({});
 
   useEffect(() => {
-    // Redirect to cart if cart is empty
-    if (!cartItems || cartItems.length === 0) {
+    // Redirect to cart if cart is empty, unless it was just checked out
+    if (!orderPlaced && (!cartItems || cartItems.length === 0)) {
 
       navigate('/cart');
     }
-  }, [cartItems, navigate]);
+  }, [cartItems, navigate, orderPlaced]);
 
   const steps = ['Shipping Information', 'Payment Details', 'Review Order'];
 
@@ -175,22 +175,18 @@ const CheckoutPage: React.FC = () => {
     setError(null);
 
     try {
-      // Prepare order data
+      // The backend checks out the cart: it prices it, commits the reserved
+      // stock and records the order lines.
       const orderData = {
-        items: cartItems.map(item => ({
-          product_id: item.product_id,
-          quantity: item.quantity
-        })),
-        shippingAddress: {
-          fullName: shippingInfo.fullName,
-          addressLine1: shippingInfo.addressLine1,
-          addressLine2: shippingInfo.addressLine2,
-          city: shippingInfo.city,
-          state: shippingInfo.state,
-          zipCode: shippingInfo.zipCode,
-          country: shippingInfo.country,
-          phoneNumber: shippingInfo.phoneNumber
-        },
+        cart: cartId,
+        shipping_address: [
+          shippingInfo.fullName,
+          shippingInfo.addressLine1,
+          shippingInfo.addressLine2,
+          `${shippingInfo.city}, ${shippingInfo.state} ${shippingInfo.zipCode}`,
+          shippingInfo.country,
+          shippingInfo.phoneNumber,
+        ].filter(Boolean).join('\n'),
       };
 
       // Make API call to create order
@@ -205,14 +201,12 @@ const CheckoutPage: React.FC = () => {
 
       if (!response.ok) {
         const errorData = await response.json();
-        throw new Error(errorData.message || 'Failed to place order');
+        throw new Error(errorData.detail || errorData.cart || errorData.items || 'Failed to place order');
       }
 
-      // Order successful
+      // Order successful; the checked-out cart is closed, so start a new one.
       setOrderPlaced(true);
-      for (const item of cartItems) {
-        await removeItem(item.id);
-      }
+      clearCart();
       setTimeout(() => {
         navigate('/profile/orders');
       }, 2500);
@@ -25,137 +25,8 @@ import AppTheme from '../../theme/AppTheme';
 import AppAppBar from '../shared/AppAppBar';
 import Footer from '../shared/Footer';
 import { useAuth } from '../../context/AuthContext';
-
-interface CartItem {
-    id: string;
-    product_id: string;
-    quantity: number;
-    cart: string;
-    product_name?: string;     price?: number; 
-}
-
-interface Cart {
-    id: string;
-    user: string;
-    created_at: string;
-    status: string;
-    shipping_address: string;
-    billing_address: string;
-    items: CartItem[];
-}
-
-interface Order {
-    id: string;
-    created_at: string;
-    status: 'Received' | 'Shipped' | 'Delivered';
-    cart: string;
-    cartData?: Cart; 
-}
-
-
-const API_BASE_URL = import.meta.env.PROD
-  ? `http://${import.meta.env.VITE_BACKEND_HOST}:${import.meta.env.VITE_BACKEND_PORT}`
-  : '/api';
-
-const fetchOrderDetails = async (token: string, orderId: string): Promise<Order | null> => {
-    console.log(`Fetching details for order: ${orderId}`);
-
-    try {
-        if (!token) {
-            throw new Error('Authentication token not found');
-        }
-
-        
-        const orderResponse = await fetch(`${API_BASE_URL}/orders/${orderId}/`, {
-            headers: {
-                'Authorization': `Bearer ${token}`,
-                'Content-Type': 'application/json'
-            }
-        });
-
-        if (!orderResponse.ok) {
-            if (orderResponse.status === 404) {
-                return null;
-            }
-            throw new Error(`Error fetching order: ${orderResponse.statusText}`);
-        }
-
-        const orderData: Order = await orderResponse.json();
-        
-        
-        if (orderData.cart) {
-            const cartResponse = await fetch(`${API_BASE_URL}/cart/${orderData.cart}/`, {
-                headers: {
-                    'Authorization': `Bearer ${token}`,
-                    'Content-Type': 'application/json'
-                }
-            });
-
-            if (!cartResponse.ok) {
-                throw new Error(`Error fetching cart: ${cartResponse.statusText}`);
-            }
-
-            const cartData: Cart = await cartResponse.json();
-            
-            
-            const cartItemsResponse = await fetch(`${API_BASE_URL}/cart/items/`, {
-                headers: {
-                    'Authorization': `Bearer ${token}`,
-                    'Content-Type': 'application/json'
-                }
-            });
-
-            if (!cartItemsResponse.ok) {
-                throw new Error(`Error fetching cart items: ${cartItemsResponse.statusText}`);
-            }
-
-            const allCartItems = await cartItemsResponse.json();
-            
-            
-            const cartItems: CartItem[] = allCartItems.filter((item: { cart: string }) => 
-                item.cart === cartData.id
-            );
-            
-            
-            const itemsWithProductDetails = await Promise.all(
-                cartItems.map(async (item: CartItem) => {
-                    const productResponse = await fetch(`${API_BASE_URL}/products/${item.product_id}/`, {
-                        headers: {
-                            'Authorization': `Bearer ${token}`,
-                            'Content-Type': 'application/json'
-                        }
-                    });
-
-                    if (productResponse.ok) {
-                        const product = await productResponse.json();
-                        return {
-                            ...item,
-                            product_name: product.name,
-                            price: parseFloat(product.price)
-                        };
-                    }
-                    
-                    return {
-                        ...item,
-                        product_name: 'Product unavailable',
-                        price: 0
-                    };
-                })
-            );
-            
-            
-            orderData.cartData = {
-                ...cartData,
-                items: itemsWithProductDetails
-            };
-        }
-
-        return orderData;
-    } catch (error) {
-        console.error('Error fetching order details:', error);
-        throw error;
-    }
-};
+import { fetchOrderDetails } from '../../api/Orders';
+import { Order } from '../../types/listing';
 
 const OrderDetailsPage: React.FC = () => {
     const { orderId } = useParams<{ orderId: string }>();
@@ -316,86 +187,61 @@ const OrderDetailsPage: React.FC = () => {
                         </Grid>
                     </Paper>
 
-                    {orderDetails.cartData && (() => {
-                        const cartData = orderDetails.cartData; 
-                        return (
-                            <>
-                                {/* Cart Information */}
-                                <Paper sx={{ p: 2, mb: 3 }}>
-                                    <Typography variant="h6" gutterBottom>
-                                        Cart Information
-                                    </Typography>
-                                    <Divider sx={{ mb: 2 }} />
-                                    <Grid container spacing={2}>
-                                        <Grid item xs={12} sm={6}>
-                                            <Typography variant="body2" color="text.secondary">Cart ID</Typography>
-                                            <Typography variant="body1">{cartData.id}</Typography>
-                                        </Grid>
-                                        <Grid item xs={12} sm={6}>
-                                            <Typography variant="body2" color="text.secondary">Cart Status</Typography>
-                                            <Typography variant="body1">{cartData.status}</Typography>
-                                        </Grid>
-                                        <Grid item xs={12}>
-                                            <Typography variant="body2" color="text.secondary">Shipping Address</Typography>
-                                            <Typography variant="body1">{cartData.shipping_address}</Typography>
-                                        </Grid>
-                                        <Grid item xs={12}>
-                                            <Typography variant="body2" color="text.secondary">Billing Address</Typography>
-                                            <Typography variant="body1">{cartData.billing_address}</Typography>
-                                        </Grid>
-                                    </Grid>
-                                </Paper>
-
-                                {/* Cart Items */}
-                                <Paper sx={{ p: 2 }}>
-                                    <Typography variant="h6" gutterBottom>
-                                        Items ({cartData.items.length})
-                                    </Typography>
-                                    <Divider sx={{ mb: 2 }} />
-                                    <List disablePadding>
-                                        {cartData.items.map((item, index) => (
-                                            <React.Fragment key={item.id}>
-                                                <ListItem alignItems="flex-start" sx={{ py: 2 }}>
-                                                    <ListItemText
-                                                        primary={item.product_name || 'Product'}
-                                                        secondary={
-                                                            <>
-                                                                <Typography component="span" variant="body2" color="text.secondary">
-                                                                    Product ID: {item.product_id}
-                                                                </Typography>
-                                                                <Typography component="span" variant="body2" color="text.secondary" display="block">
-                                                                    Quantity: {item.quantity}
-                                                                </Typography>
-                                                                {item.price !== undefined && (
-                                                                    <Typography component="span" variant="body2" color="text.primary" display="block">
-                                                                        Price: {formatCurrency(item.price)} each
-                                                                    </Typography>
-                                                                )}
-                                                            </>
-                                                        }
-                                                    />
-                                                    {item.price !== undefined && (
-                                                        <Typography variant="body1" fontWeight="medium" sx={{ textAlign: 'right' }}>
-                                                            {formatCurrency(item.price * item.quantity)}
-                                                        </Typography>
-                                                    )}
-                                                </ListItem>
-                                                {index < cartData.items.length - 1 && <Divider component="li" />}
-                                            </React.Fragment>
-                                        ))}
-                                    </List>
-                                </Paper>
-                            </>
-                        );
-                    })()}
+                    {/* Shipping Information */}
+                    <Paper sx={{ p: 2, mb: 3 }}>
+                        <Typography variant="h6" gutterBottom>
+                            Shipping Information
+                        </Typography>
+                        <Divider sx={{ mb: 2 }} />
+                        <Grid container spacing={2}>
+                            <Grid item xs={12}>
+                                <Typography variant="body2" color="text.secondary">Shipping Address</Typography>
+                                <Typography variant="body1" sx={{ whiteSpace: 'pre-line' }}>{orderDetails.shipping_address}</Typography>
+                            </Grid>
+                            <Grid item xs={12}>
+                                <Typography variant="body2" color="text.secondary">Billing Address</Typography>
+                                <Typography variant="body1" sx={{ whiteSpace: 'pre-line' }}>{orderDetails.billing_address}</Typography>
+                            </Grid>
+                        </Grid>
+                    </Paper>
 
-                    {!orderDetails.cartData && (
-                        <Paper sx={{ p: 2 }}>
-                            <Alert severity="info">
-                                This order has no associated cart data.
-                            </Alert>
-                        </Paper>
-                    )}
+                    {/* Order Lines */}
+                    <Paper sx={{ p: 2 }}>
+                        <Typography variant="h6" gutterBottom>
+                            Items ({orderDetails.item_count})
+                        </Typography>
+                        <Divider sx={{ mb: 2 }} />
+                        <List disablePadding>
+                            {orderDetails.lines.map((line, index) => (
+                                <React.Fragment key={line.product_id}>
+                                    <ListItem alignItems="flex-start" sx={{ py: 2 }}>
+                                        <ListItemText
+                                            primary={line.product_name}
+                                            secondary={
+                                                <>
+                                                    <Typography component="span" variant="body2" color="text.secondary">
+                                                        Quantity: {line.quantity}
+                                                    </Typography>
+                                                    <Typography component="span" variant="body2" color="text.primary" display="block">
+                                                        Price: {formatCurrency(Number(line.unit_price))} each
+                                                    </Typography>
+                                                </>
+                                            }
+                                        />
+                                        <Typography variant="body1" fontWeight="medium" sx={{ textAlign: 'right' }}>
+                                            {formatCurrency(Number(line.subtotal))}
+                                        </Typography>
+                                    </ListItem>
+                                    {index < orderDetails.lines.length - 1 && <Divider component="li" />}
+                                </React.Fragment>
+                            ))}
+                        </List>
+                        <Divider sx={{ my: 2 }} />
+                        <Box sx={{ display: 'flex', justifyContent: 'space-between' }}>
+                            <Typography variant="h6">Total</Typography>
+                            <Typography variant="h6">{formatCurrency(Number(orderDetails.total_price))}</Typography>
+                        </Box>
+                    </Paper>
                 </Container>
             </Box>
             <Footer />
@@ -9,6 +9,7 @@ interface CartContextProps {
   cartId: string | null;
   addItem: (item: Partial<CartItem>) => Promise<void>;
   removeItem: (id: string) => Promise<void>;
+  clearCart: () => void;
   loading: boolean;
 }
 
@@ -95,12 +96,19 @@ export const CartProvider: React.FC<CartProviderProps> = ({ children }) => {
     setCartItems((prev) => prev.filter((i) => i.id !== id));
   };
 
+  // After checkout the old cart is closed; the next fetchCart opens a new one.
+  const clearCart = () => {
+    setCartItems([]);
+    setCartId(null);
+  };
+
   return (
     <CartContext.Provider value={{ 
       cartItems, 
       cartId,
       addItem, 
       removeItem, 
+      clearCart,
       loading 
     }}>
       {children}
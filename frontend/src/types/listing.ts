@@ -101,6 +101,8 @@ export interface ApiOrder {
     created_at: string;
     status: 'Received' | 'Shipped' | 'Delivered';
     cart: string | null;
+    total_price: string;
+    item_count: number;
 }
 
 export interface CartItem {
@@ -122,10 +124,22 @@ export interface Cart {
     items: CartItem[];
 }
 
+export interface OrderLine {
+    product_id: string;
+    product_name: string;
+    unit_price: string;
+    quantity: number;
+    subtotal: string;
+}
+
 export interface Order {
     id: string;
     created_at: string;
     status: 'Received' | 'Shipped' | 'Delivered';
-    cart: string;
-    cartData?: Cart;
+    cart: string | null;
+    total_price: string;
+    item_count: number;
+    shipping_address: string;
+    billing_address: string;
+    lines: OrderLine[];
 }